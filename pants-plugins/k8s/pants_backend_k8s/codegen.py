@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import ClassVar
+
+from pants.build_graph.address import AddressInput, AddressParseException, InvalidAddressError
+from pants.engine.addresses import Address, Addresses, UnparsedAddressInputs
+from pants.engine.environment import EnvironmentName
+from pants.engine.fs import CreateDigest, Digest, DigestContents, FileContent, Snapshot
+from pants.engine.rules import Get, MultiGet, collect_rules, rule
+from pants.engine.target import (
+    FieldSet,
+    GeneratedSources,
+    GenerateSourcesRequest,
+    WrappedTarget,
+    WrappedTargetRequest,
+)
+from pants.engine.unions import UnionMembership, UnionRule, union
+from pants.util.frozendict import FrozenDict
+from pants.util.strutil import bullet_list
+
+from pants_backend_k8s.target_types import (
+    KubernetesSourceField,
+    KubernetesTemplateDependenciesField,
+    KubernetesTemplateSourceField,
+    KubernetesTemplateValuesField,
+)
+from pants_backend_k8s.util.templating import render_template
+
+
+@union(in_scope_types=[EnvironmentName])
+@dataclass(frozen=True)
+class KubernetesTemplateValueRequest:
+    """Base class for requests to provide the value of a `k8s_template` placeholder from a target."""
+
+    field_set: FieldSet
+    field_set_type: ClassVar[type[FieldSet]]
+
+
+@dataclass(frozen=True)
+class KubernetesTemplateValue:
+    address: Address
+    value: str
+
+
+@dataclass(frozen=True)
+class RenderKubernetesTemplateRequest:
+    """A template and its values, by which renders are cached."""
+
+    digest: Digest
+    values: FrozenDict[str, str]
+
+
+@dataclass(frozen=True)
+class RenderedKubernetesTemplate:
+    content: bytes
+
+
+@rule
+async def render_kubernetes_template(request: RenderKubernetesTemplateRequest) -> RenderedKubernetesTemplate:
+    contents = await Get(DigestContents, Digest, request.digest)
+    if len(contents) != 1:
+        raise ValueError(f"Expected a single template, but got: {', '.join(f.path for f in contents)}.")
+
+    try:
+        return RenderedKubernetesTemplate(render_template(contents[0].content, request.values))
+    except ValueError as e:
+        raise ValueError(f"Failed to render {contents[0].path}: {e}") from e
+
+
+def _parse_address(value: str, owner: Address) -> Address | None:
+    """The address `value` would refer to from `owner`, if it can be read as one."""
+    try:
+        address_input = AddressInput.parse(
+            value, relative_to=owner.spec_path, description_of_origin=f"the `values` of {owner}"
+        )
+        return address_input.dir_to_address()
+    except (AddressParseException, InvalidAddressError):
+        return None
+
+
+class GenerateKubernetesFromTemplateRequest(GenerateSourcesRequest):
+    input = KubernetesTemplateSourceField
+    output = KubernetesSourceField
+
+
+@rule
+async def generate_kubernetes_from_template(
+    request: GenerateKubernetesFromTemplateRequest,
+    union_membership: UnionMembership,
+) -> GeneratedSources:
+    target = request.protocol_target
+    values = dict(target[KubernetesTemplateValuesField].value or {})
+
+    # Values that are the address of one of the dependencies, however either is spelled, are
+    # provided by that target.
+    dependencies = await Get(
+        Addresses,
+        UnparsedAddressInputs(
+            (
+                dependency
+                for dependency in target[KubernetesTemplateDependenciesField].value or ()
+                if not dependency.startswith("!")
+            ),
+            owning_address=target.address,
+            description_of_origin=f"the `dependencies` of {target.address}",
+        ),
+    )
+    references = {}
+    for name, value in values.items():
+        address = _parse_address(value, target.address)
+        if address in dependencies:
+            references[name] = address
+        elif address is not None and value.startswith((":", "//")):
+            raise ValueError(
+                f"The value `{name}` of {target.address} refers to `{value}`, which is not one of "
+                "its `dependencies`. Add it to the `dependencies` to provide the value from it."
+            )
+
+    wrapped_targets = await MultiGet(
+        Get(WrappedTarget, WrappedTargetRequest(address, description_of_origin="k8s_template"))
+        for address in references.values()
+    )
+
+    value_requests = []
+    for name, wrapped_target in zip(references, wrapped_targets):
+        provider = wrapped_target.target
+        request_types = [
+            request_type
+            for request_type in union_membership.get(KubernetesTemplateValueRequest)
+            if request_type.field_set_type.is_applicable(provider)
+        ]
+        if len(request_types) != 1:
+            raise ValueError(
+                f"The value `{name}` of {target.address} refers to {provider.address}, which "
+                + (
+                    "can't provide a value."
+                    if not request_types
+                    else "has several providers:\n\n"
+                    + bullet_list(sorted(request_type.__name__ for request_type in request_types))
+                )
+            )
+        request_type = request_types[0]
+        value_requests.append(request_type(request_type.field_set_type.create(provider)))
+
+    provided = await MultiGet(
+        Get(KubernetesTemplateValue, KubernetesTemplateValueRequest, value_request)
+        for value_request in value_requests
+    )
+    values.update(zip(references, (value.value for value in provided)))
+
+    rendered = await Get(
+        RenderedKubernetesTemplate,
+        RenderKubernetesTemplateRequest(request.protocol_sources.digest, FrozenDict(values)),
+    )
+
+    source = target[KubernetesTemplateSourceField].file_path
+    extension = os.path.splitext(source)[1]
+    path = os.path.join(target.address.spec_path, f"{target.address.target_name}{extension}")
+    snapshot = await Get(Snapshot, CreateDigest([FileContent(path, rendered.content)]))
+    return GeneratedSources(snapshot)
+
+
+def rules():
+    return [
+        *collect_rules(),
+        UnionRule(GenerateSourcesRequest, GenerateKubernetesFromTemplateRequest),
+    ]
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from textwrap import dedent
+from typing import ClassVar
+
+import pytest
+import yaml
+from pants.core.util_rules import source_files
+from pants.engine.addresses import Address
+from pants.engine.fs import DigestContents
+from pants.engine.internals.scheduler import ExecutionError
+from pants.engine.rules import QueryRule, rule
+from pants.engine.target import (
+    COMMON_TARGET_FIELDS,
+    FieldSet,
+    GeneratedSources,
+    HydratedSources,
+    HydrateSourcesRequest,
+    StringField,
+    Target,
+)
+from pants.engine.unions import UnionRule
+from pants.testutil.rule_runner import RuleRunner
+
+from pants_backend_k8s import codegen
+from pants_backend_k8s.codegen import (
+    GenerateKubernetesFromTemplateRequest,
+    KubernetesTemplateValue,
+    KubernetesTemplateValueRequest,
+)
+from pants_backend_k8s.target_types import KubernetesTemplateSourceField, KubernetesTemplateTarget
+
+
+class DigestField(StringField):
+    alias = "digest"
+
+
+class ImageTarget(Target):
+    alias = "image"
+    core_fields = (*COMMON_TARGET_FIELDS, DigestField)
+
+
+@dataclass(frozen=True)
+class ImageFieldSet(FieldSet):
+    required_fields = (DigestField,)
+
+    digest: DigestField
+
+
+class ImageDigestRequest(KubernetesTemplateValueRequest):
+    field_set_type: ClassVar[type[FieldSet]] = ImageFieldSet
+
+
+@rule
+async def provide_image_digest(request: ImageDigestRequest) -> KubernetesTemplateValue:
+    field_set = request.field_set
+    return KubernetesTemplateValue(field_set.address, f"registry/web@{field_set.digest.value}")
+
+
+@pytest.fixture
+def rule_runner() -> RuleRunner:
+    return RuleRunner(
+        rules=[
+            *codegen.rules(),
+            *source_files.rules(),
+            provide_image_digest,
+            UnionRule(KubernetesTemplateValueRequest, ImageDigestRequest),
+            QueryRule(HydratedSources, [HydrateSourcesRequest]),
+            QueryRule(GeneratedSources, [GenerateKubernetesFromTemplateRequest]),
+            QueryRule(DigestContents, [GeneratedSources]),
+        ],
+        target_types=[KubernetesTemplateTarget, ImageTarget],
+    )
+
+
+TEMPLATE = dedent("""\
+    apiVersion: v1
+    kind: Pod
+    metadata:
+      name: web-${env}
+    spec:
+      containers:
+        - name: web
+          image: ${image}
+    """)
+
+
+def _generate(rule_runner: RuleRunner, address: Address) -> dict:
+    target = rule_runner.get_target(address)
+    sources = rule_runner.request(
+        HydratedSources, [HydrateSourcesRequest(target[KubernetesTemplateSourceField])]
+    )
+    generated = rule_runner.request(
+        GeneratedSources, [GenerateKubernetesFromTemplateRequest(sources.snapshot, target)]
+    )
+    (content,) = rule_runner.request(DigestContents, [generated.snapshot.digest])
+    assert content.path == f"app/{address.target_name}.yaml"
+    return yaml.safe_load(content.content)
+
+
+def test_generate_kubernetes_from_template(rule_runner: RuleRunner) -> None:
+    rule_runner.write_files(
+        {
+            "images/BUILD": 'image(name="web", digest="sha256:abc")',
+            "app/pod.yaml": TEMPLATE,
+            "app/BUILD": dedent("""\
+                image(name="local", digest="sha256:def")
+                # Values and dependencies refer to the same targets with different spellings.
+                k8s_template(
+                    name="prod",
+                    source="pod.yaml",
+                    values={"env": "prod", "image": "//images:web"},
+                    dependencies=["images:web"],
+                )
+                k8s_template(
+                    name="dev",
+                    source="pod.yaml",
+                    values={"env": "dev", "image": ":local"},
+                    dependencies=["app:local"],
+                )
+                """),
+        }
+    )
+
+    prod = _generate(rule_runner, Address("app", target_name="prod"))
+    assert prod["metadata"]["name"] == "web-prod"
+    assert prod["spec"]["containers"][0]["image"] == "registry/web@sha256:abc"
+
+    dev = _generate(rule_runner, Address("app", target_name="dev"))
+    assert dev["spec"]["containers"][0]["image"] == "registry/web@sha256:def"
+
+
+def test_generate_kubernetes_from_template_without_dependency(rule_runner: RuleRunner) -> None:
+    rule_runner.write_files(
+        {
+            "app/pod.yaml": TEMPLATE,
+            "app/BUILD": dedent("""\
+                image(name="local", digest="sha256:def")
+                k8s_template(name="dev", source="pod.yaml", values={"env": "dev", "image": ":local"})
+                """),
+        }
+    )
+
+    with pytest.raises(ExecutionError, match="refers to `:local`, which is not one of its `dependencies`"):
+        _generate(rule_runner, Address("app", target_name="dev"))
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+from pants.core.goals.lint import LintResult, LintTargetsRequest
+from pants.core.util_rules.partitions import PartitionerType, Partitions
+from pants.core.util_rules.source_files import SourceFiles, SourceFilesRequest
+from pants.engine.fs import Digest, DigestContents, GlobMatchErrorBehavior, PathGlobs
+from pants.engine.rules import Get, MultiGet, collect_rules, rule
+from pants.engine.target import AllTargets, FieldSet, SourcesField
+from pants.engine.unions import UnionMembership
+from pants.util.frozendict import FrozenDict
+from pants.util.logging import LogLevel
+from pants.util.strutil import pluralize
+
+from pants_backend_k8s.subsystem import KubernetesLint
+from pants_backend_k8s.target_types import KubernetesSourceField
+from pants_backend_k8s.util.validation import (
+    custom_resource_schemas,
+    document_kinds,
+    load_documents,
+    validate_document,
+)
+
+
+@dataclass(frozen=True)
+class KubernetesLintFieldSet(FieldSet):
+    # Any target whose sources are, or can be generated into, Kubernetes manifests. Targets that
+    # cannot are dropped when partitioning, as that needs the union membership.
+    required_fields = (SourcesField,)
+
+    sources: SourcesField
+
+
+class KubernetesLintRequest(LintTargetsRequest):
+    field_set_type = KubernetesLintFieldSet
+    tool_subsystem = KubernetesLint
+    partitioner_type = PartitionerType.CUSTOM
+
+
+@dataclass(frozen=True)
+class CustomResourceSchemaIndex:
+    """The schemas of all custom resource definitions, by (apiVersion, kind).
+
+    `errors` holds the files of `[k8s-lint].crds` that failed to parse.
+    """
+
+    schemas: FrozenDict[tuple[str, str], str]
+    errors: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class CustomResourceDefinitionsRequest:
+    path: str
+    content: bytes
+
+
+@dataclass(frozen=True)
+class CustomResourceDefinitions:
+    schemas: FrozenDict[tuple[str, str], str]
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class ValidateDocumentRequest:
+    """A single document, as JSON, with the custom resource schemas of the kinds it contains.
+
+    The engine memoizes results per request, so unchanged documents are not validated again, and
+    changing a definition only validates the documents of its kinds again.
+    """
+
+    document: str
+    custom_schemas: FrozenDict[tuple[str, str], str]
+    ignore_missing_schemas: bool
+
+
+@dataclass(frozen=True)
+class DocumentValidation:
+    errors: tuple[str, ...]
+
+
+@rule
+def parse_custom_resource_definitions(
+    request: CustomResourceDefinitionsRequest,
+) -> CustomResourceDefinitions:
+    """Parses the definitions of a single file, so the engine memoizes them per file content."""
+    try:
+        documents = load_documents(request.content)
+    except ValueError as e:
+        return CustomResourceDefinitions(FrozenDict(), str(e))
+
+    schemas: dict[tuple[str, str], str] = {}
+    for document in documents:
+        schemas.update(custom_resource_schemas(document))
+    return CustomResourceDefinitions(FrozenDict(schemas))
+
+
+@rule(desc="Indexing custom resource definitions", level=LogLevel.DEBUG)
+async def index_custom_resource_schemas(
+    all_targets: AllTargets, subsystem: KubernetesLint
+) -> CustomResourceSchemaIndex:
+    """Indexes the definitions of `[k8s-lint].crds` and of all `k8s_source` files once.
+
+    The index does not depend on how `pants lint` batches the linted targets, so a custom resource
+    is validated the same way whichever batch its definition is in. Generated manifests are not
+    indexed, as that would generate every target in the repository.
+    """
+    sources, crds = await MultiGet(
+        Get(
+            SourceFiles,
+            SourceFilesRequest(
+                target[KubernetesSourceField]
+                for target in all_targets
+                if target.has_field(KubernetesSourceField)
+            ),
+        ),
+        Get(
+            DigestContents,
+            PathGlobs(
+                subsystem.crds,
+                glob_match_error_behavior=GlobMatchErrorBehavior.warn,
+                description_of_origin="the option `[k8s-lint].crds`",
+            ),
+        ),
+    )
+    contents = await Get(DigestContents, Digest, sources.snapshot.digest)
+
+    # Files are only parsed if they can hold a definition. Those failing to parse are reported when
+    # they are linted themselves.
+    files = [file for file in contents if b"CustomResourceDefinition" in file.content]
+    definitions = await MultiGet(
+        Get(CustomResourceDefinitions, CustomResourceDefinitionsRequest(file.path, file.content))
+        for file in (*crds, *files)
+    )
+
+    schemas: dict[tuple[str, str], str] = {}
+    for definition in definitions:
+        schemas.update(definition.schemas)
+    errors = tuple(
+        f"{file.path}: failed to parse custom resource definitions: {definition.error}"
+        for file, definition in zip(crds, definitions)
+        if definition.error is not None
+    )
+
+    return CustomResourceSchemaIndex(FrozenDict(schemas), errors)
+
+
+@rule
+def validate_kubernetes_document(request: ValidateDocumentRequest) -> DocumentValidation:
+    errors = validate_document(
+        json.loads(request.document), request.custom_schemas, request.ignore_missing_schemas
+    )
+    return DocumentValidation(tuple(errors))
+
+
+@rule
+async def partition_kubernetes_lint(
+    request: KubernetesLintRequest.PartitionRequest[KubernetesLintFieldSet],
+    subsystem: KubernetesLint,
+    union_membership: UnionMembership,
+) -> Partitions[KubernetesLintFieldSet, Any]:
+    if subsystem.skip:
+        return Partitions()
+
+    field_sets = tuple(
+        field_set
+        for field_set in request.field_sets
+        if isinstance(field_set.sources, KubernetesSourceField)
+        or field_set.sources.can_generate(KubernetesSourceField, union_membership)
+    )
+    return Partitions.single_partition(field_sets) if field_sets else Partitions()
+
+
+@rule(desc="Validate Kubernetes manifests")
+async def run_kubernetes_lint(
+    request: KubernetesLintRequest.Batch[KubernetesLintFieldSet, Any],
+    subsystem: KubernetesLint,
+    schema_index: CustomResourceSchemaIndex,
+) -> LintResult:
+    sources = await Get(
+        SourceFiles,
+        SourceFilesRequest(
+            [field_set.sources for field_set in request.elements],
+            for_sources_types=(KubernetesSourceField,),
+            enable_codegen=True,
+        ),
+    )
+    contents = await Get(DigestContents, Digest, sources.snapshot.digest)
+
+    stderr = list(schema_index.errors)
+    documents: list[tuple[str, int, Any]] = []
+    for file in contents:
+        try:
+            loaded = load_documents(file.content)
+        except ValueError as e:
+            stderr.append(f"{file.path}: failed to parse: {e}")
+            continue
+        documents.extend((file.path, index, document) for index, document in enumerate(loaded))
+
+    # Generated definitions are not indexed, but apply to the documents of their own file.
+    file_schemas: dict[str, dict[tuple[str, str], str]] = {}
+    for path, _, document in documents:
+        file_schemas.setdefault(path, {}).update(custom_resource_schemas(document))
+
+    validations = await MultiGet(
+        Get(
+            DocumentValidation,
+            ValidateDocumentRequest(
+                json.dumps(document, sort_keys=True, default=str),
+                _schemas_of(document, file_schemas[path], schema_index.schemas),
+                subsystem.ignore_missing_schemas,
+            ),
+        )
+        for path, _, document in documents
+    )
+
+    for (path, index, document), validation in zip(documents, validations):
+        name = _describe(document)
+        stderr.extend(f"{path}[{index}] {name}: {error}" for error in validation.errors)
+
+    exit_code = 1 if stderr else 0
+    stdout = f"Validated {pluralize(len(documents), 'document')} in {pluralize(len(contents), 'file')}.\n"
+
+    return LintResult(
+        exit_code,
+        stdout,
+        "\n".join(stderr) + ("\n" if stderr else ""),
+        linter_name=KubernetesLintRequest.tool_name,
+        partition_description=request.partition_metadata.description
+        if request.partition_metadata
+        else None,
+    )
+
+
+def _schemas_of(document: Any, *schemas: Mapping[tuple[str, str], str]) -> FrozenDict:
+    """The schemas of the kinds in `document`, from the first of `schemas` that has each."""
+    found = {}
+    for kind in sorted(document_kinds(document)):
+        schema = next((kind_schemas[kind] for kind_schemas in schemas if kind in kind_schemas), None)
+        if schema is not None:
+            found[kind] = schema
+    return FrozenDict(found)
+
+
+def _describe(document: Any) -> str:
+    if not isinstance(document, dict):
+        return "<invalid>"
+    metadata = document.get("metadata") if isinstance(document.get("metadata"), dict) else {}
+    return f"{document.get('kind', '<unknown>')}/{metadata.get('name', '<unnamed>')}"
+
+
+def rules():
+    return [
+        *collect_rules(),
+        *KubernetesLintRequest.rules(),
+    ]
@@ -1,14 +1,30 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import pkgutil
+import shlex
 from dataclasses import dataclass
+from typing import Iterable, Mapping
 
+from pants.base.build_root import BuildRoot
 from pants.core.goals.run import RunFieldSet, RunInSandboxBehavior, RunRequest
 from pants.core.util_rules.environments import EnvironmentNameRequest
 from pants.core.util_rules.external_tool import DownloadedExternalTool, ExternalToolRequest
 from pants.core.util_rules.source_files import SourceFiles, SourceFilesRequest
-from pants.engine.addresses import Addresses, UnparsedAddressInputs
+from pants.core.util_rules.system_binaries import BashBinary
+from pants.engine.addresses import Address, Addresses, UnparsedAddressInputs
 from pants.engine.environment import EnvironmentName
-from pants.engine.fs import EMPTY_DIGEST, Digest, MergeDigests
+from pants.engine.fs import (
+    EMPTY_DIGEST,
+    CreateDigest,
+    Digest,
+    DigestContents,
+    DigestSubset,
+    FileContent,
+    MergeDigests,
+    PathGlobs,
+)
 from pants.engine.platform import Platform
 from pants.engine.process import Process
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
@@ -20,14 +36,19 @@ from pants.engine.target import (
     WrappedTarget,
     WrappedTargetRequest,
 )
-from pants.engine.unions import UnionMembership
 
-from pants_backend_k8s.subsystem import KubernetesTool
+from pants_backend_k8s.subsystem import (
+    KubernetesApply,
+    KubernetesObjects,
+    KubernetesTool,
+    SkipUnchanged,
+)
 from pants_backend_k8s.target_types import (
     KubeconfigDependencyField,
     KubernetesClusterField,
     KubernetesCommandField,
     KubernetesContextField,
+    KubernetesKindField,
     KubernetesNamespaceField,
     KubernetesSourceField,
     KubernetesTarget,
@@ -41,11 +62,15 @@ from pants_backend_k8s.util.kubeconfig import (
     KubeconfigRequestWrap,
     KubeconfigResponse,
 )
-
-
-@dataclass(frozen=True)
-class KubernetesCommandProcessRequest:
-    target: Target
+from pants_backend_k8s.util.ordering import (
+    Resource,
+    manifest_resources,
+    parse_kinds,
+    readiness_check,
+    split_evenly,
+    wave_of,
+)
+from pants_backend_k8s.util.rollout import WATCHED_KINDS
 
 
 @dataclass(frozen=True)
@@ -78,13 +103,10 @@ async def compute_command_line(
         download_kubernetes_get,
     )
 
-    target_file = sources.files[0]
-
     command = [
         f"{{chroot}}/{tool.exe}",
         kubernetes_command[KubernetesCommandField].value,
-        "-f",
-        f"{{chroot}}/{target_file}",
+        *file_arguments(sources.files),
         "--context",
         kubernetes_command[KubernetesClusterField].value,
     ]
@@ -104,43 +126,78 @@ async def compute_command_line(
     )
 
 
+@dataclass(frozen=True)
+class KubernetesObjectRequest:
+    target: Target
+
+
+@dataclass(frozen=True)
+class KubernetesObject:
+    """Everything needed to run `kubectl` against a single `kubernetes` target on one cluster.
+
+    `files` are the manifests in `digest`, while paths in `flags` are prefixed with `{chroot}`.
+    `cluster` is the address of the kubeconfig target used.
+    """
+
+    address: Address
+    cluster: str
+    command: str
+    files: tuple[str, ...]
+    kinds: tuple[str, ...]
+    flags: tuple[str, ...]
+    digest: Digest
+
+
+@dataclass(frozen=True)
+class KubernetesObjectsPerCluster:
+    """A `kubernetes` target resolved against each of its kubeconfigs, in the order given."""
+
+    objects: tuple[KubernetesObject, ...]
+
+
 @rule
-async def prepare_kubernetes_command_process(
-    request: KubernetesCommandProcessRequest,
+async def resolve_kubernetes_object(
+    request: KubernetesObjectRequest,
     tool: KubernetesTool,
     platform: Platform,
-    unions: UnionMembership,
-) -> Process:
+) -> KubernetesObjectsPerCluster:
     kubernetes_command: KubernetesTarget = request.target
 
-    kubeconfig_address = await Get(
+    kubeconfig_addresses = await Get(
         Addresses,
         UnparsedAddressInputs(
-            kubernetes_command[KubeconfigDependencyField].value,
+            kubernetes_command[KubeconfigDependencyField].value or (),
             owning_address=request.target.address,
-            description_of_origin="asd",
+            description_of_origin=f"the `kubeconfig` field of {request.target.address}",
         ),
     )
 
-    deps, kubeconfig_target, environment_name = await MultiGet(
+    if not kubeconfig_addresses:
+        raise ValueError(f"{request.target.address} must have at least one `kubeconfig`.")
+
+    deps, environment_name, *kubeconfig_targets = await MultiGet(
         Get(Targets, DependenciesRequest(kubernetes_command[KubernetesTemplateDependency])),
-        Get(
-            WrappedTarget,
-            WrappedTargetRequest(
-                kubeconfig_address[0],
-                description_of_origin="kubectl run",
-            ),
-        ),
         Get(
             EnvironmentName,
             EnvironmentNameRequest,
             EnvironmentNameRequest.from_target(request.target),
         ),
+        *(
+            Get(
+                WrappedTarget,
+                WrappedTargetRequest(address, description_of_origin="kubectl run"),
+            )
+            for address in kubeconfig_addresses
+        ),
     )
 
-    kubeconfig_request = await Get(KubeconfigRequestWrap, KubeconfigRequestRequest(kubeconfig_target.target))
+    kubeconfig_requests = await MultiGet(
+        Get(KubeconfigRequestWrap, KubeconfigRequestRequest(kubeconfig_target.target))
+        for kubeconfig_target in kubeconfig_targets
+    )
 
-    sources, kubeconfig, tool = await MultiGet(
+    # The manifests are rendered once, no matter how many clusters they are applied to.
+    sources, tool, *kubeconfigs = await MultiGet(
         Get(
             SourceFiles,
             SourceFilesRequest(
@@ -149,76 +206,370 @@ async def prepare_kubernetes_command_process(
                 enable_codegen=True,
             ),
         ),
-        Get(
-            KubeconfigResponse,
-            {kubeconfig_request.request: KubeconfigRequest, environment_name: EnvironmentName},
-        ),
         Get(DownloadedExternalTool, ExternalToolRequest, tool.get_request(platform)),
+        *(
+            Get(
+                KubeconfigResponse,
+                {kubeconfig_request.request: KubeconfigRequest, environment_name: EnvironmentName},
+            )
+            for kubeconfig_request in kubeconfig_requests
+        ),
+    )
+
+    if not sources.files:
+        raise ValueError(f"The `template` of {kubernetes_command.address} has no Kubernetes sources.")
+
+    input_digests = await MultiGet(
+        Get(
+            Digest,
+            MergeDigests(
+                [sources.snapshot.digest, tool.digest, *filter(None, [kubeconfig.digest])]
+            ),
+        )
+        for kubeconfig in kubeconfigs
     )
 
-    args = {}
-    digests = [sources.snapshot.digest, tool.digest]
+    objects = []
+    for address, kubeconfig, input_digest in zip(kubeconfig_addresses, kubeconfigs, input_digests):
+        args = {}
+        if kubeconfig.digest:
+            args["--kubeconfig"] = f"{{chroot}}/{kubeconfig.path}"
+        else:
+            args["--kubeconfig"] = kubeconfig.path
+
+        # Values on the target take precedence over the defaults of the kubeconfig target.
+        for flag, field, default in (
+            ("--namespace", KubernetesNamespaceField, kubeconfig.namespace),
+            ("--cluster", KubernetesClusterField, kubeconfig.cluster),
+            ("--context", KubernetesContextField, kubeconfig.context),
+            ("--user", KubernetesUserField, kubeconfig.user),
+        ):
+            value = kubernetes_command[field].value or default
+            if value:
+                args[flag] = value
+
+        flat = [item for pair in args.items() for item in pair]
+
+        objects.append(
+            KubernetesObject(
+                address=kubernetes_command.address,
+                cluster=str(address),
+                command=kubernetes_command[KubernetesCommandField].value,
+                files=sources.files,
+                kinds=parse_kinds(kubernetes_command[KubernetesKindField].value),
+                flags=(f"{{chroot}}/{tool.exe}", *flat),
+                digest=input_digest,
+            )
+        )
+
+    return KubernetesObjectsPerCluster(tuple(objects))
+
+
+@rule
+async def run_kubernetes_command_target(
+    request: RunKubernetesCommand,
+    subsystem: KubernetesObjects,
+    apply_subsystem: KubernetesApply,
+    build_root: BuildRoot,
+    bash: BashBinary,
+) -> RunRequest:
+    wrapped_tgt = await Get(
+        WrappedTarget,
+        WrappedTargetRequest(request.address, description_of_origin="<infallible>"),
+    )
 
-    if kubeconfig.digest:
-        digests.append(kubeconfig.digest)
-        args["--kubeconfig"] = f"{{chroot}}/{kubeconfig.path}"
+    per_cluster = await Get(KubernetesObjectsPerCluster, KubernetesObjectRequest(wrapped_tgt.target))
+    default_command = per_cluster.objects[0].command
 
-    else:
-        args["--kubeconfig"] = kubeconfig.path
+    digests = [kubernetes_object.digest for kubernetes_object in per_cluster.objects]
+    resources: tuple[Resource, ...] = ()
+    if subsystem.watch_rollout:
+        # The manifests of a target are the same for all of its clusters.
+        manifest, rollout_script = await MultiGet(
+            Get(KubernetesManifest, KubernetesObjectManifestRequest(per_cluster.objects[0])),
+            Get(Digest, CreateDigest([_rollout_script()])),
+        )
+        resources = manifest.resources
+        digests.append(rollout_script)
+
+    digest = await Get(Digest, MergeDigests(digests))
+
+    def cluster_lines(command: str, kubernetes_object: KubernetesObject) -> list[str]:
+        lines = _kubectl_lines(command, [kubernetes_object], apply_subsystem.skip_unchanged)
+        if subsystem.watch_rollout and command in _READY_COMMANDS:
+            lines.extend(_rollout_lines([(kubernetes_object, resources)], subsystem.ready_timeout))
+        return lines
+
+    lines = _dispatch_lines(
+        default_command,
+        {
+            command: _fan_out_lines(
+                [
+                    (kubernetes_object.cluster, cluster_lines(command, kubernetes_object))
+                    for kubernetes_object in per_cluster.objects
+                ],
+                subsystem.cluster_workers,
+            )
+            for command in KubernetesCommandField.valid_choices
+        },
+    )
+    return _script_run_request(lines, digest, apply_subsystem, build_root, bash)
 
-    input_digest = await Get(Digest, MergeDigests(digests))
-    if kubeconfig.namespace:
-        args["--namespace"] = kubeconfig.namespace
 
-    if kubernetes_command[KubernetesNamespaceField].value:
-        args["--namespace"] = kubeconfig.namespace
+@dataclass(frozen=True)
+class KubernetesManifestRequest:
+    path: str
+    content: bytes
 
-    if kubeconfig.cluster:
-        args["--cluster"] = kubeconfig.cluster
 
-    if kubernetes_command[KubernetesClusterField].value:
-        args["--cluster"] = kubeconfig.cluster
+@dataclass(frozen=True)
+class KubernetesManifest:
+    resources: tuple[Resource, ...]
 
-    if kubeconfig.context:
-        args["--context"] = kubeconfig.context
 
-    if kubernetes_command[KubernetesContextField].value:
-        args["--context"] = kubeconfig.context
+@rule
+def parse_kubernetes_manifest(request: KubernetesManifestRequest) -> KubernetesManifest:
+    try:
+        return KubernetesManifest(manifest_resources(request.content))
+    except ValueError as e:
+        raise ValueError(f"Failed to parse {request.path}: {e}") from e
 
-    if kubeconfig.user:
-        args["--user"] = kubeconfig.user
 
-    if kubernetes_command[KubernetesUserField].value:
-        args["--user"] = kubeconfig.user
+@dataclass(frozen=True)
+class KubernetesObjectManifestRequest:
+    object: KubernetesObject
 
-    flat = [item for pair in args.items() for item in pair]
 
-    target_file = sources.files[0]
-    command = (
-        f"{{chroot}}/{tool.exe}",
-        kubernetes_command[KubernetesCommandField].value,
-        "-f",
-        f"{{chroot}}/{target_file}",
-        *flat,
+@rule
+async def parse_kubernetes_object_manifests(request: KubernetesObjectManifestRequest) -> KubernetesManifest:
+    """Lists the objects in all manifests of a `kubernetes` target."""
+    contents = await Get(
+        DigestContents, DigestSubset(request.object.digest, PathGlobs(request.object.files))
+    )
+    manifests = await MultiGet(
+        Get(KubernetesManifest, KubernetesManifestRequest(file.path, file.content)) for file in contents
     )
+    return KubernetesManifest(tuple(resource for manifest in manifests for resource in manifest.resources))
+
 
-    return Process(
-        command,
-        description=f"Running {kubernetes_command.alias} {kubernetes_command.address}",
-        input_digest=input_digest,
+def file_arguments(files: Iterable[str]) -> tuple[str, ...]:
+    """Passes each manifest to `kubectl` with its own `-f`, in the order given."""
+    return tuple(arg for file in files for arg in ("-f", f"{{chroot}}/{file}"))
+
+
+# The commands after which objects can be waited for.
+_READY_COMMANDS = ("apply", "create", "replace")
+
+_ROLLOUT_SCRIPT = "__k8s_rollout.py"
+
+
+def _rollout_script() -> FileContent:
+    content = pkgutil.get_data("pants_backend_k8s.util", "rollout.py")
+    assert content is not None
+    return FileContent(_ROLLOUT_SCRIPT, content)
+
+
+# The arguments passed after the command, e.g. `pants run //:obj -- apply --dry-run=server`. This
+# form does not trip `set -u` on older versions of bash.
+_EXTRA_ARGS = '${@+"$@"}'
+
+
+def _shell_join(argv: Iterable[str]) -> str:
+    # `{chroot}` is only substituted in arguments and the environment, not in the script itself.
+    return " ".join(shlex.quote(arg) for arg in argv).replace("{chroot}", "'\"$CHROOT\"'")
+
+
+def _fingerprint(kubernetes_object: KubernetesObject) -> tuple[str, str]:
+    """The state file of an object and the fingerprint of what would be applied.
+
+    The state file is keyed by the object and the cluster, context, namespace and so on it is
+    applied to; the fingerprint covers the manifest, `kubectl` and the kubeconfig.
+    """
+    key = "\0".join([str(kubernetes_object.address), *kubernetes_object.flags])
+    return hashlib.sha256(key.encode()).hexdigest()[:32], kubernetes_object.digest.fingerprint
+
+
+def _kubectl_lines(
+    command: str,
+    objects: Iterable[KubernetesObject],
+    skip_unchanged: SkipUnchanged = SkipUnchanged.never,
+) -> list[str]:
+    """One `kubectl` invocation per group of objects sharing a kubeconfig, context and so on."""
+    groups: dict[tuple[str, ...], list[KubernetesObject]] = {}
+    for kubernetes_object in objects:
+        groups.setdefault(kubernetes_object.flags, []).append(kubernetes_object)
+
+    if command != "apply":
+        skip_unchanged = SkipUnchanged.never
+
+    lines = []
+    for flags, group in groups.items():
+        kubectl, *rest = flags
+        addresses = ", ".join(str(kubernetes_object.address) for kubernetes_object in group)
+        lines.append(_shell_join(["echo", f"==> kubectl {command}: {addresses}"]))
+
+        if skip_unchanged == SkipUnchanged.never:
+            files = file_arguments(
+                file for kubernetes_object in group for file in kubernetes_object.files
+            )
+            lines.append(f"{_shell_join([kubectl, command, *files, *rest])} {_EXTRA_ARGS}")
+            continue
+
+        # Only the objects that changed are passed to `kubectl`, which is skipped if there are none.
+        lines.append("files=()")
+        for kubernetes_object in group:
+            files = file_arguments(kubernetes_object.files)
+            unchanged = _shell_join(["echo", f"    unchanged: {kubernetes_object.address}"])
+            changed = f"files+=({_shell_join(files)})"
+            if skip_unchanged == SkipUnchanged.fingerprint:
+                key, fingerprint = _fingerprint(kubernetes_object)
+                condition = f'[ "$(cat "$K8S_APPLIED/{key}" 2>/dev/null)" = {fingerprint} ]'
+                lines.append(f"if {condition}; then {unchanged}; else {changed}; fi")
+            else:
+                # `kubectl diff` exits with 1 if there are differences, and above that on errors.
+                diff = _shell_join([kubectl, "diff", *files, *rest])
+                lines.append(
+                    f"if {diff} >/dev/null; then {unchanged}; "
+                    f'else status=$?; [ "$status" = 1 ] || exit "$status"; {changed}; fi'
+                )
+
+        apply = f'{_shell_join([kubectl, command])} "${{files[@]}}" {_shell_join(rest)} {_EXTRA_ARGS}'
+        record = []
+        if skip_unchanged == SkipUnchanged.fingerprint:
+            # Extra arguments such as `--dry-run` may mean nothing was applied.
+            record.append('mkdir -p "$K8S_APPLIED"')
+            for kubernetes_object in group:
+                key, fingerprint = _fingerprint(kubernetes_object)
+                record.append(f'echo {fingerprint} > "$K8S_APPLIED/{key}"')
+            record = [f'[ "$#" -gt 0 ] || {{ {"; ".join(record)}; }}']
+        lines.append(f'if [ "${{#files[@]}}" -gt 0 ]; then {"; ".join([apply, *record])}; fi')
+
+    return lines
+
+
+def _rollout_lines(
+    objects: Iterable[tuple[KubernetesObject, tuple[Resource, ...]]], timeout: str
+) -> list[str]:
+    """Watches the workloads among `objects` until they have rolled out.
+
+    One watcher runs per kubeconfig, context and so on, all of them concurrently.
+    """
+    groups: dict[tuple[str, ...], list[str]] = {}
+    for kubernetes_object, object_resources in objects:
+        for resource in object_resources:
+            if resource.kind.lower() not in WATCHED_KINDS:
+                continue
+            workload = resource.reference
+            if resource.namespace:
+                workload = f"{resource.namespace}/{workload}"
+            groups.setdefault(kubernetes_object.flags, []).append(workload)
+
+    if not groups:
+        return []
+
+    return _parallel_lines(
+        [
+            [
+                _shell_join(["echo", f"==> waiting for {len(workloads)} workloads to roll out"]),
+                _shell_join(
+                    [
+                        "python3",
+                        f"{{chroot}}/{_ROLLOUT_SCRIPT}",
+                        "--timeout",
+                        timeout,
+                        *dict.fromkeys(workloads),
+                        "--",
+                        *flags,
+                    ]
+                ),
+            ]
+            for flags, workloads in groups.items()
+        ]
     )
 
 
-@rule
-async def run_kubernetes_command_target(request: RunKubernetesCommand) -> RunRequest:
-    wrapped_tgt = await Get(
-        WrappedTarget,
-        WrappedTargetRequest(request.address, description_of_origin="<infallible>"),
+def _dispatch_lines(default: str, commands: Mapping[str, list[str]]) -> list[str]:
+    """Runs the lines of the command given as the first argument, passing the rest to `kubectl`."""
+    lines = [f'command="${{1:-{default}}}"', '[ "$#" = 0 ] || shift', 'case "$command" in']
+    for command, body in commands.items():
+        lines.extend([f"{command})", *body, ";;"])
+    expected = ", ".join(commands)
+    lines.extend(
+        [
+            f'*) echo "Unknown command: $command. Expected one of: {expected}." >&2; exit 1 ;;',
+            "esac",
+        ]
     )
-    process = await Get(Process, KubernetesCommandProcessRequest(wrapped_tgt.target))
+    return lines
+
+
+def _fan_out_lines(jobs: list[tuple[str, list[str]]], workers: int) -> list[str]:
+    """Runs the lines of each cluster concurrently, prefixing their output and summarizing results.
+
+    Each cluster is run to completion even if another one fails.
+    """
+    if len(jobs) == 1:
+        return jobs[0][1]
+
+    chunks = []
+    for chunk in split_evenly(jobs, workers):
+        chunk_lines = []
+        for cluster, body in chunk:
+            prefix = shlex.quote(f"[{cluster}] ")
+            chunk_lines.extend(
+                [
+                    # `set -e` is ignored in conditions, so the status is checked separately.
+                    "set +e",
+                    "(",
+                    "set -e",
+                    *body,
+                    ") 2>&1 | while IFS= read -r line; do printf '%s%s\\n' "
+                    + prefix
+                    + ' "$line"; done',
+                    "status=$?",
+                    "set -e",
+                    'if [ "$status" = 0 ]; then result=ok; else result=failed; fi',
+                    f'echo {shlex.quote(f"{cluster}: ")}"$result" >> "$K8S_SUMMARY"',
+                ]
+            )
+        chunks.append(chunk_lines)
+
+    return [
+        'K8S_SUMMARY="$(mktemp)"',
+        'trap \'rm -f "$K8S_SUMMARY"\' EXIT',
+        *_parallel_lines(chunks),
+        "echo '==> Summary'",
+        'cat "$K8S_SUMMARY"',
+        '! grep -q ": failed$" "$K8S_SUMMARY"',
+    ]
+
+
+def _parallel_lines(jobs: list[list[str]]) -> list[str]:
+    """Runs each job in the background and fails if any of them failed."""
+    if len(jobs) == 1:
+        return jobs[0]
+
+    lines = ["pids=()"]
+    for job in jobs:
+        lines.extend(["(", *job, ") &", 'pids+=("$!")'])
+    lines.append('failed=0; for pid in "${pids[@]}"; do wait "$pid" || failed=1; done; [ "$failed" = 0 ]')
+    return lines
+
+
+def _script_run_request(
+    lines: list[str],
+    digest: Digest,
+    apply_subsystem: KubernetesApply,
+    build_root: BuildRoot,
+    bash: BashBinary,
+) -> RunRequest:
     return RunRequest(
-        digest=process.input_digest,
-        args=process.argv,
+        digest=digest,
+        args=(bash.path, "-c", "\n".join(["set -euo pipefail", *lines]), "kubectl"),
+        extra_env={
+            "CHROOT": "{chroot}",
+            "K8S_APPLIED": os.path.join(build_root.path, apply_subsystem.state_dir),
+        },
     )
 
 
@@ -228,24 +579,141 @@ class KubernetesTargetBundleCommandProcessRequest:
 
 
 class RunKubernetesTargetBundleCommand(RunFieldSet):
-    required_fields = (KubernetesTargetBundleDependencies,)
+    required_fields = (KubernetesTargetBundleDependencies, KubernetesCommandField)
     run_in_sandbox_behavior = RunInSandboxBehavior.RUN_REQUEST_HERMETIC
 
+    objects: KubernetesTargetBundleDependencies
+    command: KubernetesCommandField
+
+
+def _wave_lines(
+    command: str,
+    waves: list[list[tuple[KubernetesObject, tuple[Resource, ...]]]],
+    subsystem: KubernetesObjects,
+    apply_subsystem: KubernetesApply,
+) -> list[str]:
+    # Dependents are removed before what they depend on.
+    if command == "delete":
+        waves = waves[::-1]
+
+    wait_for_ready = subsystem.wait_for_ready and command in _READY_COMMANDS
+    watch_rollout = subsystem.watch_rollout and command in _READY_COMMANDS
+
+    lines = []
+    for position, members_of_wave in enumerate(waves):
+        lines.append(_shell_join(["echo", f"==> wave {position + 1}/{len(waves)}"]))
+        lines.extend(
+            _parallel_lines(
+                [
+                    _kubectl_lines(
+                        command,
+                        [kubernetes_object for kubernetes_object, _ in chunk],
+                        apply_subsystem.skip_unchanged,
+                    )
+                    for chunk in split_evenly(members_of_wave, subsystem.workers)
+                ]
+            )
+        )
+
+        if not wait_for_ready or position == len(waves) - 1:
+            continue
+
+        lines.extend(_rollout_lines(members_of_wave, subsystem.ready_timeout))
+        for kubernetes_object, object_resources in members_of_wave:
+            kubectl, *flags = kubernetes_object.flags
+            for resource in object_resources:
+                # Workloads are watched above, rather than with `kubectl rollout status`.
+                if resource.kind.lower() in WATCHED_KINDS:
+                    continue
+                check = readiness_check(resource, subsystem.ready_timeout)
+                if check is None:
+                    continue
+                namespace = ("--namespace", resource.namespace) if resource.namespace else ()
+                lines.append(_shell_join([kubectl, *check, *flags, *namespace]))
+
+    if watch_rollout:
+        lines.extend(
+            _rollout_lines(
+                [member for members_of_wave in waves for member in members_of_wave],
+                subsystem.ready_timeout,
+            )
+        )
+
+    return lines
+
 
 @rule
 async def run_kubernetes_target_bundle_command_target(
     request: RunKubernetesTargetBundleCommand,
+    subsystem: KubernetesObjects,
+    apply_subsystem: KubernetesApply,
+    build_root: BuildRoot,
+    bash: BashBinary,
 ) -> RunRequest:
-    wrapped_tgt = await Get(
-        WrappedTarget,
-        WrappedTargetRequest(request.address, description_of_origin="<infallible>"),
-    )
+    members = await Get(Targets, DependenciesRequest(request.objects))
 
-    process = await Get(Process, KubernetesCommandProcessRequest(wrapped_tgt.target))
-    return RunRequest(
-        digest=process.input_digest,
-        args=process.argv,
+    invalid = [str(member.address) for member in members if not isinstance(member, KubernetesTarget)]
+    if invalid:
+        raise ValueError(
+            f"The `objects` of {request.address} must be `k8s_object` targets, but got: "
+            f"{', '.join(invalid)}."
+        )
+
+    if not members:
+        raise ValueError(f"No objects found in {request.address}.")
+
+    per_cluster = await MultiGet(
+        Get(KubernetesObjectsPerCluster, KubernetesObjectRequest(member)) for member in members
+    )
+    # The manifests of a target are the same for all of its clusters.
+    objects = [member_objects.objects[0] for member_objects in per_cluster]
+
+    # The manifests are only read when the `kind` of an object is not given, or to wait for it.
+    waits = subsystem.wait_for_ready or subsystem.watch_rollout
+    resources: list[tuple[Resource, ...]] = [() for _ in objects]
+    to_parse = [
+        index for index, kubernetes_object in enumerate(objects) if waits or not kubernetes_object.kinds
+    ]
+    manifests = await MultiGet(
+        Get(KubernetesManifest, KubernetesObjectManifestRequest(objects[index])) for index in to_parse
+    )
+    for index, manifest in zip(to_parse, manifests):
+        resources[index] = manifest.resources
+
+    # Each cluster goes through its own waves, independently of the other clusters.
+    clusters: dict[str, dict[int, list[tuple[KubernetesObject, tuple[Resource, ...]]]]] = {}
+    for member_objects, object_resources in zip(per_cluster, resources):
+        for kubernetes_object in member_objects.objects:
+            kinds = kubernetes_object.kinds or tuple(resource.kind for resource in object_resources)
+            waves = clusters.setdefault(kubernetes_object.cluster, {})
+            waves.setdefault(wave_of(kinds), []).append((kubernetes_object, object_resources))
+
+    ordered_waves = {cluster: [waves[wave] for wave in sorted(waves)] for cluster, waves in clusters.items()}
+
+    digests = [
+        kubernetes_object.digest
+        for member_objects in per_cluster
+        for kubernetes_object in member_objects.objects
+    ]
+    if waits:
+        digests.append(await Get(Digest, CreateDigest([_rollout_script()])))
+
+    digest = await Get(Digest, MergeDigests(digests))
+
+    lines = _dispatch_lines(
+        request.command.value,
+        {
+            command: _fan_out_lines(
+                [
+                    (cluster, _wave_lines(command, waves, subsystem, apply_subsystem))
+                    for cluster, waves in ordered_waves.items()
+                ],
+                subsystem.cluster_workers,
+            )
+            for command in KubernetesCommandField.valid_choices
+        },
     )
+    return _script_run_request(lines, digest, apply_subsystem, build_root, bash)
 
 
 def rules():
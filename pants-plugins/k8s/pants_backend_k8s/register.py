@@ -1,12 +1,12 @@
-from pants_backend_k8s import target_generators
+from pants_backend_k8s import codegen
 from pants_backend_k8s import target_types as targets
-from pants_backend_k8s.goals import run
+from pants_backend_k8s.goals import lint, run
 from pants_backend_k8s.util import kubeconfig
 
 
 def target_types():
-    return [*targets.targets(), *target_generators.targets()]
+    return targets.targets()
 
 
 def rules():
-    return [*kubeconfig.rules(), *target_generators.rules(), *run.rules()]
+    return [*codegen.rules(), *kubeconfig.rules(), *lint.rules(), *run.rules()]
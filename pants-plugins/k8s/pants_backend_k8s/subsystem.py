@@ -1,7 +1,19 @@
 from __future__ import annotations
 
+from enum import Enum
+
 from pants.core.util_rules.external_tool import ExternalTool
 from pants.engine.platform import Platform
+from pants.option.option_types import (
+    BoolOption,
+    EnumOption,
+    IntOption,
+    SkipOption,
+    StrListOption,
+    StrOption,
+)
+from pants.option.subsystem import Subsystem
+from pants.util.strutil import softwrap
 
 
 class KubernetesTool(ExternalTool):
@@ -25,3 +37,114 @@ class KubernetesTool(ExternalTool):
         }
         plat_str = platform_mapping[plat.value]
         return f"https://dl.k8s.io/release/{self.version}/bin/{plat_str}/kubectl"
+
+
+class KubernetesLint(Subsystem):
+    options_scope = "k8s-lint"
+    name = "k8s-lint"
+    help = "Offline validation of Kubernetes manifests against bundled schemas."
+
+    skip = SkipOption("lint")
+
+    crds = StrListOption(
+        default=[],
+        help=softwrap("""
+            Globs of files with `CustomResourceDefinition`s, relative to the build root. Custom
+            resources are validated against the schemas of these, as well as of the definitions in
+            all `k8s_source` files and in the same generated manifest.
+            """),
+    )
+
+    ignore_missing_schemas = BoolOption(
+        default=True,
+        help=softwrap("""
+            If false, documents of a kind that has neither a bundled schema nor a custom resource
+            definition are reported as errors.
+            """),
+    )
+
+
+class KubernetesObjects(Subsystem):
+    options_scope = "k8s-objects"
+    name = "k8s-objects"
+    help = "Options for running commands against `k8s_object` and `k8s_objects` targets."
+
+    workers = IntOption(
+        default=1,
+        help=softwrap("""
+            The number of `kubectl` processes to run concurrently for objects in the same wave.
+            Objects are ordered into waves by kind, e.g. namespaces and custom resource definitions
+            before the objects using them, and each wave completes before the next starts.
+            """),
+    )
+
+    cluster_workers = IntOption(
+        default=4,
+        help=softwrap("""
+            The number of clusters to run commands against concurrently, for objects with several
+            kubeconfigs. Each cluster runs to completion even if another fails, and the results are
+            summarized at the end.
+            """),
+    )
+
+    wait_for_ready = BoolOption(
+        default=False,
+        help=softwrap("""
+            When applying, creating or replacing objects, wait for custom resource definitions to be
+            established, workloads to roll out and jobs to complete before starting the next wave.
+            The workloads of a wave are watched together, as with `watch_rollout`.
+            """),
+    )
+
+    watch_rollout = BoolOption(
+        default=False,
+        help=softwrap("""
+            After applying, creating or replacing objects, wait for all deployments, stateful sets and
+            daemon sets among them to roll out. Workloads are watched concurrently, with one watch per
+            namespace rather than polling each object, and the time each took to become ready is
+            reported. The wait fails as soon as a pod of their new revision is crash looping or
+            can't pull its image; pods of the revision being replaced are ignored.
+
+            This runs a small Python script, so `python3` has to be on the `PATH`.
+            """),
+    )
+
+    ready_timeout = StrOption(
+        default="5m",
+        help="How long to wait for objects to become ready, as a `kubectl` duration.",
+    )
+
+
+class SkipUnchanged(Enum):
+    never = "never"
+    fingerprint = "fingerprint"
+    diff = "diff"
+
+
+class KubernetesApply(Subsystem):
+    options_scope = "k8s-apply"
+    name = "k8s-apply"
+    help = "Options for applying kubernetes objects."
+
+    skip_unchanged = EnumOption(
+        default=SkipUnchanged.never,
+        help=softwrap("""
+            Whether to skip `kubectl apply` for objects that have not changed.
+
+            With `fingerprint`, an object is skipped if its rendered manifest, kubeconfig and flags
+            are the same as the last time it was applied successfully from this workspace. This does
+            not contact the cluster, so changes made to the cluster by other means are not detected.
+
+            With `diff`, an object is skipped if `kubectl diff` reports no differences against the
+            cluster, which still takes one request per object but avoids all writes.
+            """),
+    )
+
+    state_dir = StrOption(
+        default=".pants.d/k8s/applied",
+        help=softwrap("""
+            Where the fingerprints of applied objects are stored, relative to the build root. Removing
+            it makes the next apply run for all objects.
+            """),
+        advanced=True,
+    )
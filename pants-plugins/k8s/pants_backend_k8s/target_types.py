@@ -1,20 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, Optional, Tuple
-
 from pants.engine.target import (
     COMMON_TARGET_FIELDS,
-    Address,
     Dependencies,
-    InvalidFieldException,
+    DictStringToStringField,
     OptionalSingleSourceField,
     SingleSourceField,
     SpecialCasedDependencies,
     StringField,
     Target,
 )
-from pants.util.strutil import pluralize, softwrap
+from pants.util.strutil import softwrap
 
 
 class KubeconfigClusterField(StringField):
@@ -90,23 +86,10 @@ class KubeConfig(Target):
 
 class KubeconfigDependencyField(SpecialCasedDependencies):
     alias = "kubeconfig"
-    help = "The kubeconfig target to use for this target."
-
-    @classmethod
-    def compute_value(cls, raw_value: Optional[Iterable[str]], address: Address) -> Optional[Tuple[str, ...]]:
-        value = super().compute_value(raw_value, address)
-
-        if value is None:
-            return None
-
-        if len(value) > 1:
-            pluralize(cls.expected_num_files, "file")
-            raise InvalidFieldException(
-                f"The {repr(cls.alias)} field in target {cls.address} must have "
-                f"a single dependency, but it had {pluralize(len(value), 'dependencies')}."
-            )
-
-        return value
+    help = softwrap("""
+        The kubeconfig targets to use for this target. With several, commands are run against each
+        of them, e.g. one per cluster or context.
+        """)
 
 
 class KubernetesSourceField(SingleSourceField):
@@ -123,11 +106,57 @@ class KubernetesSourceTarget(Target):
     help = "A single Kubernetes source file."
 
 
+class KubernetesTemplateSourceField(SingleSourceField):
+    expected_file_extensions = (".yaml", ".yml", ".json")
+    alias = "source"
+    help = softwrap("""
+        The manifest to render, with `${name}` placeholders for the `values`. A literal `${name}`
+        is written `$${name}`.
+        """)
+
+
+class KubernetesTemplateValuesField(DictStringToStringField):
+    alias = "values"
+    help = softwrap("""
+        The values of the placeholders in the template, e.g. `{"env": "prod", "replicas": "3"}`.
+
+        A value that is the address of one of the `dependencies`, e.g. `:image` or `//app:image`, is
+        replaced by what that target provides, e.g. the digest of an `oci_image`. Such values are
+        resolved whenever the manifest is generated, e.g. by `lint` or `package`, so an `oci_image`
+        is then built and published. A value starting with `:` or `//` that is not one of the
+        `dependencies` is an error.
+        """)
+
+
+class KubernetesTemplateDependenciesField(Dependencies):
+    help = softwrap("""
+        Targets providing values, such as images. They are referenced from `values` by their
+        address, which may be spelled differently than here.
+        """)
+
+
+class KubernetesTemplateTarget(Target):
+    alias = "k8s_template"
+    core_fields = (
+        *COMMON_TARGET_FIELDS,
+        KubernetesTemplateSourceField,
+        KubernetesTemplateValuesField,
+        KubernetesTemplateDependenciesField,
+    )
+    help = softwrap("""
+        A manifest rendered from a template and values, e.g. one per environment. It can be used
+        wherever a `k8s_source` can, and is rendered without running any process.
+        """)
+
+
 class KubernetesCommandField(StringField):
     alias = "command"
     default = "describe"
     valid_choices = ("apply", "describe", "delete", "replace", "create", "get")
-    help = softwrap("""The command to run against the provided resource.""")
+    help = softwrap("""
+        The command to run against the provided resource when `pants run` is not given one, as in
+        `pants run //:obj -- apply`.
+        """)
 
 
 class KubernetesNamespaceField(StringField):
@@ -170,7 +199,7 @@ class KubernetesKindField(StringField):
 
 
 class KubernetesTarget(Target):
-    alias = "kubernetes"
+    alias = "k8s_object"
     core_fields = (
         *COMMON_TARGET_FIELDS,
         KubernetesTemplateDependency,
@@ -182,33 +211,35 @@ class KubernetesTarget(Target):
         KubeconfigDependencyField,
         KubernetesContextField,
     )
-    help = "A kubernetes target."
-
-
-@dataclass(frozen=True)
-class KubernetesCommandProcessRequest:
-    target: Target
-
-
-@dataclass(frozen=True)
-class KubernetesCommandLineProcessRequest:
-    target: Target
+    help = softwrap("""
+        Kubernetes objects to run `kubectl` commands against, e.g. `pants run //:obj -- apply`.
+        """)
 
 
 class KubernetesTargetBundleDependencies(Dependencies):
-    help = "the name of the dependency to use as the template"
+    help = "The `k8s_object` targets to manage together."
     alias = "objects"
 
 
 class KubernetesTargetBundle(Target):
-    alias = "kubernetes"
+    alias = "k8s_objects"
     core_fields = (
         *COMMON_TARGET_FIELDS,
         KubernetesTargetBundleDependencies,
         KubernetesCommandField,
     )
-    help = "A kubernetes target."
+    help = softwrap("""
+        `k8s_object`s that are managed together, e.g. `pants run //:all -- apply`. Objects sharing a
+        kubeconfig, cluster, context, namespace and user are passed to a single `kubectl` invocation.
+        """)
 
 
 def targets():
-    return [KubernetesSourceTarget, KubernetesTarget, HostKubeConfig, KubeConfig]
+    return [
+        KubernetesSourceTarget,
+        KubernetesTemplateTarget,
+        KubernetesTarget,
+        KubernetesTargetBundle,
+        HostKubeConfig,
+        KubeConfig,
+    ]
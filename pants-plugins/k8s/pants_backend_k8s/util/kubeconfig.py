@@ -1,18 +1,24 @@
 from __future__ import annotations
 
+import os
 from abc import ABCMeta
 from dataclasses import dataclass
-from pathlib import Path
+from textwrap import dedent
 from typing import ClassVar, Generic, Type, TypeVar
 
+import yaml
 from pants.core.target_types import FileSourceField
 from pants.core.util_rules.source_files import SourceFiles, SourceFilesRequest
-from pants.engine.addresses import Addresses, UnparsedAddressInputs
+from pants.core.util_rules.system_binaries import BashBinary
+from pants.engine.addresses import Address
+from pants.engine.env_vars import EnvironmentVars, EnvironmentVarsRequest
 from pants.engine.environment import EnvironmentName
-from pants.engine.fs import Digest
+from pants.engine.fs import CreateDigest, Digest, DigestContents, FileContent, Snapshot
+from pants.engine.process import Process, ProcessCacheScope, ProcessResult
 from pants.engine.rules import Get, collect_rules, rule
-from pants.engine.target import FieldSet, SourcesField, Target, WrappedTarget, WrappedTargetRequest
+from pants.engine.target import DependenciesRequest, FieldSet, SourcesField, Target, Targets
 from pants.engine.unions import UnionMembership, UnionRule, union
+from pants.util.frozendict import FrozenDict
 from pants.util.strutil import bullet_list
 
 from pants_backend_k8s.target_types import (
@@ -24,6 +30,13 @@ from pants_backend_k8s.target_types import (
     KubeconfigSourceField,
     KubeconfigUserField,
 )
+from pants_backend_k8s.util.kubeconfig_files import (
+    KubeconfigSummary,
+    kubeconfig_paths,
+    load_kubeconfig,
+    merge_kubeconfigs,
+    summarize_kubeconfig,
+)
 
 
 @union(in_scope_types=[EnvironmentName])
@@ -86,38 +99,49 @@ def kubeconfig_request_request(
 
 
 @dataclass(frozen=True)
-class ConfigurationFileRequest:
-    search_paths: tuple[str, ...]
-    """'Which paths to search for the configuration file."""
+class ParsedKubeconfigRequest:
+    """Kubeconfig files in `digest`, by their original location, in order of precedence."""
 
-    file_name: str
-    """The filename to locate"""
+    digest: Digest
+    locations: FrozenDict[str, str]
 
 
 @dataclass(frozen=True)
-class ConfigurationFileResponse:
-    found: bool
+class ParsedKubeconfig:
+    merged: bytes
+    summary: KubeconfigSummary
 
-    path: str | None = None
 
+@rule
+async def parse_kubeconfig(request: ParsedKubeconfigRequest) -> ParsedKubeconfig:
+    """Parses and merges kubeconfig files.
 
-@rule(desc="Locate configuration file")
-async def _locate_configuration_file(
-    request: ConfigurationFileRequest,
-) -> ConfigurationFileResponse:
-    for path in request.search_paths:
-        path = Path(path).expanduser()
-        candidate = path / request.file_name
+    This is memoized per digest, so the kubeconfig of many objects is only parsed once.
+    """
+    contents = await Get(DigestContents, Digest, request.digest)
+    by_path = {file.path: file.content for file in contents}
+
+    configs = []
+    for path, location in request.locations.items():
+        if path not in by_path:
+            continue
+        try:
+            configs.append(load_kubeconfig(by_path[path], os.path.dirname(location)))
+        except ValueError as e:
+            raise ValueError(f"Failed to parse kubeconfig file {location}: {e}") from e
+
+    merged = merge_kubeconfigs(configs)
+    return ParsedKubeconfig(
+        yaml.safe_dump(merged, sort_keys=False).encode(), summarize_kubeconfig(merged)
+    )
 
-        if candidate.exists():
-            return ConfigurationFileResponse(
-                found=True,
-                path=str(candidate.resolve()),
-            )
 
-    return ConfigurationFileResponse(
-        found=False,
-    )
+def _check_context(summary: KubeconfigSummary, context: str | None, address: Address) -> None:
+    if context and summary.contexts and context not in summary.contexts:
+        raise ValueError(
+            f"The context {context!r} of {address} is not in its kubeconfig. Available contexts:\n\n"
+            f"{bullet_list(summary.contexts)}"
+        )
 
 
 @union(in_scope_types=[EnvironmentName])
@@ -164,15 +188,64 @@ class HostKubeconfigFieldSet(KubeconfigFieldSet):
 HostKubeconfigRequest.field_set_type = HostKubeconfigFieldSet
 
 
+_HOST_KUBECONFIG = "__host_kubeconfig"
+
+
 @rule(desc="Locating host kubeconfig file")
-async def get_kubeconfig_file(request: HostKubeconfigRequest) -> KubeconfigResponse:
-    result = await Get(ConfigurationFileResponse, ConfigurationFileRequest(("~/.kube",), "config"))
+async def get_kubeconfig_file(request: HostKubeconfigRequest, bash: BashBinary) -> KubeconfigResponse:
+    env = await Get(EnvironmentVars, EnvironmentVarsRequest(["KUBECONFIG", "HOME"]))
+    paths = kubeconfig_paths(env.get("KUBECONFIG"), env.get("HOME"))
+
+    # The files are outside of the build root, so they are copied into the sandbox. This happens
+    # once per session, while parsing is cached for as long as their content does not change.
+    outputs = tuple(f"{_HOST_KUBECONFIG}.{index}" for index in range(len(paths)))
+    result = await Get(
+        ProcessResult,
+        Process(
+            (
+                bash.path,
+                "-c",
+                dedent(f"""\
+                    i=0
+                    for path in "$@"; do
+                        if [ -f "$path" ]; then
+                            printf '%s\\n' "$(<"$path")" > {_HOST_KUBECONFIG}.$i
+                        fi
+                        i=$((i + 1))
+                    done
+                    """),
+                "bash",
+                *paths,
+            ),
+            description=f"Reading host kubeconfig files {', '.join(paths)}",
+            output_files=outputs,
+            cache_scope=ProcessCacheScope.PER_SESSION,
+        ),
+    )
 
-    if not result.found:
-        raise ValueError("Failed to locate kubeconfig file on the host.")
+    snapshot = await Get(Snapshot, Digest, result.output_digest)
+    found = [path for path, output in zip(paths, outputs) if output in snapshot.files]
+    if not found:
+        raise ValueError(
+            f"Failed to locate kubeconfig file on the host, looked for: {', '.join(paths) or '<none>'}"
+        )
+
+    parsed = await Get(
+        ParsedKubeconfig,
+        ParsedKubeconfigRequest(result.output_digest, FrozenDict(zip(outputs, paths))),
+    )
+    _check_context(parsed.summary, request.target.context.value, request.target.address)
+
+    if len(found) == 1:
+        # A single file is used in place, which lets `kubectl` update the credentials in it.
+        path, digest = found[0], None
+    else:
+        path = os.path.join(_HOST_KUBECONFIG, "config")
+        digest = await Get(Digest, CreateDigest([FileContent(path, parsed.merged)]))
 
     return KubeconfigResponse(
-        path=result.path,
+        path=path,
+        digest=digest,
         context=request.target.context.value,
         cluster=request.target.cluster.value,
         namespace=request.target.namespace.value,
@@ -203,42 +276,35 @@ FileKubeconfigRequest.field_set_type = FileKubeconfigFieldSet
 
 @rule(desc="Loading kubeconfig file")
 async def load_kubconfig_file(request: FileKubeconfigRequest) -> KubeconfigResponse:
-    source_files_request = [request.target.source]
-    if request.target.generator.value:
-        kubeconfig_address = await Get(
-            Addresses,
-            UnparsedAddressInputs(
-                request.target.generator.value,
-                owning_address=request.target.address,
-                description_of_origin="asd",
-            ),
-        )
-
-        targets = await Get(
-            WrappedTarget,
-            WrappedTargetRequest(
-                kubeconfig_address[0],
-                description_of_origin="kubectl run",
-            ),
-        )
-
-        if targets.target.has_field(SourcesField):
-            source_files_request.append(targets.target[SourcesField])
+    generators = await Get(Targets, DependenciesRequest(request.target.generator))
 
     sources = await Get(
         SourceFiles,
         SourceFilesRequest(
-            source_files_request,
+            [
+                request.target.source,
+                *(target[SourcesField] for target in generators if target.has_field(SourcesField)),
+            ],
             enable_codegen=True,
             for_sources_types=(FileSourceField, KubeconfigSourceField),
         ),
     )
 
-    if len(sources.snapshot.files) > 1:
-        raise ValueError("Kubeconfig source must be a single file")
+    if len(sources.snapshot.files) != 1:
+        raise ValueError(
+            f"The kubeconfig of {request.target.address} must be a single file, but got "
+            f"{len(sources.snapshot.files)}."
+        )
+
+    path = sources.snapshot.files[0]
+    parsed = await Get(
+        ParsedKubeconfig,
+        ParsedKubeconfigRequest(sources.snapshot.digest, FrozenDict({path: path})),
+    )
+    _check_context(parsed.summary, request.target.context.value, request.target.address)
 
     return KubeconfigResponse(
-        path=sources.snapshot.files[0],
+        path=path,
         digest=sources.snapshot.digest,
         context=request.target.context.value,
         cluster=request.target.cluster.value,
@@ -0,0 +1,105 @@
+"""
+Parsing and merging of kubeconfig files, following the rules `kubectl` applies to `KUBECONFIG`.
+
+Named clusters, contexts and users are taken from the first file that defines them, as is the
+current context. Relative paths in a file are resolved against the directory of that file, so a
+merged config can be written elsewhere.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+import yaml
+
+_NAMED_LISTS = ("clusters", "contexts", "users")
+# The file references in each named list, by the key of the entry holding them.
+_PATH_FIELDS = {
+    "clusters": ("cluster", ("certificate-authority",)),
+    "users": ("user", ("client-certificate", "client-key", "tokenFile")),
+}
+
+
+@dataclass(frozen=True)
+class KubeconfigSummary:
+    current_context: str | None
+    contexts: tuple[str, ...]
+    clusters: tuple[str, ...]
+    users: tuple[str, ...]
+
+
+def load_kubeconfig(content: bytes, directory: str) -> dict[str, Any]:
+    """Parses a kubeconfig file that was located in `directory`, making its paths absolute."""
+    try:
+        config = yaml.safe_load(content)
+    except yaml.YAMLError as e:
+        raise ValueError(str(e)) from e
+
+    if not isinstance(config, dict):
+        return {}
+
+    for list_name, (key, fields) in _PATH_FIELDS.items():
+        for entry in config.get(list_name) or ():
+            value = entry.get(key) if isinstance(entry, dict) else None
+            if not isinstance(value, dict):
+                continue
+            for field in fields:
+                path = value.get(field)
+                if isinstance(path, str) and path and not os.path.isabs(path):
+                    value[field] = os.path.normpath(os.path.join(directory, path))
+
+    return config
+
+
+def merge_kubeconfigs(configs: Sequence[dict[str, Any]]) -> dict[str, Any]:
+    """Merges parsed kubeconfig files, the first one taking precedence."""
+    merged: dict[str, Any] = {"apiVersion": "v1", "kind": "Config", "preferences": {}}
+    for list_name in _NAMED_LISTS:
+        merged[list_name] = []
+
+    seen: dict[str, set[str]] = {list_name: set() for list_name in _NAMED_LISTS}
+    for config in configs:
+        if config.get("current-context") and "current-context" not in merged:
+            merged["current-context"] = config["current-context"]
+
+        for key, value in (config.get("preferences") or {}).items():
+            merged["preferences"].setdefault(key, value)
+
+        for list_name in _NAMED_LISTS:
+            for entry in config.get(list_name) or ():
+                name = entry.get("name") if isinstance(entry, dict) else None
+                if name is not None and name not in seen[list_name]:
+                    seen[list_name].add(name)
+                    merged[list_name].append(entry)
+
+    return merged
+
+
+def summarize_kubeconfig(config: dict[str, Any]) -> KubeconfigSummary:
+    def names(list_name: str) -> tuple[str, ...]:
+        return tuple(
+            str(entry["name"])
+            for entry in config.get(list_name) or ()
+            if isinstance(entry, dict) and "name" in entry
+        )
+
+    return KubeconfigSummary(
+        current_context=config.get("current-context") or None,
+        contexts=names("contexts"),
+        clusters=names("clusters"),
+        users=names("users"),
+    )
+
+
+def kubeconfig_paths(kubeconfig: str | None, home: str | None) -> tuple[str, ...]:
+    """The files `kubectl` reads, from the value of `KUBECONFIG` or the default location."""
+    paths = tuple(path for path in (kubeconfig or "").split(os.pathsep) if path)
+    if paths:
+        return tuple(dict.fromkeys(paths))
+
+    if home:
+        return (os.path.join(home, ".kube", "config"),)
+
+    return ()
@@ -0,0 +1,67 @@
+from textwrap import dedent
+
+from pants_backend_k8s.util.kubeconfig_files import (
+    kubeconfig_paths,
+    load_kubeconfig,
+    merge_kubeconfigs,
+    summarize_kubeconfig,
+)
+
+_FIRST = dedent("""
+    current-context: dev
+    clusters:
+      - name: dev
+        cluster: {server: https://dev, certificate-authority: certs/ca.crt}
+    contexts:
+      - name: dev
+        context: {cluster: dev, user: me}
+    users:
+      - name: me
+        user: {token: first}
+    """).encode()
+
+_SECOND = dedent("""
+    current-context: prod
+    clusters:
+      - name: prod
+        cluster: {server: https://prod, certificate-authority: /etc/ca.crt}
+    contexts:
+      - name: dev
+        context: {cluster: prod, user: me}
+      - name: prod
+        context: {cluster: prod, user: me}
+    users:
+      - name: me
+        user: {token: second}
+    """).encode()
+
+
+def test_merge_follows_kubectl_precedence() -> None:
+    merged = merge_kubeconfigs(
+        [load_kubeconfig(_FIRST, "/home/me/.kube"), load_kubeconfig(_SECOND, "/srv")]
+    )
+
+    assert merged["current-context"] == "dev"
+    assert merged["contexts"][0]["context"]["cluster"] == "dev"
+    assert merged["users"] == [{"name": "me", "user": {"token": "first"}}]
+    assert [cluster["cluster"]["certificate-authority"] for cluster in merged["clusters"]] == [
+        "/home/me/.kube/certs/ca.crt",
+        "/etc/ca.crt",
+    ]
+
+    summary = summarize_kubeconfig(merged)
+    assert summary.current_context == "dev"
+    assert summary.contexts == ("dev", "prod")
+    assert summary.clusters == ("dev", "prod")
+    assert summary.users == ("me",)
+
+
+def test_load_ignores_non_configs() -> None:
+    assert load_kubeconfig(b"some_text\n", "/") == {}
+    assert summarize_kubeconfig({}).contexts == ()
+
+
+def test_kubeconfig_paths() -> None:
+    assert kubeconfig_paths("/a:/b::/a", "/home/me") == ("/a", "/b")
+    assert kubeconfig_paths(None, "/home/me") == ("/home/me/.kube/config",)
+    assert kubeconfig_paths("", None) == ()
@@ -2,6 +2,7 @@ from textwrap import dedent
 
 import pytest
 from pants.core.util_rules.source_files import rules as source_rules
+from pants.engine.internals.scheduler import ExecutionError
 from pants.engine.rules import QueryRule
 from pants.engine.target import Address
 from pants.testutil.rule_runner import RuleRunner
@@ -63,3 +64,24 @@ def test_file_k8s_request(rule_runner):
     response = rule_runner.request(KubeconfigResponse, [request])
 
     assert response.path is not None
+
+
+def test_file_k8s_request_unknown_context(rule_runner):
+    rule_runner.write_files(
+        {
+            "BUILD": dedent("""
+            kubeconfig(name="config", from_source="config.yaml", context="prod"),
+            """),
+            "config.yaml": dedent("""
+            contexts:
+              - name: dev
+                context: {cluster: dev}
+            """),
+        }
+    )
+
+    target = rule_runner.get_target(Address("", target_name="config"))
+    request = FileKubeconfigRequest(FileKubeconfigFieldSet.create(target))
+
+    with pytest.raises(ExecutionError, match="not in its kubeconfig"):
+        rule_runner.request(KubeconfigResponse, [request])
@@ -0,0 +1,152 @@
+"""
+Ordering of Kubernetes objects into waves that can be applied one after another.
+
+Objects in a wave only depend on objects in earlier waves: namespaces and custom resource definitions
+come first, then the configuration and access control that workloads refer to, then the workloads,
+and finally everything that routes to or extends them, including custom resources. Objects in the
+same wave can be applied concurrently.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable, Sequence, TypeVar
+
+from pants_backend_k8s.util.validation import load_documents
+
+WAVES: tuple[frozenset[str], ...] = (
+    frozenset(
+        {
+            "Namespace",
+            "CustomResourceDefinition",
+            "PriorityClass",
+            "StorageClass",
+            "RuntimeClass",
+            "IngressClass",
+        }
+    ),
+    frozenset(
+        {
+            "ServiceAccount",
+            "Secret",
+            "ConfigMap",
+            "LimitRange",
+            "ResourceQuota",
+            "PodDisruptionBudget",
+            "NetworkPolicy",
+            "PersistentVolume",
+            "PersistentVolumeClaim",
+            "Role",
+            "ClusterRole",
+            "RoleBinding",
+            "ClusterRoleBinding",
+        }
+    ),
+    frozenset(
+        {
+            "Service",
+            "Pod",
+            "ReplicaSet",
+            "Deployment",
+            "StatefulSet",
+            "DaemonSet",
+            "Job",
+            "CronJob",
+            "HorizontalPodAutoscaler",
+        }
+    ),
+)
+# Kinds not listed above, e.g. ingresses, webhooks and custom resources, are applied last.
+LAST_WAVE = len(WAVES)
+
+_ROLLOUT_KINDS = ("Deployment", "StatefulSet", "DaemonSet")
+
+
+@dataclass(frozen=True)
+class Resource:
+    api_version: str
+    kind: str
+    name: str
+    namespace: str | None = None
+
+    @property
+    def reference(self) -> str:
+        return f"{self.kind.lower()}/{self.name}"
+
+
+def manifest_resources(content: bytes) -> tuple[Resource, ...]:
+    """Lists the objects in a manifest, expanding `List` kinds."""
+
+    def resources(document: Any) -> Iterable[Resource]:
+        if not isinstance(document, dict):
+            return
+        kind = document.get("kind")
+        if isinstance(kind, str) and kind.endswith("List"):
+            for item in document.get("items") or ():
+                yield from resources(item)
+            return
+
+        metadata = document.get("metadata") or {}
+        if isinstance(kind, str) and isinstance(metadata, dict) and metadata.get("name"):
+            yield Resource(
+                str(document.get("apiVersion", "")),
+                kind,
+                str(metadata["name"]),
+                metadata.get("namespace"),
+            )
+
+    return tuple(resource for document in load_documents(content) for resource in resources(document))
+
+
+def parse_kinds(value: str | None) -> tuple[str, ...]:
+    """Parses the `kind` field of a target, which may list several kinds separated by commas."""
+    return tuple(kind.strip() for kind in (value or "").replace(" ", ",").split(",") if kind.strip())
+
+
+def wave_of(kinds: Iterable[str]) -> int:
+    """The wave of an object made up of `kinds`.
+
+    An object is applied as a whole, so it is placed in the wave of its earliest kind: applying a
+    workload before the config map it mounts is recoverable, but applying anything into a
+    namespace or of a custom kind that does not exist yet fails outright.
+    """
+    return min(
+        (
+            next((index for index, wave in enumerate(WAVES) if kind in wave), LAST_WAVE)
+            for kind in kinds
+        ),
+        default=LAST_WAVE,
+    )
+
+
+def readiness_check(resource: Resource, timeout: str) -> tuple[str, ...] | None:
+    """The `kubectl` arguments that wait for `resource` to become ready, if it has a notion of it.
+
+    The namespace of the resource is not included, as it has to follow any default passed to `kubectl`.
+    """
+    if resource.kind == "CustomResourceDefinition":
+        command: tuple[str, ...] = ("wait", "--for=condition=Established", resource.reference)
+    elif resource.kind in _ROLLOUT_KINDS:
+        command = ("rollout", "status", resource.reference)
+    elif resource.kind == "Job":
+        command = ("wait", "--for=condition=Complete", resource.reference)
+    else:
+        return None
+
+    return (*command, f"--timeout={timeout}")
+
+
+_T = TypeVar("_T")
+
+
+def split_evenly(items: Sequence[_T], count: int) -> list[list[_T]]:
+    """Splits `items` into at most `count` non-empty chunks of similar size, keeping their order."""
+    count = max(1, min(count, len(items)))
+    size, remainder = divmod(len(items), count)
+    chunks = []
+    start = 0
+    for index in range(count):
+        end = start + size + (1 if index < remainder else 0)
+        chunks.append(list(items[start:end]))
+        start = end
+    return [chunk for chunk in chunks if chunk]
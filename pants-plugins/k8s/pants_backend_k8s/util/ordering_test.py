@@ -0,0 +1,62 @@
+from textwrap import dedent
+
+from pants_backend_k8s.util.ordering import (
+    LAST_WAVE,
+    Resource,
+    manifest_resources,
+    parse_kinds,
+    readiness_check,
+    split_evenly,
+    wave_of,
+)
+
+
+def test_manifest_resources() -> None:
+    manifest = dedent("""
+        apiVersion: v1
+        kind: Namespace
+        metadata:
+          name: app
+        ---
+        apiVersion: v1
+        kind: List
+        items:
+          - apiVersion: apps/v1
+            kind: Deployment
+            metadata:
+              name: web
+              namespace: app
+        ---
+        kind: ConfigMap
+        """).encode()
+
+    assert manifest_resources(manifest) == (
+        Resource("v1", "Namespace", "app"),
+        Resource("apps/v1", "Deployment", "web", "app"),
+    )
+
+
+def test_waves() -> None:
+    assert wave_of(["Namespace"]) < wave_of(["ConfigMap"]) < wave_of(["Deployment"])
+    assert wave_of(["CustomResourceDefinition"]) < wave_of(["Certificate"]) == LAST_WAVE
+    # An object is placed in the wave of its earliest kind.
+    assert wave_of(["Deployment", "Namespace"]) == wave_of(["Namespace"])
+    assert wave_of([]) == LAST_WAVE
+    assert parse_kinds("Deployment, Service") == ("Deployment", "Service")
+    assert parse_kinds(None) == ()
+
+
+def test_readiness_check() -> None:
+    assert readiness_check(Resource("apps/v1", "Deployment", "web"), "1m") == (
+        "rollout",
+        "status",
+        "deployment/web",
+        "--timeout=1m",
+    )
+    assert readiness_check(Resource("v1", "ConfigMap", "config"), "1m") is None
+
+
+def test_split_evenly() -> None:
+    assert split_evenly([1, 2, 3, 4, 5], 2) == [[1, 2, 3], [4, 5]]
+    assert split_evenly([1, 2], 4) == [[1], [2]]
+    assert split_evenly([1, 2], 0) == [[1, 2]]
@@ -0,0 +1,405 @@
+"""
+Waits for workloads to roll out, watching the API server instead of polling each object.
+
+Each namespace gets one watch per workload resource, and one on its pods and replica sets, through
+`kubectl proxy` so that all authentication is handled by `kubectl`. Objects are reported as they become ready,
+with the time it took, and the wait fails as soon as a pod of the revision a pending workload is
+rolling out is crash looping or cannot pull its image. Pods of the revisions being replaced are
+ignored, so rolling out a fix for a crash looping workload is not failed by its old pods.
+
+This file is run as a script with only the standard library available:
+
+    python rollout.py --timeout 5m deployment/web my-ns/statefulset/db -- kubectl --context prod
+
+Everything after `--` is the `kubectl` command used to start the proxy.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import queue
+import re
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+_RESOURCES = {
+    "deployment": ("/apis/apps/v1", "deployments"),
+    "statefulset": ("/apis/apps/v1", "statefulsets"),
+    "daemonset": ("/apis/apps/v1", "daemonsets"),
+}
+WATCHED_KINDS = frozenset(_RESOURCES)
+_COLLECTIONS = {
+    **_RESOURCES,
+    "replicaset": ("/apis/apps/v1", "replicasets"),
+    "pod": ("/api/v1", "pods"),
+}
+
+_REVISION_ANNOTATION = "deployment.kubernetes.io/revision"
+
+_FAILING_REASONS = frozenset(
+    {
+        "CrashLoopBackOff",
+        "ImagePullBackOff",
+        "ErrImagePull",
+        "InvalidImageName",
+        "CreateContainerConfigError",
+    }
+)
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(h|ms|m|s)")
+_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+class RolloutFailed(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Workload:
+    namespace: str
+    kind: str
+    name: str
+
+    def __str__(self) -> str:
+        return f"{self.kind}/{self.name} in {self.namespace}"
+
+
+def parse_duration(value: str) -> float:
+    """Parses a `kubectl` duration such as `90s` or `1h30m`, returning seconds."""
+    if re.fullmatch(r"\d+(\.\d+)?", value):
+        return float(value)
+    parts = _DURATION.findall(value)
+    if not parts or "".join(number + unit for number, unit in parts) != value:
+        raise ValueError(f"Invalid duration: {value!r}")
+    return sum(float(number) * _UNITS[unit] for number, unit in parts)
+
+
+def parse_workload(value: str, default_namespace: str) -> Workload:
+    """Parses `kind/name` or `namespace/kind/name`."""
+    parts = value.split("/")
+    if len(parts) == 2:
+        parts.insert(0, default_namespace)
+    if len(parts) != 3 or parts[1].lower() not in WATCHED_KINDS:
+        raise ValueError(f"Invalid workload {value!r}, expected [namespace/]kind/name.")
+    return Workload(parts[0], parts[1].lower(), parts[2])
+
+
+def _condition(obj: Mapping[str, Any], condition_type: str) -> Mapping[str, Any]:
+    for condition in (obj.get("status") or {}).get("conditions") or ():
+        if condition.get("type") == condition_type:
+            return condition
+    return {}
+
+
+def rollout_status(kind: str, obj: Mapping[str, Any]) -> tuple[bool, str]:
+    """Whether a workload has rolled out, and a description of its progress.
+
+    Mirrors `kubectl rollout status`; raises `RolloutFailed` if the rollout can no longer succeed.
+    """
+    spec = obj.get("spec") or {}
+    status = obj.get("status") or {}
+    metadata = obj.get("metadata") or {}
+
+    if metadata.get("generation", 0) > status.get("observedGeneration", 0):
+        return False, "waiting for the rollout to be observed"
+
+    if kind == "deployment":
+        if _condition(obj, "Progressing").get("reason") == "ProgressDeadlineExceeded":
+            raise RolloutFailed("exceeded its progress deadline")
+        replicas = spec.get("replicas", 1)
+        updated = status.get("updatedReplicas", 0)
+        if updated < replicas:
+            return False, f"{updated} of {replicas} updated replicas"
+        if status.get("replicas", 0) > updated:
+            return False, f"{status.get('replicas', 0) - updated} old replicas pending termination"
+        available = status.get("availableReplicas", 0)
+        if available < updated:
+            return False, f"{available} of {updated} updated replicas available"
+        return True, f"{available} replicas available"
+
+    if kind == "statefulset":
+        strategy = spec.get("updateStrategy") or {}
+        if strategy.get("type", "RollingUpdate") != "RollingUpdate":
+            return True, "not using rolling updates"
+        replicas = spec.get("replicas", 1)
+        ready = status.get("readyReplicas", 0)
+        if ready < replicas:
+            return False, f"{ready} of {replicas} replicas ready"
+        partition = (strategy.get("rollingUpdate") or {}).get("partition", 0)
+        if partition:
+            updated = status.get("updatedReplicas", 0)
+            if updated < replicas - partition:
+                return False, f"{updated} of {replicas - partition} partitioned replicas updated"
+            return True, f"{ready} replicas ready"
+        if status.get("updateRevision") != status.get("currentRevision"):
+            return False, "waiting for the update to complete"
+        return True, f"{ready} replicas ready"
+
+    desired = status.get("desiredNumberScheduled", 0)
+    updated = status.get("updatedNumberScheduled", 0)
+    if updated < desired:
+        return False, f"{updated} of {desired} updated pods scheduled"
+    available = status.get("numberAvailable", 0)
+    if available < desired:
+        return False, f"{available} of {desired} updated pods available"
+    return True, f"{available} pods available"
+
+
+def pod_failure(pod: Mapping[str, Any]) -> str | None:
+    """The reason a pod will not become ready without intervention, if any."""
+    status = pod.get("status") or {}
+    for container in (*(status.get("initContainerStatuses") or ()), *(status.get("containerStatuses") or ())):
+        waiting = (container.get("state") or {}).get("waiting") or {}
+        if waiting.get("reason") in _FAILING_REASONS:
+            message = f": {waiting['message']}" if waiting.get("message") else ""
+            return f"container {container.get('name')} is in {waiting['reason']}{message}"
+    return None
+
+
+def _metadata(obj: Mapping[str, Any]) -> Mapping[str, Any]:
+    return obj.get("metadata") or {}
+
+
+def _controller(obj: Mapping[str, Any], kind: str) -> str | None:
+    for reference in _metadata(obj).get("ownerReferences") or ():
+        if reference.get("kind") == kind and reference.get("controller", True):
+            return reference.get("name")
+    return None
+
+
+def is_current_pod(
+    kind: str,
+    workload: Mapping[str, Any],
+    pod: Mapping[str, Any],
+    replica_sets: Mapping[str, Mapping[str, Any]],
+) -> bool:
+    """Whether `pod` belongs to the revision `workload` is rolling out, rather than one it replaces.
+
+    The pods of a deployment are matched through their replica set, from `replica_sets` by name,
+    which must have the same revision as the deployment. No pod is current until the controller
+    has observed the latest generation of the workload, as until then its revision still names the
+    one being replaced.
+    """
+    name = _metadata(workload).get("name")
+    labels = _metadata(pod).get("labels") or {}
+    generation = _metadata(workload).get("generation")
+    if generation is None or (workload.get("status") or {}).get("observedGeneration", 0) < generation:
+        return False
+
+    if kind == "deployment":
+        replica_set = replica_sets.get(_controller(pod, "ReplicaSet") or "")
+        if replica_set is None or _controller(replica_set, "Deployment") != name:
+            return False
+        revision = (_metadata(workload).get("annotations") or {}).get(_REVISION_ANNOTATION)
+        replica_set_revision = (_metadata(replica_set).get("annotations") or {}).get(_REVISION_ANNOTATION)
+        return revision is not None and replica_set_revision == revision
+
+    if kind == "statefulset":
+        revision = (workload.get("status") or {}).get("updateRevision")
+        return (
+            _controller(pod, "StatefulSet") == name
+            and revision is not None
+            and labels.get("controller-revision-hash") == revision
+        )
+
+    return (
+        _controller(pod, "DaemonSet") == name
+        and labels.get("pod-template-generation") == str(generation)
+    )
+
+
+def _watch(
+    server: str,
+    path: str,
+    key: tuple[str, str],
+    events: queue.Queue,
+    stop: threading.Event,
+) -> None:
+    """Streams the events of a collection into `events`, reconnecting when the stream ends."""
+    while not stop.is_set():
+        try:
+            with urllib.request.urlopen(f"{server}{path}?watch=1", timeout=60) as response:
+                for line in response:
+                    if stop.is_set():
+                        return
+                    if line.strip():
+                        events.put((key, json.loads(line)))
+        except Exception as e:  # noqa: BLE001 - reported, then retried
+            events.put((key, {"type": "ERROR", "object": {"message": str(e)}}))
+            stop.wait(1)
+
+
+def wait_for_rollout(
+    server: str,
+    workloads: Sequence[Workload],
+    timeout: float,
+    report: Callable[[str], None] = print,
+    clock: Callable[[], float] = time.monotonic,
+) -> dict[Workload, float]:
+    """Waits for all `workloads` to roll out, returning the seconds each took to become ready."""
+    start = clock()
+    deadline = start + timeout
+    pending = set(workloads)
+    latencies: dict[Workload, float] = {}
+    progress: dict[Workload, str] = {workload: "not found" for workload in workloads}
+    objects: dict[Workload, Mapping[str, Any]] = {}
+
+    # Failing pods are kept, as whether they belong to the current revision may only be known once
+    # their replica set or workload is seen.
+    failing: dict[tuple[str, str], tuple[Mapping[str, Any], str]] = {}
+    replica_sets: dict[str, dict[str, Mapping[str, Any]]] = {}
+
+    def check_failing_pods() -> None:
+        for (namespace, name), (pod, failure) in failing.items():
+            for workload in pending:
+                obj = objects.get(workload)
+                if (
+                    workload.namespace == namespace
+                    and obj is not None
+                    and is_current_pod(workload.kind, obj, pod, replica_sets.get(namespace, {}))
+                ):
+                    raise RolloutFailed(f"{workload}: pod {name} {failure}")
+
+    events: queue.Queue = queue.Queue()
+    stop = threading.Event()
+    streams = {(workload.namespace, workload.kind) for workload in workloads}
+    streams |= {(namespace, "pod") for namespace, _ in streams}
+    streams |= {(namespace, "replicaset") for namespace, kind in streams if kind == "deployment"}
+    for namespace, kind in sorted(streams):
+        prefix, plural = _COLLECTIONS[kind]
+        path = f"{prefix}/namespaces/{namespace}/{plural}"
+        threading.Thread(
+            target=_watch, args=(server, path, (namespace, kind), events, stop), daemon=True
+        ).start()
+
+    try:
+        while pending:
+            remaining = deadline - clock()
+            if remaining <= 0:
+                waiting = sorted(pending, key=str)
+                raise RolloutFailed(
+                    "timed out waiting for:\n"
+                    + "\n".join(f"  {workload}: {progress[workload]}" for workload in waiting)
+                )
+
+            try:
+                (namespace, kind), event = events.get(timeout=min(remaining, 1.0))
+            except queue.Empty:
+                continue
+
+            obj = event.get("object") or {}
+            if event.get("type") == "ERROR":
+                continue
+
+            name = _metadata(obj).get("name")
+            deleted = event.get("type") == "DELETED"
+            if kind == "pod":
+                failure = None if deleted else pod_failure(obj)
+                if failure is None:
+                    failing.pop((namespace, name), None)
+                else:
+                    failing[(namespace, name)] = (obj, failure)
+                    check_failing_pods()
+                continue
+
+            if kind == "replicaset":
+                if deleted:
+                    replica_sets.get(namespace, {}).pop(name, None)
+                else:
+                    replica_sets.setdefault(namespace, {})[name] = obj
+                    check_failing_pods()
+                continue
+
+            workload = Workload(namespace, kind, name)
+            if workload not in pending:
+                continue
+            if deleted:
+                objects.pop(workload, None)
+                progress[workload] = "deleted"
+                continue
+
+            objects[workload] = obj
+            try:
+                ready, progress[workload] = rollout_status(kind, obj)
+            except RolloutFailed as e:
+                raise RolloutFailed(f"{workload}: {e}") from e
+
+            if ready:
+                pending.discard(workload)
+                latencies[workload] = clock() - start
+                report(f"    ready: {workload} after {latencies[workload]:.1f}s ({progress[workload]})")
+            else:
+                check_failing_pods()
+    finally:
+        stop.set()
+
+    return latencies
+
+
+def _kubectl_output(kubectl: Sequence[str], *args: str) -> str:
+    return subprocess.run([*kubectl, *args], check=True, capture_output=True, text=True).stdout
+
+
+def _start_proxy(kubectl: Sequence[str]) -> tuple[subprocess.Popen, str]:
+    proxy = subprocess.Popen([*kubectl, "proxy", "--port=0"], stdout=subprocess.PIPE, text=True)
+    assert proxy.stdout is not None
+    line = proxy.stdout.readline()
+    match = re.search(r"(\d+\.\d+\.\d+\.\d+:\d+)", line)
+    if match is None:
+        proxy.terminate()
+        raise RolloutFailed(f"Failed to start `kubectl proxy`: {line.strip() or 'no output'}")
+    return proxy, f"http://{match.group(1)}"
+
+
+def _default_namespace(kubectl: Sequence[str]) -> str:
+    args = list(kubectl)
+    if "--namespace" in args[:-1]:
+        return args[args.index("--namespace") + 1]
+    namespace = _kubectl_output(kubectl, "config", "view", "--minify", "-o", "jsonpath={..namespace}")
+    return namespace.strip() or "default"
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--timeout", default="5m", help="How long to wait, as a kubectl duration.")
+    parser.add_argument("--server", help="The API server to watch, instead of a `kubectl proxy`.")
+    parser.add_argument("--namespace", help="The namespace of workloads without one.")
+    parser.add_argument("workloads", nargs="+", help="[namespace/]kind/name of each workload.")
+
+    arguments = list(sys.argv[1:] if argv is None else argv)
+    separator = arguments.index("--") if "--" in arguments else len(arguments)
+    args = parser.parse_args(arguments[:separator])
+    kubectl = arguments[separator + 1 :]
+
+    if args.server is None and not kubectl:
+        parser.error("Either --server or a kubectl command after `--` is required.")
+
+    proxy = None
+    try:
+        namespace = args.namespace or (_default_namespace(kubectl) if kubectl else "default")
+        workloads = list(dict.fromkeys(parse_workload(value, namespace) for value in args.workloads))
+
+        server = args.server
+        if server is None:
+            proxy, server = _start_proxy(kubectl)
+
+        latencies = wait_for_rollout(server, workloads, parse_duration(args.timeout))
+    except RolloutFailed as e:
+        print(f"Rollout failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if proxy is not None:
+            proxy.terminate()
+
+    print(f"==> {len(latencies)} workloads ready, slowest after {max(latencies.values()):.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
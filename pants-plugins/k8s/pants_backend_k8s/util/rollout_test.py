@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+
+import pytest
+
+from pants_backend_k8s.util.rollout import (
+    RolloutFailed,
+    Workload,
+    is_current_pod,
+    main,
+    parse_duration,
+    parse_workload,
+    pod_failure,
+    rollout_status,
+    wait_for_rollout,
+)
+
+
+class FakeApiServer:
+    """Serves a scripted sequence of watch events for each collection, as `(delay, event)` pairs."""
+
+    def __init__(self, streams: dict[str, list[tuple[float, dict[str, Any]]]]) -> None:
+        self.requests: list[str] = []
+        done = self.done = threading.Event()
+        requests = self.requests
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                path, _, query = self.path.partition("?")
+                requests.append(path)
+                assert query == "watch=1"
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                for delay, event in streams.get(path, ()):
+                    time.sleep(delay)
+                    self.wfile.write(json.dumps(event).encode() + b"\n")
+                    self.wfile.flush()
+                done.wait(10)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.done.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def api_server() -> Iterator:
+    servers = []
+
+    def start(streams: dict[str, list[tuple[float, dict[str, Any]]]]) -> FakeApiServer:
+        servers.append(FakeApiServer(streams))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def deployment(
+    name: str, updated: int, available: int, replicas: int = 2, revision: int = 2
+) -> dict[str, Any]:
+    return {
+        "metadata": {
+            "name": name,
+            "generation": 2,
+            "annotations": {"deployment.kubernetes.io/revision": str(revision)},
+        },
+        "spec": {"replicas": replicas, "selector": {"matchLabels": {"app": name}}},
+        "status": {
+            "observedGeneration": 2,
+            "replicas": replicas,
+            "updatedReplicas": updated,
+            "availableReplicas": available,
+        },
+    }
+
+
+def replica_set(app: str, template_hash: str, revision: int) -> dict[str, Any]:
+    return {
+        "metadata": {
+            "name": f"{app}-{template_hash}",
+            "annotations": {"deployment.kubernetes.io/revision": str(revision)},
+            "ownerReferences": [{"kind": "Deployment", "name": app, "controller": True}],
+        },
+    }
+
+
+def crashing_pod(app: str, template_hash: str = "7d9f") -> dict[str, Any]:
+    return {
+        "metadata": {
+            "name": f"{app}-{template_hash}-x2k4p",
+            "labels": {"app": app, "pod-template-hash": template_hash},
+            "ownerReferences": [
+                {"kind": "ReplicaSet", "name": f"{app}-{template_hash}", "controller": True}
+            ],
+        },
+        "status": {
+            "containerStatuses": [
+                {
+                    "name": "main",
+                    "state": {"waiting": {"reason": "CrashLoopBackOff", "message": "back-off 10s"}},
+                }
+            ]
+        },
+    }
+
+
+def test_rollout_status() -> None:
+    assert rollout_status("deployment", deployment("web", 2, 2)) == (True, "2 replicas available")
+    assert rollout_status("deployment", deployment("web", 1, 1)) == (False, "1 of 2 updated replicas")
+    assert rollout_status("deployment", deployment("web", 2, 1))[0] is False
+
+    unobserved = deployment("web", 2, 2)
+    unobserved["metadata"]["generation"] = 3
+    assert rollout_status("deployment", unobserved)[0] is False
+
+    stuck = deployment("web", 1, 1)
+    stuck["status"]["conditions"] = [{"type": "Progressing", "reason": "ProgressDeadlineExceeded"}]
+    with pytest.raises(RolloutFailed):
+        rollout_status("deployment", stuck)
+
+    statefulset = {
+        "spec": {"replicas": 3},
+        "status": {"readyReplicas": 3, "currentRevision": "db-1", "updateRevision": "db-2"},
+    }
+    assert rollout_status("statefulset", statefulset)[0] is False
+    statefulset["status"]["currentRevision"] = "db-2"
+    assert rollout_status("statefulset", statefulset)[0] is True
+
+    daemonset = {"status": {"desiredNumberScheduled": 3, "updatedNumberScheduled": 3, "numberAvailable": 2}}
+    assert rollout_status("daemonset", daemonset) == (False, "2 of 3 updated pods available")
+
+    assert pod_failure(crashing_pod("web")) == "container main is in CrashLoopBackOff: back-off 10s"
+    assert pod_failure({"status": {"containerStatuses": [{"state": {"running": {}}}]}}) is None
+
+
+def test_is_current_pod() -> None:
+    replica_sets = {
+        "web-old": replica_set("web", "old", revision=1),
+        "web-7d9f": replica_set("web", "7d9f", revision=2),
+    }
+    web = deployment("web", 1, 1, revision=2)
+    assert is_current_pod("deployment", web, crashing_pod("web"), replica_sets)
+    # The old pods match the selector too, but belong to the replica set being replaced.
+    assert not is_current_pod("deployment", web, crashing_pod("web", "old"), replica_sets)
+    assert not is_current_pod("deployment", web, crashing_pod("web"), {})
+
+    statefulset = {
+        "metadata": {"name": "db", "generation": 2},
+        "status": {"observedGeneration": 2, "updateRevision": "db-2"},
+    }
+
+    def statefulset_pod(revision: str) -> dict[str, Any]:
+        return {
+            "metadata": {
+                "labels": {"controller-revision-hash": revision},
+                "ownerReferences": [{"kind": "StatefulSet", "name": "db"}],
+            }
+        }
+
+    assert is_current_pod("statefulset", statefulset, statefulset_pod("db-2"), {})
+    assert not is_current_pod("statefulset", statefulset, statefulset_pod("db-1"), {})
+
+    def daemonset(generation: int) -> dict[str, Any]:
+        return {
+            "metadata": {"name": "agent", "generation": generation},
+            "status": {"observedGeneration": generation},
+        }
+
+    pod = {
+        "metadata": {
+            "labels": {"pod-template-generation": "3"},
+            "ownerReferences": [{"kind": "DaemonSet", "name": "agent"}],
+        }
+    }
+    assert is_current_pod("daemonset", daemonset(3), pod, {})
+    assert not is_current_pod("daemonset", daemonset(4), pod, {})
+
+    # Until the controller observes a new generation, the revision still names the old pods.
+    for kind, workload, current_pod in (
+        ("deployment", web, crashing_pod("web")),
+        ("statefulset", statefulset, statefulset_pod("db-2")),
+        ("daemonset", daemonset(3), pod),
+    ):
+        workload["metadata"]["generation"] += 1
+        assert not is_current_pod(kind, workload, current_pod, replica_sets)
+
+
+def test_parsing() -> None:
+    assert parse_duration("5m") == 300
+    assert parse_duration("1h30m") == 5400
+    assert parse_duration("90") == 90
+    with pytest.raises(ValueError):
+        parse_duration("5 minutes")
+
+    assert parse_workload("Deployment/web", "default") == Workload("default", "deployment", "web")
+    assert parse_workload("app/statefulset/db", "default") == Workload("app", "statefulset", "db")
+    with pytest.raises(ValueError):
+        parse_workload("service/web", "default")
+
+
+def test_wait_for_rollout(api_server) -> None:
+    server = api_server(
+        {
+            "/apis/apps/v1/namespaces/app/deployments": [
+                (0, {"type": "ADDED", "object": deployment("other", 0, 0)}),
+                (0, {"type": "ADDED", "object": deployment("web", 1, 1)}),
+                (0.2, {"type": "MODIFIED", "object": deployment("web", 2, 2)}),
+            ],
+            "/apis/apps/v1/namespaces/jobs/deployments": [
+                (0, {"type": "ADDED", "object": deployment("worker", 1, 1, replicas=1)}),
+            ],
+            # Pods of workloads that are not waited for don't fail the rollout.
+            "/api/v1/namespaces/app/pods": [(0, {"type": "ADDED", "object": crashing_pod("other")})],
+        }
+    )
+    web = Workload("app", "deployment", "web")
+    worker = Workload("jobs", "deployment", "worker")
+
+    reports: list[str] = []
+    latencies = wait_for_rollout(server.url, [web, worker], timeout=10, report=reports.append)
+
+    assert set(latencies) == {web, worker}
+    assert latencies[web] >= 0.2
+    assert len(reports) == 2
+    assert any("deployment/web in app after" in report for report in reports)
+    # One watch per namespace and resource, rather than one per object.
+    assert sorted(set(server.requests)) == [
+        "/api/v1/namespaces/app/pods",
+        "/api/v1/namespaces/jobs/pods",
+        "/apis/apps/v1/namespaces/app/deployments",
+        "/apis/apps/v1/namespaces/app/replicasets",
+        "/apis/apps/v1/namespaces/jobs/deployments",
+        "/apis/apps/v1/namespaces/jobs/replicasets",
+    ]
+
+
+def test_wait_for_rollout_fails_fast_on_crash_loop(api_server) -> None:
+    server = api_server(
+        {
+            "/apis/apps/v1/namespaces/app/deployments": [
+                (0, {"type": "ADDED", "object": deployment("web", 2, 0)}),
+            ],
+            # The pod is seen before its replica set, which decides whether it is current.
+            "/api/v1/namespaces/app/pods": [(0.1, {"type": "MODIFIED", "object": crashing_pod("web")})],
+            "/apis/apps/v1/namespaces/app/replicasets": [
+                (0.3, {"type": "ADDED", "object": replica_set("web", "7d9f", revision=2)}),
+            ],
+        }
+    )
+
+    start = time.monotonic()
+    with pytest.raises(RolloutFailed, match="pod web-7d9f-x2k4p container main is in CrashLoopBackOff"):
+        wait_for_rollout(server.url, [Workload("app", "deployment", "web")], timeout=30)
+    assert time.monotonic() - start < 5
+
+
+def test_wait_for_rollout_ignores_crash_loop_of_replaced_pods(api_server) -> None:
+    server = api_server(
+        {
+            "/apis/apps/v1/namespaces/app/deployments": [
+                (0, {"type": "ADDED", "object": deployment("web", 1, 1, revision=2)}),
+                (0.3, {"type": "MODIFIED", "object": deployment("web", 2, 2, revision=2)}),
+            ],
+            "/apis/apps/v1/namespaces/app/replicasets": [
+                (0, {"type": "ADDED", "object": replica_set("web", "old", revision=1)}),
+                (0, {"type": "ADDED", "object": replica_set("web", "7d9f", revision=2)}),
+            ],
+            "/api/v1/namespaces/app/pods": [
+                (0.1, {"type": "MODIFIED", "object": crashing_pod("web", "old")}),
+            ],
+        }
+    )
+
+    latencies = wait_for_rollout(server.url, [Workload("app", "deployment", "web")], timeout=10)
+    assert set(latencies) == {Workload("app", "deployment", "web")}
+
+
+def test_wait_for_rollout_ignores_crash_loop_before_new_generation_is_observed(api_server) -> None:
+    applied = deployment("web", 2, 1, revision=2)
+    applied["metadata"]["generation"] = 3
+    rolled_out = deployment("web", 2, 2, revision=3)
+    rolled_out["metadata"]["generation"] = rolled_out["status"]["observedGeneration"] = 3
+    server = api_server(
+        {
+            "/apis/apps/v1/namespaces/app/deployments": [
+                (0, {"type": "ADDED", "object": applied}),
+                (0.3, {"type": "MODIFIED", "object": rolled_out}),
+            ],
+            "/apis/apps/v1/namespaces/app/replicasets": [
+                (0, {"type": "ADDED", "object": replica_set("web", "old", revision=2)}),
+            ],
+            # Crashing pods of the revision being replaced, which the deployment still names.
+            "/api/v1/namespaces/app/pods": [
+                (0.1, {"type": "MODIFIED", "object": crashing_pod("web", "old")}),
+            ],
+        }
+    )
+
+    latencies = wait_for_rollout(server.url, [Workload("app", "deployment", "web")], timeout=10)
+    assert set(latencies) == {Workload("app", "deployment", "web")}
+
+
+def test_wait_for_rollout_timeout(api_server) -> None:
+    server = api_server(
+        {
+            "/apis/apps/v1/namespaces/app/deployments": [
+                (0, {"type": "ADDED", "object": deployment("web", 1, 1)}),
+            ],
+        }
+    )
+
+    with pytest.raises(RolloutFailed) as e:
+        wait_for_rollout(
+            server.url,
+            [Workload("app", "deployment", "web"), Workload("app", "deployment", "missing")],
+            timeout=0.5,
+        )
+    assert "deployment/web in app: 1 of 2 updated replicas" in str(e.value)
+    assert "deployment/missing in app: not found" in str(e.value)
+
+
+def test_main(api_server, capsys) -> None:
+    server = api_server(
+        {
+            "/apis/apps/v1/namespaces/default/deployments": [
+                (0, {"type": "ADDED", "object": deployment("web", 2, 2)}),
+            ],
+        }
+    )
+
+    assert main(["--server", server.url, "--timeout", "10s", "deployment/web"]) == 0
+    assert "1 workloads ready" in capsys.readouterr().out
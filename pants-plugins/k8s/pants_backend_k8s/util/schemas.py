@@ -0,0 +1,299 @@
+"""
+Bundled schemas for built-in Kubernetes kinds.
+
+These are a subset of the upstream OpenAPI definitions: the fields of each object and of the types
+most commonly written by hand are listed, while deeper or rarely used structures are left open. An
+unknown field is only reported where its parent lists all of its fields.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+_OPEN: dict[str, Any] = {"type": "object", "x-kubernetes-preserve-unknown-fields": True}
+_STRING = {"type": "string"}
+_INTEGER = {"type": "integer"}
+_BOOLEAN = {"type": "boolean"}
+_INT_OR_STRING = {"x-kubernetes-int-or-string": True}
+_STRING_MAP = {"type": "object", "additionalProperties": _STRING}
+_QUANTITY_MAP = {"type": "object", "additionalProperties": _INT_OR_STRING}
+
+
+def _ref(name: str) -> dict[str, Any]:
+    return {"$ref": f"#/definitions/{name}"}
+
+
+def _list(items: dict[str, Any]) -> dict[str, Any]:
+    return {"type": "array", "items": items}
+
+
+def _closed(properties: dict[str, Any], required: tuple[str, ...] = ()) -> dict[str, Any]:
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(required),
+        "additionalProperties": False,
+    }
+
+
+def _resource(**properties: Any) -> dict[str, Any]:
+    return _closed(
+        {
+            "apiVersion": _STRING,
+            "kind": _STRING,
+            "metadata": _ref("ObjectMeta"),
+            **properties,
+        },
+        required=("apiVersion", "kind", "metadata"),
+    )
+
+
+DEFINITIONS: dict[str, dict[str, Any]] = {
+    "ObjectMeta": _closed(
+        {
+            "name": _STRING,
+            "generateName": _STRING,
+            "namespace": _STRING,
+            "labels": _STRING_MAP,
+            "annotations": _STRING_MAP,
+            "finalizers": _list(_STRING),
+            "ownerReferences": _list(_OPEN),
+            "uid": _STRING,
+            "resourceVersion": _STRING,
+            "generation": _INTEGER,
+            "creationTimestamp": {"type": "string", "nullable": True},
+            "deletionTimestamp": {"type": "string", "nullable": True},
+            "deletionGracePeriodSeconds": _INTEGER,
+            "managedFields": _list(_OPEN),
+            "selfLink": _STRING,
+        }
+    ),
+    "LabelSelector": _closed(
+        {
+            "matchLabels": _STRING_MAP,
+            "matchExpressions": _list(
+                _closed(
+                    {"key": _STRING, "operator": _STRING, "values": _list(_STRING)},
+                    required=("key", "operator"),
+                )
+            ),
+        }
+    ),
+    "ResourceRequirements": _closed(
+        {"limits": _QUANTITY_MAP, "requests": _QUANTITY_MAP, "claims": _list(_OPEN)}
+    ),
+    "EnvVar": _closed(
+        {"name": _STRING, "value": _STRING, "valueFrom": _OPEN},
+        required=("name",),
+    ),
+    "ContainerPort": _closed(
+        {
+            "name": _STRING,
+            "containerPort": _INTEGER,
+            "hostPort": _INTEGER,
+            "hostIP": _STRING,
+            "protocol": {"type": "string", "enum": ["TCP", "UDP", "SCTP"]},
+        },
+        required=("containerPort",),
+    ),
+    "VolumeMount": _closed(
+        {
+            "name": _STRING,
+            "mountPath": _STRING,
+            "subPath": _STRING,
+            "subPathExpr": _STRING,
+            "readOnly": _BOOLEAN,
+            "recursiveReadOnly": _STRING,
+            "mountPropagation": _STRING,
+        },
+        required=("name", "mountPath"),
+    ),
+    "Container": _closed(
+        {
+            "name": _STRING,
+            "image": _STRING,
+            "imagePullPolicy": {"type": "string", "enum": ["Always", "IfNotPresent", "Never"]},
+            "command": _list(_STRING),
+            "args": _list(_STRING),
+            "workingDir": _STRING,
+            "env": _list(_ref("EnvVar")),
+            "envFrom": _list(_OPEN),
+            "ports": _list(_ref("ContainerPort")),
+            "resources": _ref("ResourceRequirements"),
+            "resizePolicy": _list(_OPEN),
+            "restartPolicy": _STRING,
+            "volumeMounts": _list(_ref("VolumeMount")),
+            "volumeDevices": _list(_OPEN),
+            "livenessProbe": _OPEN,
+            "readinessProbe": _OPEN,
+            "startupProbe": _OPEN,
+            "lifecycle": _OPEN,
+            "securityContext": _OPEN,
+            "terminationMessagePath": _STRING,
+            "terminationMessagePolicy": _STRING,
+            "stdin": _BOOLEAN,
+            "stdinOnce": _BOOLEAN,
+            "tty": _BOOLEAN,
+        },
+        required=("name",),
+    ),
+    "PodSpec": _closed(
+        {
+            "containers": _list(_ref("Container")),
+            "initContainers": _list(_ref("Container")),
+            "ephemeralContainers": _list(_OPEN),
+            "volumes": _list(
+                {
+                    "type": "object",
+                    "properties": {"name": _STRING},
+                    "required": ["name"],
+                    "x-kubernetes-preserve-unknown-fields": True,
+                }
+            ),
+            "activeDeadlineSeconds": _INTEGER,
+            "affinity": _OPEN,
+            "automountServiceAccountToken": _BOOLEAN,
+            "dnsConfig": _OPEN,
+            "dnsPolicy": _STRING,
+            "enableServiceLinks": _BOOLEAN,
+            "hostAliases": _list(_OPEN),
+            "hostIPC": _BOOLEAN,
+            "hostNetwork": _BOOLEAN,
+            "hostPID": _BOOLEAN,
+            "hostUsers": _BOOLEAN,
+            "hostname": _STRING,
+            "imagePullSecrets": _list(_OPEN),
+            "nodeName": _STRING,
+            "nodeSelector": _STRING_MAP,
+            "os": _OPEN,
+            "overhead": _QUANTITY_MAP,
+            "preemptionPolicy": _STRING,
+            "priority": _INTEGER,
+            "priorityClassName": _STRING,
+            "readinessGates": _list(_OPEN),
+            "resourceClaims": _list(_OPEN),
+            "resources": _ref("ResourceRequirements"),
+            "restartPolicy": {"type": "string", "enum": ["Always", "OnFailure", "Never"]},
+            "runtimeClassName": _STRING,
+            "schedulerName": _STRING,
+            "schedulingGates": _list(_OPEN),
+            "securityContext": _OPEN,
+            "serviceAccount": _STRING,
+            "serviceAccountName": _STRING,
+            "setHostnameAsFQDN": _BOOLEAN,
+            "shareProcessNamespace": _BOOLEAN,
+            "subdomain": _STRING,
+            "terminationGracePeriodSeconds": _INTEGER,
+            "tolerations": _list(_OPEN),
+            "topologySpreadConstraints": _list(_OPEN),
+        },
+        required=("containers",),
+    ),
+    "PodTemplateSpec": _closed({"metadata": _ref("ObjectMeta"), "spec": _ref("PodSpec")}),
+    "DeploymentSpec": _closed(
+        {
+            "replicas": _INTEGER,
+            "selector": _ref("LabelSelector"),
+            "template": _ref("PodTemplateSpec"),
+            "strategy": _OPEN,
+            "minReadySeconds": _INTEGER,
+            "revisionHistoryLimit": _INTEGER,
+            "paused": _BOOLEAN,
+            "progressDeadlineSeconds": _INTEGER,
+        },
+        required=("selector", "template"),
+    ),
+    "StatefulSetSpec": _closed(
+        {
+            "replicas": _INTEGER,
+            "selector": _ref("LabelSelector"),
+            "template": _ref("PodTemplateSpec"),
+            "serviceName": _STRING,
+            "volumeClaimTemplates": _list(_OPEN),
+            "podManagementPolicy": _STRING,
+            "updateStrategy": _OPEN,
+            "minReadySeconds": _INTEGER,
+            "revisionHistoryLimit": _INTEGER,
+            "persistentVolumeClaimRetentionPolicy": _OPEN,
+            "ordinals": _OPEN,
+        },
+        required=("selector", "template"),
+    ),
+    "DaemonSetSpec": _closed(
+        {
+            "selector": _ref("LabelSelector"),
+            "template": _ref("PodTemplateSpec"),
+            "updateStrategy": _OPEN,
+            "minReadySeconds": _INTEGER,
+            "revisionHistoryLimit": _INTEGER,
+        },
+        required=("selector", "template"),
+    ),
+    "JobSpec": {
+        "type": "object",
+        "properties": {"template": _ref("PodTemplateSpec"), "selector": _ref("LabelSelector")},
+        "required": ["template"],
+        "x-kubernetes-preserve-unknown-fields": True,
+    },
+    "ServiceSpec": {
+        "type": "object",
+        "properties": {
+            "type": {
+                "type": "string",
+                "enum": ["ClusterIP", "NodePort", "LoadBalancer", "ExternalName"],
+            },
+            "selector": _STRING_MAP,
+            "ports": _list(
+                _closed(
+                    {
+                        "name": _STRING,
+                        "port": _INTEGER,
+                        "targetPort": _INT_OR_STRING,
+                        "nodePort": _INTEGER,
+                        "protocol": {"type": "string", "enum": ["TCP", "UDP", "SCTP"]},
+                        "appProtocol": _STRING,
+                    },
+                    required=("port",),
+                )
+            ),
+        },
+        "x-kubernetes-preserve-unknown-fields": True,
+    },
+}
+
+# (apiVersion, kind) to the schema of the whole object.
+KINDS: dict[tuple[str, str], dict[str, Any]] = {
+    ("v1", "Namespace"): _resource(spec=_OPEN, status=_OPEN),
+    ("v1", "ConfigMap"): _resource(
+        data=_STRING_MAP, binaryData=_STRING_MAP, immutable=_BOOLEAN
+    ),
+    ("v1", "Secret"): _resource(
+        data=_STRING_MAP, stringData=_STRING_MAP, type=_STRING, immutable=_BOOLEAN
+    ),
+    ("v1", "ServiceAccount"): _resource(
+        secrets=_list(_OPEN),
+        imagePullSecrets=_list(_OPEN),
+        automountServiceAccountToken=_BOOLEAN,
+    ),
+    ("v1", "Service"): _resource(spec=_ref("ServiceSpec"), status=_OPEN),
+    ("v1", "Pod"): _resource(spec=_ref("PodSpec"), status=_OPEN),
+    ("v1", "PersistentVolumeClaim"): _resource(spec=_OPEN, status=_OPEN),
+    ("apps/v1", "Deployment"): _resource(spec=_ref("DeploymentSpec"), status=_OPEN),
+    ("apps/v1", "StatefulSet"): _resource(spec=_ref("StatefulSetSpec"), status=_OPEN),
+    ("apps/v1", "DaemonSet"): _resource(spec=_ref("DaemonSetSpec"), status=_OPEN),
+    ("batch/v1", "Job"): _resource(spec=_ref("JobSpec"), status=_OPEN),
+    ("batch/v1", "CronJob"): _resource(spec=_OPEN, status=_OPEN),
+    ("networking.k8s.io/v1", "Ingress"): _resource(spec=_OPEN, status=_OPEN),
+    ("networking.k8s.io/v1", "NetworkPolicy"): _resource(spec=_OPEN),
+    ("rbac.authorization.k8s.io/v1", "Role"): _resource(rules=_list(_OPEN)),
+    ("rbac.authorization.k8s.io/v1", "ClusterRole"): _resource(
+        rules=_list(_OPEN), aggregationRule=_OPEN
+    ),
+    ("rbac.authorization.k8s.io/v1", "RoleBinding"): _resource(
+        roleRef=_OPEN, subjects=_list(_OPEN)
+    ),
+    ("rbac.authorization.k8s.io/v1", "ClusterRoleBinding"): _resource(
+        roleRef=_OPEN, subjects=_list(_OPEN)
+    ),
+    ("apiextensions.k8s.io/v1", "CustomResourceDefinition"): _resource(spec=_OPEN, status=_OPEN),
+}
@@ -0,0 +1,42 @@
+"""
+Rendering of `k8s_template` manifests.
+
+Placeholders are written `${name}` and replaced by the text of the value with that name, so a value
+is parsed as whatever it would have been if written in its place: `replicas: ${replicas}` with a
+value of `3` is a number. Nothing else is touched, so `$HOME` or `$(date)` in a script embedded in
+a config map is left alone; a literal `${name}` is written `$${name}`.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Mapping
+
+from pants_backend_k8s.util.validation import load_documents
+
+_PLACEHOLDER = re.compile(r"\$(\$?)\{([A-Za-z_][A-Za-z0-9_.-]*)\}")
+
+
+def template_placeholders(content: bytes) -> tuple[str, ...]:
+    """The names used by a template, in order of first use."""
+    names = (match.group(2) for match in _PLACEHOLDER.finditer(content.decode()) if not match.group(1))
+    return tuple(dict.fromkeys(names))
+
+
+def render_template(content: bytes, values: Mapping[str, str]) -> bytes:
+    """Replaces the placeholders of a template, failing if any has no value or the result is invalid."""
+    missing = [name for name in template_placeholders(content) if name not in values]
+    if missing:
+        raise ValueError(f"No value for {', '.join(missing)}.")
+
+    def replace(match: re.Match) -> str:
+        escaped, name = match.groups()
+        return f"${{{name}}}" if escaped else values[name]
+
+    rendered = _PLACEHOLDER.sub(replace, content.decode()).encode()
+    try:
+        load_documents(rendered)
+    except ValueError as e:
+        raise ValueError(f"The rendered manifest is not valid YAML: {e}") from e
+
+    return rendered
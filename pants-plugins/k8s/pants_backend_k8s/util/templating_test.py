@@ -0,0 +1,44 @@
+from textwrap import dedent
+
+import pytest
+import yaml
+
+from pants_backend_k8s.util.templating import render_template, template_placeholders
+
+TEMPLATE = dedent("""
+    apiVersion: apps/v1
+    kind: Deployment
+    metadata:
+      name: web-${env}
+    spec:
+      replicas: ${replicas}
+      template:
+        spec:
+          containers:
+            - name: web
+              image: ${image}
+              command: ["sh", "-c", "echo $HOME $${env} ${env}"]
+    """).encode()
+
+
+def test_render_template() -> None:
+    assert template_placeholders(TEMPLATE) == ("env", "replicas", "image")
+
+    rendered = render_template(
+        TEMPLATE,
+        {"env": "prod", "replicas": "3", "image": "registry/web@sha256:abc", "unused": "x"},
+    )
+    document = yaml.safe_load(rendered)
+    assert document["metadata"]["name"] == "web-prod"
+    assert document["spec"]["replicas"] == 3
+    container = document["spec"]["template"]["spec"]["containers"][0]
+    assert container["image"] == "registry/web@sha256:abc"
+    assert container["command"][2] == "echo $HOME ${env} prod"
+
+
+def test_render_template_errors() -> None:
+    with pytest.raises(ValueError, match="No value for replicas, image"):
+        render_template(TEMPLATE, {"env": "prod"})
+
+    with pytest.raises(ValueError, match="not valid YAML"):
+        render_template(b"metadata: ${name}", {"name": "a: b: c"})
@@ -0,0 +1,300 @@
+"""
+Offline validation of Kubernetes manifests against OpenAPI v3 schemas.
+
+Schemas are compiled once into nested checker functions, and only the subset of OpenAPI used by
+Kubernetes structural schemas is supported: `type`, `properties`, `required`, `items`,
+`additionalProperties`, `enum`, `nullable`, `minimum`, `maximum`, `allOf`, `anyOf`, `oneOf` and
+`x-kubernetes-int-or-string`. Unknown fields are only reported where `additionalProperties` is false.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Mapping
+
+import yaml
+
+from pants_backend_k8s.util.schemas import DEFINITIONS, KINDS
+
+Checker = Callable[[Any, str], Iterable[str]]
+
+_TYPES: dict[str, Callable[[Any], bool]] = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    # YAML timestamps are strings once converted to JSON by kubectl.
+    "string": lambda value: isinstance(value, (str, datetime.date)),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+}
+
+
+def compile_schema(schema: Mapping[str, Any], definitions: Mapping[str, Any]) -> Checker:
+    """Compiles `schema` into a function returning the errors of a value at a path."""
+    compiled: dict[str, Checker] = {}
+
+    def resolve(name: str) -> Checker:
+        # Definitions are compiled on first use; the indirection allows recursive definitions.
+        if name not in compiled:
+            compiled[name] = lambda value, path: checkers[name](value, path)
+            checkers[name] = build(definitions[name])
+        return compiled[name]
+
+    checkers: dict[str, Checker] = {}
+
+    def build(schema: Mapping[str, Any]) -> Checker:
+        ref = schema.get("$ref")
+        if ref is not None:
+            return resolve(ref.rsplit("/", 1)[-1])
+
+        checks: list[Checker] = []
+        nullable = schema.get("nullable", False)
+
+        if schema.get("x-kubernetes-int-or-string"):
+            checks.append(_check_type(("integer", "string")))
+        elif "type" in schema:
+            checks.append(_check_type((schema["type"],)))
+
+        if "enum" in schema:
+            checks.append(_check_enum(tuple(schema["enum"])))
+
+        if "minimum" in schema or "maximum" in schema:
+            checks.append(_check_range(schema.get("minimum"), schema.get("maximum")))
+
+        properties = {key: build(value) for key, value in (schema.get("properties") or {}).items()}
+        additional = schema.get("additionalProperties")
+        if properties or additional is not None or schema.get("required"):
+            if isinstance(additional, Mapping):
+                additional_checker: Checker | bool | None = build(additional)
+            elif additional is False:
+                additional_checker = False
+            else:
+                additional_checker = None
+            checks.append(
+                _check_object(properties, tuple(schema.get("required") or ()), additional_checker)
+            )
+
+        if "items" in schema:
+            checks.append(_check_items(build(schema["items"])))
+
+        for keyword in ("allOf", "anyOf", "oneOf"):
+            if keyword in schema:
+                checks.append(_check_combination(keyword, [build(s) for s in schema[keyword]]))
+
+        def check(value: Any, path: str) -> Iterable[str]:
+            if value is None and nullable:
+                return
+            for sub_check in checks:
+                errors = list(sub_check(value, path))
+                yield from errors
+                if errors:
+                    return
+
+        return check
+
+    return build(schema)
+
+
+def _check_type(types: tuple[str, ...]) -> Checker:
+    def check(value: Any, path: str) -> Iterable[str]:
+        if not any(_TYPES.get(type_, lambda _: True)(value) for type_ in types):
+            yield f"{path}: expected {' or '.join(types)}, got {_describe(value)}"
+
+    return check
+
+
+def _check_enum(values: tuple[Any, ...]) -> Checker:
+    def check(value: Any, path: str) -> Iterable[str]:
+        if value not in values:
+            yield f"{path}: {value!r} is not one of {', '.join(map(repr, values))}"
+
+    return check
+
+
+def _check_range(minimum: float | None, maximum: float | None) -> Checker:
+    def check(value: Any, path: str) -> Iterable[str]:
+        if not _TYPES["number"](value):
+            return
+        if minimum is not None and value < minimum:
+            yield f"{path}: {value} is less than {minimum}"
+        if maximum is not None and value > maximum:
+            yield f"{path}: {value} is greater than {maximum}"
+
+    return check
+
+
+def _check_object(
+    properties: Mapping[str, Checker],
+    required: tuple[str, ...],
+    additional: Checker | bool | None,
+) -> Checker:
+    def check(value: Any, path: str) -> Iterable[str]:
+        if not isinstance(value, dict):
+            return
+        for key in required:
+            if key not in value:
+                yield f"{path}: missing required field {key!r}"
+        for key, item in value.items():
+            item_path = f"{path}.{key}"
+            checker = properties.get(key)
+            if checker is not None:
+                yield from checker(item, item_path)
+            elif additional is False:
+                yield f"{path}: unknown field {key!r}"
+            elif additional is not None and additional is not True:
+                yield from additional(item, item_path)
+
+    return check
+
+
+def _check_items(items: Checker) -> Checker:
+    def check(value: Any, path: str) -> Iterable[str]:
+        if not isinstance(value, list):
+            return
+        for index, item in enumerate(value):
+            yield from items(item, f"{path}[{index}]")
+
+    return check
+
+
+def _check_combination(keyword: str, checkers: list[Checker]) -> Checker:
+    def check(value: Any, path: str) -> Iterable[str]:
+        results = [list(checker(value, path)) for checker in checkers]
+        passing = sum(1 for errors in results if not errors)
+        if keyword == "allOf":
+            for errors in results:
+                yield from errors
+        elif keyword == "anyOf" and passing == 0:
+            yield f"{path}: does not match any of the allowed schemas"
+        elif keyword == "oneOf" and passing != 1:
+            yield f"{path}: must match exactly one of the allowed schemas, matched {passing}"
+
+    return check
+
+
+def _describe(value: Any) -> str:
+    if value is None:
+        return "null"
+    for name, predicate in _TYPES.items():
+        if predicate(value):
+            return name
+    return type(value).__name__
+
+
+@lru_cache(maxsize=None)
+def _bundled_checker(api_version: str, kind: str) -> Checker:
+    return compile_schema(KINDS[(api_version, kind)], DEFINITIONS)
+
+
+@lru_cache(maxsize=None)
+def _custom_checker(schema_json: str) -> Checker:
+    return compile_schema(json.loads(schema_json), {})
+
+
+def _mapping(value: Any) -> dict:
+    return value if isinstance(value, dict) else {}
+
+
+def custom_resource_schemas(document: Any) -> dict[tuple[str, str], str]:
+    """Returns the schemas defined by a CustomResourceDefinition, as JSON by (apiVersion, kind)."""
+    if not isinstance(document, dict) or document.get("kind") != "CustomResourceDefinition":
+        return {}
+
+    # Any part of the definition may be malformed, which is reported by its own validation.
+    spec = _mapping(document.get("spec"))
+    group = spec.get("group")
+    kind = _mapping(spec.get("names")).get("kind")
+    if not isinstance(group, str) or not isinstance(kind, str) or not group or not kind:
+        return {}
+
+    versions = spec.get("versions")
+    schemas = {}
+    for version in versions if isinstance(versions, list) else ():
+        version = _mapping(version)
+        name = version.get("name")
+        schema = _mapping(_mapping(version.get("schema")).get("openAPIV3Schema"))
+        if isinstance(name, str) and name and schema:
+            schema = {
+                **schema,
+                "properties": {
+                    **_mapping(schema.get("properties")),
+                    "apiVersion": {"type": "string"},
+                    "kind": {"type": "string"},
+                    "metadata": {"type": "object", "x-kubernetes-preserve-unknown-fields": True},
+                },
+            }
+            schemas[(f"{group}/{name}", kind)] = json.dumps(schema, sort_keys=True)
+
+    return schemas
+
+
+def document_kinds(document: Any) -> set[tuple[str, str]]:
+    """The (apiVersion, kind) of a document and of the items of a list, which need a schema."""
+    if not isinstance(document, dict):
+        return set()
+
+    api_version, kind = document.get("apiVersion"), document.get("kind")
+    if not isinstance(api_version, str) or not isinstance(kind, str):
+        return set()
+
+    if kind.endswith("List") and isinstance(document.get("items"), list):
+        return {item_kind for item in document["items"] for item_kind in document_kinds(item)}
+    return {(api_version, kind)}
+
+
+def validate_document(
+    document: Any,
+    custom_schemas: Mapping[tuple[str, str], str],
+    ignore_missing_schemas: bool = True,
+) -> list[str]:
+    """Returns the errors in a single manifest document.
+
+    `custom_schemas` holds JSON schemas for custom resources, as returned by
+    `custom_resource_schemas`.
+    """
+    if document is None:
+        return []
+
+    if not isinstance(document, dict):
+        return [f"expected an object, got {_describe(document)}"]
+
+    api_version, kind = document.get("apiVersion"), document.get("kind")
+    if not isinstance(api_version, str) or not isinstance(kind, str):
+        return ["missing `apiVersion` or `kind`"]
+
+    errors = []
+    metadata = document.get("metadata")
+    if not kind.endswith("List") and not (
+        isinstance(metadata, dict) and (metadata.get("name") or metadata.get("generateName"))
+    ):
+        errors.append("`metadata.name` is required")
+
+    if kind.endswith("List") and isinstance(document.get("items"), list):
+        for index, item in enumerate(document["items"]):
+            errors.extend(
+                f"items[{index}]: {error}"
+                for error in validate_document(item, custom_schemas, ignore_missing_schemas)
+            )
+        return errors
+
+    if (api_version, kind) in KINDS:
+        checker = _bundled_checker(api_version, kind)
+    elif (api_version, kind) in custom_schemas:
+        checker = _custom_checker(custom_schemas[(api_version, kind)])
+    elif ignore_missing_schemas:
+        return errors
+    else:
+        return [*errors, f"no schema for {api_version}/{kind}"]
+
+    errors.extend(checker(document, "$"))
+    return errors
+
+
+def load_documents(content: bytes) -> list[Any]:
+    """Loads all documents of a YAML or JSON manifest, skipping empty ones."""
+    try:
+        return [document for document in yaml.safe_load_all(content) if document is not None]
+    except yaml.YAMLError as e:
+        raise ValueError(str(e)) from e
@@ -0,0 +1,153 @@
+from textwrap import dedent
+
+from pants_backend_k8s.util.validation import (
+    custom_resource_schemas,
+    document_kinds,
+    load_documents,
+    validate_document,
+)
+
+
+def _errors(manifest: str, custom_schemas=None, ignore_missing_schemas: bool = True) -> list[str]:
+    return [
+        error
+        for document in load_documents(dedent(manifest).encode())
+        for error in validate_document(document, custom_schemas or {}, ignore_missing_schemas)
+    ]
+
+
+def test_valid_deployment() -> None:
+    assert (
+        _errors("""
+            apiVersion: apps/v1
+            kind: Deployment
+            metadata:
+              name: web
+            spec:
+              replicas: 2
+              selector:
+                matchLabels: {app: web}
+              template:
+                metadata:
+                  labels: {app: web}
+                spec:
+                  containers:
+                    - name: web
+                      image: nginx
+                      ports: [{containerPort: 80}]
+            """)
+        == []
+    )
+
+
+def test_reports_type_and_unknown_field_errors() -> None:
+    errors = _errors("""
+        apiVersion: apps/v1
+        kind: Deployment
+        metadata:
+          name: web
+        spec:
+          replicas: "2"
+          selector: {}
+          template:
+            spec:
+              containers:
+                - name: web
+                  imagee: nginx
+        ---
+        apiVersion: v1
+        kind: ConfigMap
+        metadata:
+          name: config
+        data:
+          port: 8080
+        """)
+
+    assert errors == [
+        "$.spec.replicas: expected integer, got string",
+        "$.spec.template.spec.containers[0]: unknown field 'imagee'",
+        "$.data.port: expected string, got integer",
+    ]
+
+
+def test_missing_name_and_schema() -> None:
+    manifest = """
+        apiVersion: example.com/v1
+        kind: Widget
+        metadata: {}
+        """
+
+    assert _errors(manifest) == ["`metadata.name` is required"]
+    assert _errors(manifest, ignore_missing_schemas=False) == [
+        "`metadata.name` is required",
+        "no schema for example.com/v1/Widget",
+    ]
+
+
+def test_custom_resource_definitions() -> None:
+    (crd,) = load_documents(
+        dedent("""
+            apiVersion: apiextensions.k8s.io/v1
+            kind: CustomResourceDefinition
+            metadata:
+              name: widgets.example.com
+            spec:
+              group: example.com
+              names: {kind: Widget, plural: widgets}
+              scope: Namespaced
+              versions:
+                - name: v1
+                  served: true
+                  storage: true
+                  schema:
+                    openAPIV3Schema:
+                      type: object
+                      properties:
+                        spec:
+                          type: object
+                          required: [size]
+                          properties:
+                            size: {type: integer, minimum: 1}
+            """).encode()
+    )
+    schemas = custom_resource_schemas(crd)
+
+    assert list(schemas) == [("example.com/v1", "Widget")]
+    assert _errors(
+        """
+        apiVersion: example.com/v1
+        kind: Widget
+        metadata: {name: small}
+        spec: {size: 0}
+        """,
+        schemas,
+    ) == ["$.spec.size: 0 is less than 1"]
+
+
+def test_custom_resource_schemas_of_malformed_definitions() -> None:
+    definition = {"kind": "CustomResourceDefinition"}
+    assert custom_resource_schemas({**definition, "spec": ["not", "a", "mapping"]}) == {}
+    assert custom_resource_schemas({**definition, "spec": {"group": "example.com", "names": "Widget"}}) == {}
+    assert (
+        custom_resource_schemas(
+            {
+                **definition,
+                "spec": {
+                    "group": "example.com",
+                    "names": {"kind": "Widget"},
+                    "versions": ["v1", None, {"name": "v2", "schema": ["x"]}],
+                },
+            }
+        )
+        == {}
+    )
+
+
+def test_document_kinds() -> None:
+    widget = {"apiVersion": "example.com/v1", "kind": "Widget"}
+    assert document_kinds(widget) == {("example.com/v1", "Widget")}
+    assert document_kinds(
+        {"apiVersion": "v1", "kind": "List", "items": [widget, {"apiVersion": "v1", "kind": "Service"}]}
+    ) == {("example.com/v1", "Widget"), ("v1", "Service")}
+    assert document_kinds({"kind": "Widget"}) == set()
+    assert document_kinds(["not", "a", "document"]) == set()
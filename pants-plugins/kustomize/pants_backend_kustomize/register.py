@@ -3,7 +3,7 @@ from pants.engine.rules import collect_rules
 from pants_backend_kustomize import codegen, requests
 from pants_backend_kustomize import target_types as targets
 from pants_backend_kustomize.goals import tailor
-from pants_backend_kustomize.util_rules import prepare_context
+from pants_backend_kustomize.util_rules import inject, prepare_context, remote, render
 
 
 def target_types():
@@ -17,7 +17,10 @@ def rules():
         *collect_rules(),
         *targets.rules(),
         *codegen.rules(),
+        *inject.rules(),
         *prepare_context.rules(),
+        *remote.rules(),
+        *render.rules(),
         *requests.rules(),
         *tailor.rules(),
     ]
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from pants.core.util_rules.external_tool import ExternalTool
 from pants.engine.platform import Platform
-from pants.option.option_types import BoolOption
+from pants.option.option_types import BoolOption, IntOption
 from pants.util.strutil import softwrap
 
 
@@ -24,6 +24,47 @@ class KustomizeTool(ExternalTool):
         advanced=True,
     )
 
+    prerender_bases = BoolOption(
+        default=False,
+        help=softwrap("""
+            If true, `kustomize` targets used as bases are built once on their own, and overlays
+            include the rendered output instead of building the base again.
+
+            Overlays then see the base as plain resources: generated names already carry their hash
+            suffix, so an overlay cannot merge into a generator from the base.
+            """),
+        advanced=True,
+    )
+
+    batch_size = IntOption(
+        default=1,
+        help=softwrap("""
+            The number of `kustomize` targets to render in a single process during code generation.
+
+            The targets of a directory are partitioned in address order, so adding or removing a
+            target only changes the partitions of its directory. Rendering any member of a partition
+            renders the whole partition, which is cached by the inputs of all its members, so this
+            pays off when many targets are generated together, e.g. by `pants package ::`. An error
+            in one member only fails that member. A value of `1` renders every target in its own
+            process.
+
+            Only targets whose dependencies are all `kustomize_remote` targets are batched, so
+            images and packages are never built or published for targets that were not requested.
+            """),
+        advanced=True,
+    )
+
+    mirror_remote_bases = BoolOption(
+        default=False,
+        help=softwrap("""
+            If true, pinned remote resources in kustomization files (such as
+            `github.com/org/repo/path?ref=v1.0.0`) are fetched through a git mirror kept in a named
+            cache and passed to kustomize as local directories, instead of kustomize cloning them on
+            every render. Resources without a `ref` or `version` are left to kustomize.
+            """),
+        advanced=True,
+    )
+
     def generate_url(self, plat: Platform) -> str:
         platform_mapping = {
             "macos_arm64": "darwin_arm64",
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
 from pants.engine.rules import collect_rules
-from pants.engine.target import COMMON_TARGET_FIELDS, Dependencies, MultipleSourcesField, Target
+from pants.engine.target import (
+    COMMON_TARGET_FIELDS,
+    Dependencies,
+    MultipleSourcesField,
+    StringField,
+    Target,
+)
 from pants.util.strutil import softwrap
 
 
@@ -47,9 +53,58 @@ class KustomizeTarget(Target):
         """)
 
 
+class KustomizeRemoteRepositoryField(StringField):
+    alias = "repository"
+    required = True
+    help = softwrap("""
+        The git repository to fetch, e.g. `https://github.com/kubernetes-sigs/kustomize` or
+        `file:///srv/git/manifests`.
+        """)
+
+
+class KustomizeRemoteRefField(StringField):
+    alias = "ref"
+    required = True
+    help = softwrap("""
+        The commit or tag to fetch. The fetched files are cached for as long as this does not
+        change, so prefer an immutable ref over a branch.
+        """)
+
+
+class KustomizeRemoteSubdirectoryField(StringField):
+    alias = "subdirectory"
+    default = ""
+    help = "The directory in the repository that contains the kustomization."
+
+
+class KustomizeRemoteTarget(Target):
+    alias = "kustomize_remote"
+    core_fields = (
+        *COMMON_TARGET_FIELDS,
+        KustomizeRemoteRepositoryField,
+        KustomizeRemoteRefField,
+        KustomizeRemoteSubdirectoryField,
+    )
+    help = softwrap("""A pinned remote kustomization, for use as a base of `kustomize` targets.
+
+        The repository is fetched once into a mirror in a named cache, so renders do not touch the
+        network as long as the ref is unchanged. Reference it from a kustomization file by address.
+
+        Example BUILD file:
+
+            kustomize_remote(
+                name="cert-manager",
+                repository="https://github.com/cert-manager/cert-manager",
+                ref="v1.14.4",
+                subdirectory="deploy/manifests",
+            )
+        """)
+
+
 def targets():
     return [
         KustomizeTarget,
+        KustomizeRemoteTarget,
     ]
 
 
@@ -0,0 +1,287 @@
+"""
+Injection of Pants-provided values into kustomization files.
+
+Kustomization files reference other targets by address, e.g. `digest: //examples/oci:oci` for an
+image or `- :bin` for a package. Rather than searching and replacing text, every kustomization file
+in a build context is parsed once and each string scalar that is exactly a known reference (or the
+value of a `key=reference` generator entry) is replaced, so one address that is a prefix of another
+can no longer be corrupted. Replacements are made in the text at the position of the scalar, so
+comments, formatting and all other values are kept as written, and files without references are
+not rewritten at all.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Iterator, Mapping
+
+import yaml
+from pants.engine.addresses import Address
+from pants.engine.fs import (
+    CreateDigest,
+    Digest,
+    DigestContents,
+    DigestSubset,
+    FileContent,
+    MergeDigests,
+    PathGlobs,
+)
+from pants.engine.rules import Get, MultiGet, collect_rules, rule
+from pants.util.frozendict import FrozenDict
+
+from pants_backend_kustomize.subsystem import KustomizeTool
+from pants_backend_kustomize.util_rules.remote import (
+    FetchedRemote,
+    RemoteReference,
+    parse_remote_reference,
+)
+
+KUSTOMIZATION_FILE_NAMES = ("kustomization.yaml", "kustomization.yml", "Kustomization")
+# Fields of a kustomization that list other kustomizations, which may be remote.
+_RESOURCE_FIELDS = ("resources", "bases", "components")
+_STR_TAG = "tag:yaml.org,2002:str"
+# Values that can be written as plain scalars in both block and flow context.
+_PLAIN_SAFE = re.compile(r"[A-Za-z0-9_./+-][A-Za-z0-9_./@:=+-]*")
+
+
+def is_kustomization_file(path: str) -> bool:
+    return os.path.basename(path) in KUSTOMIZATION_FILE_NAMES
+
+
+def address_references(address: Address) -> tuple[str, ...]:
+    """The ways `address` can be spelled as an absolute reference in a kustomization file."""
+    spellings = [f"//{address.spec}"]
+    if not address.is_generated_target and not address.parameters:
+        spellings.append(f"//{address.spec_path}:{address.target_name}")
+    return tuple(dict.fromkeys(spellings))
+
+
+@dataclass(frozen=True)
+class KustomizeReference:
+    """A reference to replace in kustomization files.
+
+    When `is_path` is set, `value` is a path from the build root, which is made relative to the
+    directory of each kustomization file it is injected into.
+    """
+
+    reference: str
+    value: str
+    is_path: bool = False
+
+
+@dataclass(frozen=True)
+class ParsedKustomizationRequest:
+    path: str
+    content: bytes
+
+
+@dataclass(frozen=True)
+class KustomizationScalar:
+    """A string scalar in the value position of a kustomization file, by its span in the text."""
+
+    start: int
+    end: int
+    value: str
+    style: str | None
+
+
+@dataclass(frozen=True)
+class ParsedKustomization:
+    path: str
+    text: str
+    document: Any
+    scalars: tuple[KustomizationScalar, ...] = ()
+
+
+@dataclass(frozen=True)
+class InjectKustomizationRequest:
+    digest: Digest
+    references: tuple[KustomizeReference, ...]
+
+
+@dataclass(frozen=True)
+class InjectedKustomization:
+    digest: Digest
+
+
+def _resolve(reference: KustomizeReference, directory: str) -> str:
+    if reference.is_path:
+        return os.path.relpath(reference.value, directory or ".")
+    return reference.value
+
+
+def _inject_scalar(value: str, references: Mapping[str, KustomizeReference], directory: str) -> str:
+    reference = references.get(value)
+    if reference is not None:
+        return _resolve(reference, directory)
+
+    # Generators accept `key=path` entries, e.g. `files: ["server=:bin"]`.
+    key, separator, rest = value.partition("=")
+    reference = references.get(rest) if separator else None
+    if reference is not None:
+        return f"{key}={_resolve(reference, directory)}"
+
+    return value
+
+
+def _value_scalars(node: yaml.Node) -> Iterator[yaml.ScalarNode]:
+    if isinstance(node, yaml.ScalarNode):
+        yield node
+    elif isinstance(node, yaml.MappingNode):
+        for _, value in node.value:
+            yield from _value_scalars(value)
+    elif isinstance(node, yaml.SequenceNode):
+        for item in node.value:
+            yield from _value_scalars(item)
+
+
+def _loads_as(value: str) -> bool:
+    try:
+        return yaml.safe_load(value) == value
+    except yaml.YAMLError:
+        return False
+
+
+def _quote(value: str, style: str | None) -> str:
+    """Writes `value` as a scalar, in the style of the one it replaces where that is safe."""
+    if style == "'":
+        return "'" + value.replace("'", "''") + "'"
+    if style is None and _PLAIN_SAFE.fullmatch(value) and _loads_as(value):
+        return value
+    # JSON strings are valid double-quoted YAML scalars.
+    return json.dumps(value)
+
+
+def load_kustomization(path: str, content: bytes) -> ParsedKustomization:
+    try:
+        text = content.decode()
+        loader = yaml.SafeLoader(text)
+        try:
+            node = loader.get_single_node()
+            document = loader.construct_document(node) if node is not None else None
+        finally:
+            loader.dispose()
+        # The span of a node includes its anchor and tag, which must be kept, so scalars are
+        # replaced from the start of their token.
+        token_starts = {
+            token.end_mark.index: token.start_mark.index
+            for token in yaml.scan(text, Loader=yaml.SafeLoader)
+            if isinstance(token, yaml.ScalarToken)
+        }
+    except (UnicodeDecodeError, yaml.YAMLError) as e:
+        raise ValueError(f"Failed to parse {path}: {e}") from e
+
+    scalars = {}
+    if node is not None:
+        # Aliases share the node of their anchor, which is the only place to replace.
+        for scalar in _value_scalars(node):
+            if scalar.tag == _STR_TAG:
+                end = scalar.end_mark.index
+                scalars[id(scalar)] = KustomizationScalar(
+                    token_starts.get(end, scalar.start_mark.index), end, scalar.value, scalar.style
+                )
+
+    if isinstance(document, Mapping):
+        document = FrozenDict.deep_freeze(document)
+
+    return ParsedKustomization(path, text, document, tuple(scalars.values()))
+
+
+def inject_references(
+    kustomization: ParsedKustomization, references: Mapping[str, KustomizeReference], directory: str
+) -> tuple[str, bool]:
+    """Returns the text of `kustomization` with all references replaced, and whether any were."""
+    text = kustomization.text
+    changed = False
+    for scalar in sorted(kustomization.scalars, key=lambda scalar: scalar.start, reverse=True):
+        value = _inject_scalar(scalar.value, references, directory)
+        if value == scalar.value:
+            continue
+        text = text[: scalar.start] + _quote(value, scalar.style) + text[scalar.end :]
+        changed = True
+    return text, changed
+
+
+def remote_references(document: Any) -> dict[str, RemoteReference]:
+    """Finds the pinned remote kustomizations listed in a parsed kustomization file."""
+    if not isinstance(document, Mapping):
+        return {}
+
+    remotes = {}
+    for field in _RESOURCE_FIELDS:
+        for value in document.get(field) or ():
+            remote = parse_remote_reference(value) if isinstance(value, str) else None
+            if remote is not None:
+                remotes[value] = remote
+
+    return remotes
+
+
+@rule
+def parse_kustomization(request: ParsedKustomizationRequest) -> ParsedKustomization:
+    """Parses a kustomization file.
+
+    The request holds the file content, so the engine memoizes this per file digest and overlays
+    sharing a file share its parsed form.
+    """
+    return load_kustomization(request.path, request.content)
+
+
+@rule
+async def inject_kustomization(
+    request: InjectKustomizationRequest, kustomize: KustomizeTool
+) -> InjectedKustomization:
+    if not request.references and not kustomize.mirror_remote_bases:
+        return InjectedKustomization(request.digest)
+
+    kustomization_globs = [f"**/{name}" for name in KUSTOMIZATION_FILE_NAMES]
+    contents, others = await MultiGet(
+        Get(DigestContents, DigestSubset(request.digest, PathGlobs(kustomization_globs))),
+        Get(
+            Digest,
+            DigestSubset(
+                request.digest, PathGlobs(["**", *(f"!{glob}" for glob in kustomization_globs)])
+            ),
+        ),
+    )
+
+    parsed = await MultiGet(
+        Get(ParsedKustomization, ParsedKustomizationRequest(file.path, file.content))
+        for file in contents
+    )
+
+    references = {reference.reference: reference for reference in request.references}
+
+    fetched: tuple[FetchedRemote, ...] = ()
+    if kustomize.mirror_remote_bases:
+        remotes = {}
+        for kustomization in parsed:
+            remotes.update(remote_references(kustomization.document))
+
+        fetched = await MultiGet(
+            Get(FetchedRemote, RemoteReference, remote) for remote in set(remotes.values())
+        )
+        for value, remote in remotes.items():
+            references[value] = KustomizeReference(value, remote.directory, is_path=True)
+
+    patched = []
+    for file, kustomization in zip(contents, parsed):
+        text, changed = inject_references(kustomization, references, os.path.dirname(file.path))
+        if not changed:
+            patched.append(file)
+            continue
+
+        patched.append(FileContent(file.path, text.encode(), is_executable=file.is_executable))
+
+    patched_digest = await Get(Digest, CreateDigest(patched))
+    digest = await Get(
+        Digest, MergeDigests([others, patched_digest, *(remote.digest for remote in fetched)])
+    )
+    return InjectedKustomization(digest)
+
+
+def rules():
+    return collect_rules()
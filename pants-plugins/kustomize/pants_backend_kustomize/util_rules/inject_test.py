@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+import yaml
+from pants.engine.addresses import Address
+
+from pants_backend_kustomize.util_rules.inject import (
+    KustomizeReference,
+    address_references,
+    inject_references,
+    load_kustomization,
+)
+
+
+def _references(*references: KustomizeReference) -> dict[str, KustomizeReference]:
+    return {reference.reference: reference for reference in references}
+
+
+def _inject(content: str, references: dict[str, KustomizeReference], directory: str) -> tuple[str, bool]:
+    kustomization = load_kustomization(f"{directory}/kustomization.yaml", dedent(content).encode())
+    return inject_references(kustomization, references, directory)
+
+
+def test_inject_replaces_exact_scalars_only() -> None:
+    references = _references(
+        KustomizeReference("//examples/oci:oci", "sha256:abc"),
+        KustomizeReference("//examples/oci:oci-debug", "sha256:def"),
+    )
+    content = """\
+        images:
+          - name: pause  # the main image
+            digest: //examples/oci:oci
+          - {name: debug, digest: "//examples/oci:oci-debug"}
+        commonLabels:
+          note: built from //examples/oci:oci
+          enabled: on
+        """
+
+    assert _inject(content, references, "examples/kustomize") == (
+        dedent("""\
+            images:
+              - name: pause  # the main image
+                digest: sha256:abc
+              - {name: debug, digest: "sha256:def"}
+            commonLabels:
+              note: built from //examples/oci:oci
+              enabled: on
+            """),
+        True,
+    )
+
+
+def test_inject_makes_paths_relative_to_each_file() -> None:
+    references = _references(KustomizeReference(":bin", "dist/app/bin.pex", is_path=True))
+    content = """\
+        resources: [":bin"]
+        configMapGenerator:
+          - files: ['app=:bin']
+        """
+
+    assert _inject(content, references, "app/overlay") == (
+        dedent("""\
+            resources: ["../../dist/app/bin.pex"]
+            configMapGenerator:
+              - files: ['app=../../dist/app/bin.pex']
+            """),
+        True,
+    )
+
+
+def test_inject_quotes_values_that_are_not_plain_strings() -> None:
+    references = _references(
+        KustomizeReference(":version", "1.0"),
+        KustomizeReference(":flag", "yes, please"),
+    )
+    content = "commonLabels:\n  version: :version\n  flag: :flag\n"
+
+    assert _inject(content, references, "app") == (
+        'commonLabels:\n  version: "1.0"\n  flag: "yes, please"\n',
+        True,
+    )
+
+
+def test_inject_keeps_anchors_and_tags() -> None:
+    references = _references(KustomizeReference(":b", "dist/b", is_path=True))
+    content = """\
+        resources:
+          - &base :b
+          - *base
+        configMapGenerator:
+          - files: [!!str "app=:b"]
+        """
+
+    injected, changed = _inject(content, references, "app")
+    assert (injected, changed) == (
+        dedent("""\
+            resources:
+              - &base ../dist/b
+              - *base
+            configMapGenerator:
+              - files: [!!str "app=../dist/b"]
+            """),
+        True,
+    )
+    assert yaml.safe_load(injected)["resources"] == ["../dist/b", "../dist/b"]
+
+
+def test_inject_quotes_values_yaml_cannot_scan_as_plain() -> None:
+    references = _references(KustomizeReference(":package", "@scope/package"))
+    assert _inject("name: :package\n", references, "app") == ('name: "@scope/package"\n', True)
+
+
+def test_inject_reports_unchanged_files() -> None:
+    content = "# keep me\nresources:\n  - deployment.yaml\n"
+    assert _inject(content, _references(KustomizeReference(":bin", "bin")), "app") == (content, False)
+
+
+def test_address_references() -> None:
+    assert "//examples/oci:oci" in address_references(Address("examples/oci", target_name="oci"))
+    assert "//examples/oci:debug" in address_references(Address("examples/oci", target_name="debug"))
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 
 from pants.core.goals.package import BuiltPackage, PackageFieldSet
 from pants.core.util_rules.source_files import SourceFiles, SourceFilesRequest
-from pants.engine.fs import CreateDigest, Digest, DigestContents, FileContent, MergeDigests
+from pants.engine.fs import CreateDigest, Digest, FileContent, MergeDigests
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
 from pants.engine.target import (
     DependenciesRequest,
@@ -19,11 +19,32 @@ from pants_backend_kustomize.requests import (
     KustomizeInjectRequestQuery,
     KustomizeInjectRequestWrap,
 )
+from pants_backend_kustomize.subsystem import KustomizeTool
 from pants_backend_kustomize.target_types import (
     KustomizeDependenciesField,
+    KustomizeRemoteRefField,
+    KustomizeRemoteRepositoryField,
+    KustomizeRemoteSubdirectoryField,
+    KustomizeRemoteTarget,
     KustomizeSourcesField,
     KustomizeTarget,
 )
+from pants_backend_kustomize.util_rules.inject import (
+    KUSTOMIZATION_FILE_NAMES,
+    InjectedKustomization,
+    InjectKustomizationRequest,
+    KustomizeReference,
+    address_references,
+    is_kustomization_file,
+)
+from pants_backend_kustomize.util_rules.remote import FetchedRemote, RemoteReference
+
+_PRERENDERED_KUSTOMIZATION = """\
+apiVersion: kustomize.config.k8s.io/v1beta1
+kind: Kustomization
+resources:
+- {}
+"""
 
 
 @dataclass(frozen=True)
@@ -36,9 +57,39 @@ class KustomizationContext:
     digest: Digest
 
 
+@dataclass(frozen=True)
+class RenderKustomizationRequest:
+    target: Target
+
+
+@dataclass(frozen=True)
+class RenderedKustomization:
+    """The output of `kustomize build` for a target, as `<spec_path>/<target_name>.yaml`."""
+
+    digest: Digest
+    path: str
+
+
+def rendered_path(target: Target) -> str:
+    return os.path.join(target.address.spec_path, f"{target.address.target_name}.yaml")
+
+
+def kustomization_path(target: Target, files: tuple[str, ...]) -> str:
+    """The kustomization file that `kustomize build` reads for `target`, from its source files."""
+    for name in KUSTOMIZATION_FILE_NAMES:
+        path = os.path.join(target.address.spec_path, name)
+        if path in files:
+            return path
+
+    raise ValueError(
+        f"{target.address} has no kustomization file in {target.address.spec_path or 'the build root'}."
+    )
+
+
 @rule
 async def prepare_build_context(
     request: KustomizationContextRequest,
+    kustomize: KustomizeTool,
 ) -> KustomizationContext:
     root_get = Get(
         SourceFiles,
@@ -50,76 +101,136 @@ async def prepare_build_context(
         DependenciesRequest(request.target[KustomizeDependenciesField]),
     )
 
-    root_contexts_get = []
-    other_deps = []
-    dep_names = []
-    inject_data_queries = []
-    for dependency, dependency_name in zip(
-        root_dependencies, request.target[KustomizeDependenciesField].value or []
-    ):
-        kir = await Get(KustomizeInjectRequestWrap, KustomizeInjectRequestQuery(dependency))
+    # Classify all dependencies at once; several entries may resolve to the same target, so keep
+    # only the first of each when fanning out below.
+    dependency_names = request.target[KustomizeDependenciesField].value or []
+    wraps = await MultiGet(
+        Get(KustomizeInjectRequestWrap, KustomizeInjectRequestQuery(dependency))
+        for dependency in root_dependencies
+    )
+
+    bases = {}
+    remotes = {}
+    inject_requests = {}
+    other_deps = {}
+    for dependency, dependency_name, kir in zip(root_dependencies, dependency_names, wraps):
         if isinstance(dependency, KustomizeTarget):
-            root_contexts_get.append(
-                Get(KustomizationContext, KustomizationContextRequest(target=dependency))
-            )
+            bases.setdefault(dependency.address, dependency)
+        elif isinstance(dependency, KustomizeRemoteTarget):
+            remotes.setdefault(dependency.address, (dependency, dependency_name))
         elif kir.valid:
-            query = await Get(KustomizeInjectData, KustomizeInjectRequest, kir.request)
-            inject_data_queries.append(query)
+            inject_requests.setdefault(dependency.address, kir.request)
         else:
-            other_deps.append(dependency)
-            dep_names.append(dependency_name)
+            other_deps.setdefault(dependency.address, (dependency, dependency_name))
 
     embedded_pkgs_per_target_request = Get(
         FieldSetsPerTarget,
-        FieldSetsPerTargetRequest(PackageFieldSet, other_deps),
+        FieldSetsPerTargetRequest(
+            PackageFieldSet, [dependency for dependency, _ in other_deps.values()]
+        ),
     )
 
-    (root, embedded_pkgs_per_target, *bases) = await MultiGet(
+    # Injection data (e.g. building and publishing an image) is independent per dependency, so
+    # it is requested together with the sources and bases rather than one at a time.
+    (root, embedded_pkgs_per_target, *results) = await MultiGet(
         root_get,
         embedded_pkgs_per_target_request,
-        *root_contexts_get,
+        *(
+            Get(
+                FetchedRemote,
+                RemoteReference(
+                    dependency[KustomizeRemoteRepositoryField].value,
+                    dependency[KustomizeRemoteRefField].value,
+                    dependency[KustomizeRemoteSubdirectoryField].value or "",
+                ),
+            )
+            for dependency, _ in remotes.values()
+        ),
+        *(
+            Get(KustomizeInjectData, KustomizeInjectRequest, inject_request)
+            for inject_request in inject_requests.values()
+        ),
+        *(
+            Get(RenderedKustomization, RenderKustomizationRequest(target=base))
+            if kustomize.prerender_bases
+            else Get(KustomizationContext, KustomizationContextRequest(target=base))
+            for base in bases.values()
+        ),
     )
+    fetched_remotes = results[: len(remotes)]
+    inject_data = results[len(remotes) : len(remotes) + len(inject_requests)]
+    base_digests = results[len(remotes) + len(inject_requests) :]
+
+    if kustomize.prerender_bases:
+        # Replace each base with a kustomization that only lists its rendered output. The base is
+        # then built once, no matter how many overlays include it.
+        base_sources = await MultiGet(
+            Get(SourceFiles, SourceFilesRequest([base[KustomizeSourcesField]])) for base in bases.values()
+        )
+        taken = {path: f"a source of {request.target.address}" for path in root.snapshot.files}
+        stub_files = []
+        for base, rendered, sources in zip(bases.values(), base_digests, base_sources):
+            stub_path = kustomization_path(base, sources.snapshot.files)
+            for path in (stub_path, rendered.path):
+                if path in taken:
+                    raise ValueError(
+                        f"Can't include the prerendered {base.address} in {request.target.address}, "
+                        f"as {path} is also {taken[path]}. Move the base to its own directory, or "
+                        "disable `[kustomize-tool].prerender_bases`."
+                    )
+                taken[path] = f"part of the prerendered {base.address}"
+
+            stub_files.append(
+                FileContent(
+                    stub_path,
+                    _PRERENDERED_KUSTOMIZATION.format(os.path.basename(rendered.path)).encode(),
+                )
+            )
+
+        stubs = await Get(Digest, CreateDigest(stub_files))
+        base_digests = [
+            *(rendered.digest for rendered in base_digests),
+            stubs,
+        ]
+    else:
+        base_digests = [context.digest for context in base_digests]
 
     # Package binary dependencies for build context.
     embedded_pkgs = await MultiGet(
         Get(BuiltPackage, PackageFieldSet, field_set) for field_set in embedded_pkgs_per_target.field_sets
     )
 
-    root_contents = await Get(DigestContents, Digest, root.snapshot.digest)
-    root_content = None
-    other_contents = []
-    for file in root_contents:
-        if file.path.endswith("kustomization.yaml"):
-            root_content = file
-
-        else:
-            other_contents.append(file)
-
-    if root_content is None:
+    if not any(is_kustomization_file(path) for path in root.snapshot.files):
         raise Exception("no kustomization.yaml file in build context")
 
-    root_dir = os.path.dirname(root_content.path)
-    root_manifest = root_content.content.decode()
+    references = []
+    for (dependency, dependency_name), pkg in zip(other_deps.values(), embedded_pkgs):
+        for reference in (dependency_name, *address_references(dependency.address)):
+            references.append(KustomizeReference(reference, pkg.artifacts[0].relpath, is_path=True))
 
-    embedded_pkgs = embedded_pkgs or []
-    for dep, pkg in zip(dep_names, embedded_pkgs):
-        root_manifest = root_manifest.replace(dep, os.path.relpath(pkg.artifacts[0].relpath, root_dir))
+    for (dependency, dependency_name), remote in zip(remotes.values(), fetched_remotes):
+        for reference in (dependency_name, *address_references(dependency.address)):
+            references.append(
+                KustomizeReference(reference, remote.reference.directory, is_path=True)
+            )
 
-    for kustomize_inject in inject_data_queries:
-        root_manifest = root_manifest.replace(f"//{kustomize_inject.address}", kustomize_inject.value)
+    for kustomize_inject in inject_data:
+        for reference in address_references(kustomize_inject.address):
+            references.append(KustomizeReference(reference, kustomize_inject.value))
 
     patched_root = await Get(
-        Digest,
-        CreateDigest([FileContent(root_content.path, root_manifest.encode()), *other_contents]),
+        InjectedKustomization,
+        InjectKustomizationRequest(root.snapshot.digest, tuple(references)),
     )
 
     input_digest = await Get(
         Digest,
         MergeDigests(
             [
-                patched_root,
+                patched_root.digest,
                 *[built_package.digest for built_package in embedded_pkgs],
-                *[base.digest for base in bases],
+                *[remote.digest for remote in fetched_remotes],
+                *base_digests,
             ]
         ),
     )
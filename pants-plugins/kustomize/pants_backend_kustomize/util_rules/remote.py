@@ -0,0 +1,191 @@
+"""
+Fetching of remote Kustomize bases through a persistent git mirror.
+
+Kustomize clones remote bases such as `github.com/org/repo/deploy?ref=v1.2.0` itself, on every
+uncached render. Instead, each repository is kept as a bare mirror in a named cache and only fetched
+when the requested ref is missing, and the files at that ref are handed to kustomize as a local
+directory. Only pinned references (with a `ref` or `version`) are fetched this way, as the result is
+cached for as long as the reference does not change.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass
+from textwrap import dedent
+from urllib.parse import parse_qs
+
+from pants.core.util_rules.system_binaries import (
+    BashBinary,
+    BinaryShims,
+    BinaryShimsRequest,
+    SystemBinariesSubsystem,
+)
+from pants.engine.env_vars import EnvironmentVars, EnvironmentVarsRequest
+from pants.engine.fs import CreateDigest, Digest, FileContent
+from pants.engine.process import Process, ProcessResult
+from pants.engine.rules import Get, MultiGet, collect_rules, rule
+from pants.util.frozendict import FrozenDict
+
+_CACHE_NAME = "kustomize_git_mirrors"
+_CACHE_PATH = ".kustomize_git_mirrors"
+_TOOLS = ["git", "tar", "mkdir", "mv", "rm"]
+
+# Where fetched trees are placed in the build context.
+REMOTE_ROOT = ".kustomize_remote"
+
+_SCHEMES = ("https://", "http://", "ssh://", "file://", "git@")
+_SSH_SCHEMES = ("ssh://", "git@")
+# Passed through so that ssh remotes can authenticate with the user's keys and agent.
+_SSH_ENV = ["HOME", "SSH_AUTH_SOCK"]
+
+
+@dataclass(frozen=True)
+class RemoteReference:
+    """A pinned remote base: a git repository, a ref in it, and a directory at that ref."""
+
+    repository: str
+    ref: str
+    subdirectory: str = ""
+
+    @property
+    def key(self) -> str:
+        return hashlib.sha256(f"{self.repository}\0{self.ref}".encode()).hexdigest()[:24]
+
+    @property
+    def directory(self) -> str:
+        """The path of `subdirectory` in the build context once fetched."""
+        return os.path.join(REMOTE_ROOT, self.key, *filter(None, [self.subdirectory]))
+
+
+def parse_remote_reference(value: str) -> RemoteReference | None:
+    """Parses a kustomize remote resource, returning None for local or unpinned resources.
+
+    Supports the forms accepted by kustomize, e.g.:
+
+    * `github.com/org/repo/path?ref=v1`
+    * `https://github.com/org/repo//path?ref=v1`
+    * `git@github.com:org/repo.git//path?ref=v1`
+    * `file:///srv/repo//path?version=v1`
+    """
+    url, separator, query = value.partition("?")
+    if not separator:
+        return None
+
+    params = parse_qs(query)
+    ref = (params.get("ref") or params.get("version") or [None])[0]
+    if not ref:
+        return None
+
+    if url.startswith("git::"):
+        url = url[len("git::") :]
+
+    scheme = next((scheme for scheme in _SCHEMES if url.startswith(scheme)), None)
+    rest = url[len(scheme) :] if scheme else url
+
+    if "//" in rest:
+        repository, _, subdirectory = rest.partition("//")
+    elif ".git/" in rest:
+        repository, _, subdirectory = rest.partition(".git/")
+        repository += ".git"
+    else:
+        parts = rest.split("/")
+        if scheme in ("file://", "git@") or len(parts) < 3:
+            repository, subdirectory = rest, ""
+        else:
+            # `host/org/repo/path`, as used for GitHub and GitLab.
+            repository, subdirectory = "/".join(parts[:3]), "/".join(parts[3:])
+
+    if scheme is None:
+        # Local paths, e.g. `../base?ref=v1`, can't be hosts, even though `..` contains a dot.
+        if url.startswith((".", "/")) or "." not in repository.split("/")[0]:
+            return None
+        scheme = "https://"
+
+    return RemoteReference(f"{scheme}{repository}", ref, subdirectory.strip("/"))
+
+
+@dataclass(frozen=True)
+class FetchedRemote:
+    """The files of a remote reference, at `reference.directory` in `digest`."""
+
+    reference: RemoteReference
+    digest: Digest
+
+
+@rule
+async def fetch_remote(
+    reference: RemoteReference,
+    bash: BashBinary,
+    system_binaries_subsystem: SystemBinariesSubsystem.EnvironmentAware,
+) -> FetchedRemote:
+    output_directory = os.path.join(REMOTE_ROOT, reference.key)
+    mirror = os.path.join(
+        _CACHE_PATH, hashlib.sha256(reference.repository.encode()).hexdigest()[:24]
+    )
+
+    script = dedent("""\
+        set -euo pipefail
+        if [ ! -d "$MIRROR" ]; then
+            rm -rf "$MIRROR.$$"
+            git clone --quiet --mirror "$REPOSITORY" "$MIRROR.$$"
+            # Another process may have created the mirror meanwhile, in which case `mv` moves the
+            # clone into it rather than replacing it; `mv -T` would avoid that, but is GNU only.
+            if [ -d "$MIRROR" ]; then
+                rm -rf "$MIRROR.$$"
+            else
+                mv "$MIRROR.$$" "$MIRROR"
+                rm -rf "$MIRROR/${MIRROR##*/}.$$"
+            fi
+        fi
+        if ! git --git-dir="$MIRROR" rev-parse --verify --quiet "$REF^{commit}" >/dev/null; then
+            git --git-dir="$MIRROR" fetch --quiet --prune origin '+refs/*:refs/*'
+        fi
+        mkdir -p "$OUTPUT"
+        git --git-dir="$MIRROR" archive --format=tar "$REF" ${SUBDIRECTORY:+"$SUBDIRECTORY"} \\
+            | tar -x -C "$OUTPUT"
+        """)
+
+    is_ssh = reference.repository.startswith(_SSH_SCHEMES)
+    shims, script_digest, ssh_env = await MultiGet(
+        Get(
+            BinaryShims,
+            BinaryShimsRequest,
+            BinaryShimsRequest.for_binaries(
+                *_TOOLS,
+                *(["ssh"] if is_ssh else []),
+                rationale="fetch remote Kustomize bases",
+                search_path=system_binaries_subsystem.system_binary_paths,
+            ),
+        ),
+        Get(Digest, CreateDigest([FileContent("fetch.sh", script.encode())])),
+        Get(EnvironmentVars, EnvironmentVarsRequest(_SSH_ENV if is_ssh else [])),
+    )
+
+    result = await Get(
+        ProcessResult,
+        Process(
+            (bash.path, "fetch.sh"),
+            description=f"Fetching {reference.repository}@{reference.ref}",
+            input_digest=script_digest,
+            immutable_input_digests=shims.immutable_input_digests,
+            env={
+                "PATH": shims.path_component,
+                "MIRROR": mirror,
+                "REPOSITORY": reference.repository,
+                "REF": reference.ref,
+                "SUBDIRECTORY": reference.subdirectory,
+                "OUTPUT": output_directory,
+                **ssh_env,
+            },
+            append_only_caches=FrozenDict({_CACHE_NAME: _CACHE_PATH}),
+            output_directories=(output_directory,),
+        ),
+    )
+
+    return FetchedRemote(reference, result.output_digest)
+
+
+def rules():
+    return collect_rules()
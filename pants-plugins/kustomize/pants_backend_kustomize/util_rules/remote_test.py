@@ -0,0 +1,80 @@
+import shutil
+import subprocess
+
+import pytest
+from pants.core.util_rules import system_binaries
+from pants.engine.fs import Digest, Snapshot
+from pants.testutil.rule_runner import QueryRule, RuleRunner
+
+from pants_backend_kustomize.util_rules import remote
+from pants_backend_kustomize.util_rules.remote import (
+    FetchedRemote,
+    RemoteReference,
+    parse_remote_reference,
+)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    (
+        (
+            "github.com/org/repo/deploy/base?ref=v1",
+            RemoteReference("https://github.com/org/repo", "v1", "deploy/base"),
+        ),
+        (
+            "https://github.com/org/repo//deploy?ref=v1&timeout=30",
+            RemoteReference("https://github.com/org/repo", "v1", "deploy"),
+        ),
+        (
+            "git@github.com:org/repo.git//deploy?ref=abc123",
+            RemoteReference("git@github.com:org/repo.git", "abc123", "deploy"),
+        ),
+        ("file:///srv/repo?version=v2", RemoteReference("file:///srv/repo", "v2", "")),
+        ("github.com/org/repo/deploy", None),
+        ("../base", None),
+        ("base?ref=v1", None),
+        ("../base?ref=v1", None),
+        ("./overlays/prod?ref=v1", None),
+        ("/srv/base?ref=v1", None),
+    ),
+)
+def test_parse_remote_reference(value, expected) -> None:
+    assert parse_remote_reference(value) == expected
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="requires git")
+def test_fetch_remote_from_local_repository(tmp_path) -> None:
+    repository = tmp_path / "repository"
+    (repository / "deploy").mkdir(parents=True)
+    (repository / "deploy" / "kustomization.yaml").write_text("resources: []\n")
+    (repository / "README.md").write_text("not fetched\n")
+
+    def git(*args: str) -> None:
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+            cwd=repository,
+            check=True,
+            capture_output=True,
+        )
+
+    git("init", "-q")
+    git("add", ".")
+    git("commit", "-q", "-m", "initial")
+    git("tag", "v1")
+
+    rule_runner = RuleRunner(
+        rules=[
+            *remote.rules(),
+            *system_binaries.rules(),
+            QueryRule(FetchedRemote, [RemoteReference]),
+            QueryRule(Snapshot, [Digest]),
+        ],
+    )
+    rule_runner.set_options([], env_inherit={"PATH"})
+
+    fetched = rule_runner.request(
+        FetchedRemote, [RemoteReference(f"file://{repository}", "v1", "deploy")]
+    )
+    snapshot = rule_runner.request(Snapshot, [fetched.digest])
+
+    assert snapshot.files == (f"{fetched.reference.directory}/kustomization.yaml",)
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import os
+import shlex
+from dataclasses import dataclass
+
+from pants.core.util_rules.external_tool import DownloadedExternalTool, ExternalToolRequest
+from pants.core.util_rules.system_binaries import (
+    BashBinary,
+    BinaryShims,
+    BinaryShimsRequest,
+    SystemBinariesSubsystem,
+)
+from pants.engine.addresses import Address
+from pants.engine.fs import AddPrefix, Digest, MergeDigests
+from pants.engine.platform import Platform
+from pants.engine.process import Process, ProcessResult
+from pants.engine.rules import Get, MultiGet, collect_rules, rule
+from pants.engine.target import (
+    AllTargets,
+    DependenciesRequest,
+    SourcesPaths,
+    SourcesPathsRequest,
+    Target,
+    Targets,
+)
+
+from pants_backend_kustomize.subsystem import KustomizeTool
+from pants_backend_kustomize.target_types import (
+    KustomizeDependenciesField,
+    KustomizeRemoteTarget,
+    KustomizeSourcesField,
+)
+from pants_backend_kustomize.util_rules.inject import KUSTOMIZATION_FILE_NAMES
+from pants_backend_kustomize.util_rules.prepare_context import (
+    KustomizationContext,
+    KustomizationContextRequest,
+    RenderedKustomization,
+    RenderKustomizationRequest,
+    rendered_path,
+)
+
+# The stderr of `kustomize build` for each member of a batch.
+BATCH_ERROR_FILE = ".kustomize-error.log"
+
+
+@dataclass(frozen=True)
+class GitRequest:
+    pass
+
+
+@dataclass(frozen=True)
+class KustomizePartitionRequest:
+    address: Address
+
+
+@dataclass(frozen=True)
+class KustomizePartition:
+    """The `kustomize` targets rendered in the same process as the requested one."""
+
+    targets: tuple[Target, ...]
+
+    def index(self, address: Address) -> int:
+        return next(i for i, target in enumerate(self.targets) if target.address == address)
+
+
+@dataclass(frozen=True)
+class RenderKustomizationBatchRequest:
+    targets: tuple[Target, ...]
+
+
+@dataclass(frozen=True)
+class RenderedKustomizationBatch:
+    """The output of each target, under a directory named after its index in the request.
+
+    The errors of each target are in a `BATCH_ERROR_FILE` next to its output, which is missing if it
+    failed to render.
+    """
+
+    digest: Digest
+
+
+@rule
+async def get_binary_shims(
+    _: GitRequest, system_binaries_subsystem: SystemBinariesSubsystem.EnvironmentAware
+) -> BinaryShims:
+    kwargs = dict(
+        rationale="asdqwe",
+        search_path=system_binaries_subsystem.system_binary_paths,
+    )
+
+    binary_shims = BinaryShimsRequest.for_binaries(
+        "git",
+        **kwargs,
+    )
+
+    return await Get(BinaryShims, BinaryShimsRequest, binary_shims)
+
+
+@rule
+async def render_kustomization(
+    request: RenderKustomizationRequest,
+    kustomize: KustomizeTool,
+    platform: Platform,
+) -> RenderedKustomization:
+    context, kustomize, git = await MultiGet(
+        Get(KustomizationContext, KustomizationContextRequest(request.target)),
+        Get(
+            DownloadedExternalTool,
+            ExternalToolRequest,
+            kustomize.get_request(platform),
+        ),
+        Get(BinaryShims, GitRequest()),
+    )
+
+    merged_digest = await Get(
+        Digest,
+        MergeDigests(
+            [context.digest, kustomize.digest],
+        ),
+    )
+
+    root_dir = request.target.address.spec_path
+    output_files = rendered_path(request.target)
+
+    result = await Get(
+        ProcessResult,
+        Process(
+            (
+                kustomize.exe,
+                "build",
+                "--load-restrictor",
+                "LoadRestrictionsNone",
+                "-o",
+                output_files,
+                root_dir,
+            ),
+            env={"PATH": git.path_component},
+            input_digest=merged_digest,
+            immutable_input_digests=git.immutable_input_digests,
+            description=f"Generating Kustomize sources from {request.target.address}.",
+            output_files=(output_files,),
+        ),
+    )
+
+    return RenderedKustomization(result.output_digest, output_files)
+
+
+def _is_batchable(target: Target, dependencies: Targets, sources: SourcesPaths) -> bool:
+    # Other dependencies are built, and may be published, while preparing the context, which must
+    # not happen for a target only because it shares a batch with the requested one.
+    if not all(isinstance(dependency, KustomizeRemoteTarget) for dependency in dependencies):
+        return False
+
+    spec_path = target.address.spec_path
+    return any(os.path.join(spec_path, name) in sources.files for name in KUSTOMIZATION_FILE_NAMES)
+
+
+@rule
+async def partition_kustomizations(
+    request: KustomizePartitionRequest, all_targets: AllTargets, kustomize: KustomizeTool
+) -> KustomizePartition:
+    # Partitions are chunks of the batchable targets of a directory in address order, so they are
+    # the same for every member, and adding or removing a target only changes the partitions of its
+    # own directory. Targets whose context needs anything but their sources and remote bases are
+    # rendered on their own.
+    siblings = sorted(
+        (
+            target
+            for target in all_targets
+            if target.has_field(KustomizeSourcesField)
+            and target.address.spec_path == request.address.spec_path
+        ),
+        key=lambda target: target.address,
+    )
+    dependencies = await MultiGet(
+        Get(Targets, DependenciesRequest(target[KustomizeDependenciesField])) for target in siblings
+    )
+    sources = await MultiGet(
+        Get(SourcesPaths, SourcesPathsRequest(target[KustomizeSourcesField])) for target in siblings
+    )
+    targets = [
+        target
+        for target, target_dependencies, target_sources in zip(siblings, dependencies, sources)
+        if _is_batchable(target, target_dependencies, target_sources)
+    ]
+
+    index = next((i for i, target in enumerate(targets) if target.address == request.address), None)
+    if index is None:
+        return KustomizePartition(
+            tuple(target for target in siblings if target.address == request.address)
+        )
+
+    start = index - index % kustomize.batch_size
+    return KustomizePartition(tuple(targets[start : start + kustomize.batch_size]))
+
+
+@rule
+async def render_kustomization_batch(
+    request: RenderKustomizationBatchRequest,
+    kustomize: KustomizeTool,
+    platform: Platform,
+    bash: BashBinary,
+) -> RenderedKustomizationBatch:
+    contexts = await MultiGet(
+        Get(KustomizationContext, KustomizationContextRequest(target)) for target in request.targets
+    )
+    tool, git, *prefixed = await MultiGet(
+        Get(
+            DownloadedExternalTool,
+            ExternalToolRequest,
+            kustomize.get_request(platform),
+        ),
+        Get(BinaryShims, GitRequest()),
+        # Each target gets its own directory, so contexts that patch the same files differently
+        # do not collide.
+        *(Get(Digest, AddPrefix(context.digest, str(i))) for i, context in enumerate(contexts)),
+    )
+
+    merged_digest = await Get(Digest, MergeDigests([tool.digest, *prefixed]))
+
+    # The errors of each target are kept in its directory rather than failing the others.
+    commands = []
+    output_files = []
+    for i, target in enumerate(request.targets):
+        output_file = os.path.join(str(i), rendered_path(target))
+        error_file = os.path.join(str(i), BATCH_ERROR_FILE)
+        root_dir = os.path.join(str(i), target.address.spec_path)
+        output_files.extend((output_file, error_file))
+        build = " ".join(
+            shlex.quote(arg)
+            for arg in (
+                tool.exe,
+                "build",
+                "--load-restrictor",
+                "LoadRestrictionsNone",
+                "-o",
+                output_file,
+                root_dir,
+            )
+        )
+        commands.append(f"{build} 2> {shlex.quote(error_file)}")
+
+    result = await Get(
+        ProcessResult,
+        Process(
+            (bash.path, "-c", "; ".join([*commands, "true"])),
+            env={"PATH": git.path_component},
+            input_digest=merged_digest,
+            immutable_input_digests=git.immutable_input_digests,
+            description=f"Generating Kustomize sources for {len(request.targets)} targets.",
+            output_files=tuple(output_files),
+        ),
+    )
+
+    return RenderedKustomizationBatch(result.output_digest)
+
+
+def rules():
+    return collect_rules()
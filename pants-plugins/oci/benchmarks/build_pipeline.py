@@ -0,0 +1,326 @@
+"""
+Benchmarks for the OCI build pipeline.
+
+Generates synthetic `oci_image_build` graphs in a `RuleRunner` and measures each phase of building
+them. Every case gets a fresh nonce mixed into its file contents, so no phase is served from the
+process cache of an earlier case or run, while downloaded tools are shared through the store.
+
+The graph for a case looks like:
+
+* `files` targets with synthetic content, one per layer
+* an `oci_image_build` on top of `//:empty` per layer, containing those files
+* an `oci_extract` per layer, producing a `.tar` or `.tar.gz` layer artifact
+* a final `oci_image_build` adding all layer artifacts to `//:empty`
+
+The phases are `layers` (packaging the `oci_extract` artifacts), `image` (building the final image)
+and `package` (copying the image with `skopeo` into a local OCI layout, which stands in for pushing
+to a registry). Everything runs offline once `umoci` and `skopeo` have been downloaded.
+
+Run with `pants run pants-plugins/oci/benchmarks:build_pipeline -- --output baseline.json`, and
+compare a later run with `--baseline baseline.json`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from textwrap import dedent
+from typing import Any, Callable
+
+from pants.core.goals.package import BuiltPackage
+from pants.core.register import rules as core_rules
+from pants.core.target_types import FilesGeneratorTarget, FileTarget
+from pants.core.util_rules import adhoc_binaries, external_tool, source_files, system_binaries
+from pants.core.util_rules.external_tool import DownloadedExternalTool, ExternalToolRequest
+from pants.engine import process
+from pants.engine.addresses import Address
+from pants.engine.internals import graph
+from pants.engine.platform import Platform
+from pants.testutil.rule_runner import QueryRule, RuleRunner
+
+from pants_backend_oci import register
+from pants_backend_oci.goals.package import ImageFieldSet
+from pants_backend_oci.goals.package_build_step import ImageExtractPackageFieldSet
+from pants_backend_oci.subsystem import SkopeoTool, UmociTool
+from pants_backend_oci.util_rules.build_image_bundle import BuildImageBundleRequest
+from pants_backend_oci.util_rules.image_bundle import FallibleImageBundle
+
+PHASES = ("layers", "image", "package")
+# Metrics where a higher value in the current run than in the baseline is a regression.
+COMPARED_METRICS = ("wall_seconds", "processes", "store_bytes")
+
+
+@dataclass(frozen=True)
+class Case:
+    layers: int
+    files: int
+    distribution: str
+    compressed: bool
+
+    @property
+    def name(self) -> str:
+        compression = "gz" if self.compressed else "tar"
+        return f"layers={self.layers},files={self.files},sizes={self.distribution},{compression}"
+
+
+@dataclass(frozen=True)
+class PhaseResult:
+    wall_seconds: float
+    processes: int
+    cached_processes: int
+    store_bytes: int
+    peak_rss_kib: int
+    peak_child_rss_kib: int
+
+
+def _file_sizes(distribution: str, count: int, rng: random.Random) -> list[int]:
+    if distribution == "uniform":
+        return [4096] * count
+
+    if distribution == "skewed":
+        # Mostly small files with a long tail of large ones, similar to a typical application image.
+        return [min(int(rng.lognormvariate(8, 2)), 64 * 1024 * 1024) for _ in range(count)]
+
+    raise ValueError(f"Unknown size distribution: {distribution}")
+
+
+def _write_case(rule_runner: RuleRunner, case: Case, nonce: str) -> None:
+    rng = random.Random(case.name)
+    files: dict[str, str | bytes] = {"BUILD": 'oci_image_empty(name="empty")\n'}
+    layers = []
+    files_per_layer = max(case.files // case.layers, 1)
+    suffix = "tar.gz" if case.compressed else "tar"
+
+    for layer in range(case.layers):
+        sizes = _file_sizes(case.distribution, files_per_layer, rng)
+        for index, size in enumerate(sizes):
+            files[f"bench/l{layer}/f{index}.bin"] = nonce.encode("utf-8") + rng.randbytes(size)
+
+        files[f"bench/l{layer}/BUILD"] = dedent(f"""\
+            files(name="files", sources=["*.bin"])
+
+            oci_image_build(
+                name="src",
+                base=["//:empty"],
+                packages=[":files"],
+            )
+
+            oci_extract(
+                name="layer",
+                base=[":src"],
+                outputs=["bench/l{layer}"],
+                output_path="layers/l{layer}.{suffix}",
+            )
+            """)
+        layers.append(f'"//bench/l{layer}:layer"')
+
+    files["bench/BUILD"] = dedent(f"""\
+        oci_image_build(
+            name="image",
+            base=["//:empty"],
+            repository="localhost/bench",
+            tag="latest",
+            packages=[{", ".join(layers)}],
+        )
+        """)
+
+    rule_runner.write_files(files)
+
+
+def _directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except FileNotFoundError:
+                pass
+    return total
+
+
+def _measure(rule_runner: RuleRunner, store_dir: str, run: Callable[[], Any]) -> PhaseResult:
+    metrics_before = rule_runner.scheduler.metrics()
+    store_before = _directory_size(store_dir)
+
+    start = time.perf_counter()
+    run()
+    wall_seconds = time.perf_counter() - start
+
+    metrics_after = rule_runner.scheduler.metrics()
+
+    def delta(name: str) -> int:
+        return metrics_after.get(name, 0) - metrics_before.get(name, 0)
+
+    return PhaseResult(
+        wall_seconds=round(wall_seconds, 3),
+        processes=delta("local_execution_requests"),
+        cached_processes=delta("local_cache_requests_cached"),
+        store_bytes=_directory_size(store_dir) - store_before,
+        # `ru_maxrss` is a high-water mark, so this is the peak up to and including this phase.
+        peak_rss_kib=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        peak_child_rss_kib=resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+
+
+def _make_rule_runner(store_dir: str, options: list[str]) -> RuleRunner:
+    rule_runner = RuleRunner(
+        target_types=[*register.target_types(), FileTarget, FilesGeneratorTarget],
+        rules=[
+            *core_rules(),
+            *adhoc_binaries.rules(),
+            *external_tool.rules(),
+            *graph.rules(),
+            *process.rules(),
+            *source_files.rules(),
+            *system_binaries.rules(),
+            *register.rules(),
+            QueryRule(DownloadedExternalTool, [ExternalToolRequest]),
+            QueryRule(UmociTool, []),
+            QueryRule(SkopeoTool, []),
+            QueryRule(BuiltPackage, [ImageExtractPackageFieldSet]),
+            QueryRule(BuiltPackage, [ImageFieldSet]),
+            QueryRule(FallibleImageBundle, [BuildImageBundleRequest]),
+        ],
+        bootstrap_args=[f"--local-store-dir={store_dir}"],
+    )
+    rule_runner.set_options(options, env_inherit={"PATH", "HOME"})
+    return rule_runner
+
+
+def run_case(rule_runner: RuleRunner, store_dir: str, case: Case, nonce: str) -> dict[str, PhaseResult]:
+    _write_case(rule_runner, case, nonce)
+
+    extract_targets = [
+        rule_runner.get_target(Address(f"bench/l{layer}", target_name="layer"))
+        for layer in range(case.layers)
+    ]
+    image_target = rule_runner.get_target(Address("bench", target_name="image"))
+
+    results = {}
+    results["layers"] = _measure(
+        rule_runner,
+        store_dir,
+        lambda: [
+            rule_runner.request(BuiltPackage, [ImageExtractPackageFieldSet.create(target)])
+            for target in extract_targets
+        ],
+    )
+
+    def build_image() -> None:
+        result = rule_runner.request(
+            FallibleImageBundle,
+            [BuildImageBundleRequest(BuildImageBundleRequest.field_set_type.create(image_target))],
+        )
+        if result.output is None:
+            raise Exception(f"Building {case.name} failed:\n{result.stderr}")
+
+    results["image"] = _measure(rule_runner, store_dir, build_image)
+    results["package"] = _measure(
+        rule_runner,
+        store_dir,
+        lambda: rule_runner.request(BuiltPackage, [ImageFieldSet.create(image_target)]),
+    )
+
+    return results
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, phases in current["cases"].items():
+        baseline_phases = baseline["cases"].get(name)
+        if baseline_phases is None:
+            continue
+
+        for phase, metrics in phases.items():
+            baseline_metrics = baseline_phases.get(phase, {})
+            for metric in COMPARED_METRICS:
+                before = baseline_metrics.get(metric)
+                after = metrics[metric]
+                if before is None or after <= before * (1 + tolerance):
+                    continue
+                regressions.append(f"{name} {phase} {metric}: {before} -> {after}")
+
+    return regressions
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--layers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--files", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--distribution", nargs="+", default=["uniform", "skewed"])
+    parser.add_argument("--compressed", choices=["yes", "no", "both"], default="both")
+    parser.add_argument("--output", help="Where to write the results as JSON.")
+    parser.add_argument("--baseline", help="A previous `--output` to compare against.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Relative increase over the baseline that is reported as a regression.",
+    )
+    parser.add_argument(
+        "--option",
+        action="append",
+        default=[],
+        help="Extra Pants options, e.g. `--oci-uid-map=0:1000:1`. May be repeated.",
+    )
+    args = parser.parse_args(argv)
+
+    compressed = {"yes": [True], "no": [False], "both": [False, True]}[args.compressed]
+    cases = [
+        Case(layers, files, distribution, is_compressed)
+        for layers, files, distribution, is_compressed in itertools.product(
+            args.layers, args.files, args.distribution, compressed
+        )
+    ]
+
+    store_dir = os.environ.get("PANTS_OCI_BENCH_STORE") or tempfile.mkdtemp(prefix="oci-bench-store-")
+    results: dict[str, Any] = {
+        "meta": {"platform": Platform.create_for_localhost().value, "python": sys.version.split()[0]},
+        "cases": {},
+    }
+
+    for case in cases:
+        rule_runner = _make_rule_runner(store_dir, args.option)
+
+        # Downloading tools is not part of what we measure.
+        platform = Platform.create_for_localhost()
+        for tool in (rule_runner.request(UmociTool, []), rule_runner.request(SkopeoTool, [])):
+            rule_runner.request(DownloadedExternalTool, [tool.get_request(platform)])
+
+        phases = run_case(rule_runner, store_dir, case, uuid.uuid4().hex)
+        results["cases"][case.name] = {"params": asdict(case)}
+        results["cases"][case.name].update({phase: asdict(phases[phase]) for phase in PHASES})
+        print(json.dumps({case.name: results["cases"][case.name]}), file=sys.stderr)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+    else:
+        print(json.dumps(results, indent=2, sort_keys=True))
+
+    if args.baseline:
+        for case in results["cases"].values():
+            case.pop("params")
+        baseline = json.loads(Path(args.baseline).read_text())
+        for case in baseline["cases"].values():
+            case.pop("params", None)
+
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
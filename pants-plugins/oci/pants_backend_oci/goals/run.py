@@ -2,32 +2,71 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import shlex
 from dataclasses import dataclass
 from textwrap import dedent
 
 from pants.core.goals.repl import ReplImplementation, ReplRequest
 from pants.core.goals.run import RunFieldSet, RunInSandboxBehavior, RunRequest
 from pants.core.util_rules.external_tool import DownloadedExternalTool, ExternalToolRequest
-from pants.core.util_rules.system_binaries import BinaryShims, MkdirBinary, MvBinary
+from pants.core.util_rules.system_binaries import BashBinary, BinaryShims, MkdirBinary, MvBinary
 from pants.engine.fs import CreateDigest, Digest, Directory, FileContent, MergeDigests
 from pants.engine.platform import Platform
 from pants.engine.process import Process
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
 from pants.engine.target import Target, WrappedTarget, WrappedTargetRequest
 from pants.engine.unions import UnionRule
+from pants.util.frozendict import FrozenDict
 
-from pants_backend_oci.subsystem import OciSubsystem, RuncTool
+from pants_backend_oci.subsystem import OciSubsystem, RuncTool, UmociTool
 from pants_backend_oci.target_types import ImageRepository, ImageRunTty
 from pants_backend_oci.tools.process import FusedProcess
-from pants_backend_oci.util_rules.configure import SetCmdProcessRequest
+from pants_backend_oci.util_rules.configure import (
+    ImageConfig,
+    ImageConfigRequest,
+    SetCmdProcessRequest,
+)
 from pants_backend_oci.util_rules.image_bundle import (
     FallibleImageBundle,
     FallibleImageBundleRequest,
     FallibleImageBundleRequestWrap,
+    ImageBundle,
     ImageBundleRequest,
 )
 from pants_backend_oci.util_rules.tools import RuncToolsRequest
-from pants_backend_oci.util_rules.unpack import UnpackedImageBundleRequest
+from pants_backend_oci.util_rules.unpack import UnpackedImageBundleRequest, unpack_argv
+
+_CAPABILITIES_FILTER = """
+    [
+        "CAP_AUDIT_WRITE",
+        "CAP_CHOWN",
+        "CAP_DAC_OVERRIDE",
+        "CAP_FOWNER",
+        "CAP_FSETID",
+        "CAP_KILL",
+        "CAP_MKNOD",
+        "CAP_NET_BIND_SERVICE",
+        "CAP_NET_RAW",
+        "CAP_SETFCAP",
+        "CAP_SETGID",
+        "CAP_SETPCAP",
+        "CAP_SETUID",
+        "CAP_SYS_CHROOT"
+    ] as $caps |
+    .process.capabilities.effective = $caps |
+    .process.capabilities.inheritable = $caps |
+    .process.capabilities.permitted = $caps |
+    .process.capabilities.bounding = $caps |
+    .process.capabilities.ambient = $caps
+"""
+
+_RUN_CACHE_NAME = "oci_run_bundles"
+_RUN_CACHE_PATH = ".oci_run_bundles"
+_RUN_IMAGE_PATH = ".oci_image"
+# Bump when the layout or preparation of cached bundles changes.
+_RUN_CACHE_VERSION = 1
 
 
 @dataclass(frozen=True)
@@ -46,6 +85,14 @@ class RunImageBundleProcessRequest:
     interactive: bool = False
 
 
+@dataclass(frozen=True)
+class CachedRunBundleRequest:
+    image: ImageBundle
+    container: str
+    terminal: bool
+    interactive: bool
+
+
 @rule
 async def prepare_run_image_bundle(
     request: RunImageBundleProcessRequest,
@@ -77,47 +124,35 @@ async def prepare_run_image_bundle(
     if image.exit_code != 0:
         raise ValueError(image.stderr)
 
+    name = str(request.target.address).replace("/", "_").replace(":", "_").replace("#", "_")
+    container = f"pants.runc.{name}"
+    terminal = request.target.get(ImageRunTty).value
+    if request.interactive:
+        terminal = True
+
+    if oci.cache_run_bundles:
+        return await Get(
+            Process,
+            CachedRunBundleRequest(
+                image.output, container=container, terminal=terminal, interactive=request.interactive
+            ),
+        )
+
     packed_image_process, set_cmd_process = await MultiGet(
         Get(Process, UnpackedImageBundleRequest(image.output.digest)),
         Get(Process, SetCmdProcessRequest()),
     )
 
-    name = str(request.target.address).replace("/", "_").replace(":", "_").replace("#", "_")
     components = [
         dedent(f"""
         ROOT=`pwd`
         cat $ROOT/unpacked_image/config.json | jq '
-                    .process.terminal = false |
-                    [
-                        "CAP_AUDIT_WRITE",
-                        "CAP_CHOWN",
-                        "CAP_DAC_OVERRIDE",
-                        "CAP_FOWNER",
-                        "CAP_FSETID",
-                        "CAP_KILL",
-                        "CAP_MKNOD",
-                        "CAP_NET_BIND_SERVICE",
-                        "CAP_NET_RAW",
-                        "CAP_SETFCAP",
-                        "CAP_SETGID",
-                        "CAP_SETPCAP",
-                        "CAP_SETUID",
-                        "CAP_SYS_CHROOT"
-                    ] as $caps |
-                    .process.capabilities.effective = $caps |
-                    .process.capabilities.inheritable = $caps |
-                    .process.capabilities.permitted = $caps |
-                    .process.capabilities.bounding = $caps |
-                    .process.capabilities.ambient = $caps
+                    .process.terminal = false | {_CAPABILITIES_FILTER}
                 ' > "$ROOT/unpacked_image/config.json.tmp"
             {mv.path} "$ROOT/unpacked_image/config.json.tmp" "$ROOT/unpacked_image/config.json"
             """)
     ]
 
-    terminal = request.target.get(ImageRunTty).value
-    if request.interactive:
-        terminal = True
-
     components.append(
         dedent(f"""
                 jq '
@@ -129,7 +164,6 @@ async def prepare_run_image_bundle(
 
     rootless = "true" if oci.rootless else "false"
     suffix = "" if request.interactive else " 0<&-"
-    container = f"pants.runc.{name}"
     components.append(
         dedent(f"""
             `pwd`/{tool.exe} --root runspace --rootless {rootless} run -b unpacked_image {container}{suffix}
@@ -161,6 +195,95 @@ async def prepare_run_image_bundle(
     )
 
 
+@rule
+async def prepare_cached_run_image_bundle(
+    request: CachedRunBundleRequest,
+    runc: RuncTool,
+    umoci: UmociTool,
+    oci: OciSubsystem,
+    platform: Platform,
+    bash: BashBinary,
+) -> Process:
+    runc_tool, umoci_tool, rundir, shims, image_config = await MultiGet(
+        Get(DownloadedExternalTool, ExternalToolRequest, runc.get_request(platform)),
+        Get(DownloadedExternalTool, ExternalToolRequest, umoci.get_request(platform)),
+        Get(Digest, CreateDigest([Directory("runspace")])),
+        Get(BinaryShims, RuncToolsRequest()),
+        Get(ImageConfig, ImageConfigRequest(request.image.digest)),
+    )
+
+    # Everything that affects the prepared bundle has to be part of its key.
+    key = hashlib.sha256(
+        json.dumps(
+            [
+                _RUN_CACHE_VERSION,
+                request.image.image_sha,
+                request.terminal,
+                oci.rootless,
+                oci.uid_map,
+                oci.gid_map,
+            ]
+        ).encode("utf-8")
+    ).hexdigest()
+
+    unpack = (
+        " ".join(shlex.quote(arg) for arg in unpack_argv("__UMOCI__", umoci, oci, "__IMAGE__", "__DEST__"))
+        .replace("__UMOCI__", f'"$ROOT/{umoci_tool.exe}"')
+        .replace("__IMAGE__", '"$STAGING.layout:build"')
+        .replace("__DEST__", '"$STAGING"')
+    )
+
+    rootless = "true" if oci.rootless else "false"
+    suffix = "" if request.interactive else " 0<&-"
+    script = dedent(f"""
+        ROOT=`pwd`
+        BUNDLE="$ROOT/{_RUN_CACHE_PATH}/{key}"
+
+        if [ ! -f "$BUNDLE/config.json" ]; then
+            STAGING="$BUNDLE.$$"
+            rm -rf "$STAGING" "$STAGING.layout"
+            cp -rL "$ROOT/{_RUN_IMAGE_PATH}/build" "$STAGING.layout"
+            {unpack} || exit 1
+            rm -rf "$STAGING.layout"
+            jq '
+                .process.terminal = {'true' if request.terminal else "false"} | {_CAPABILITIES_FILTER}
+            ' "$STAGING/config.json" > "$STAGING/config.json.tmp"
+            mv "$STAGING/config.json.tmp" "$STAGING/config.json"
+            # Another run may have prepared the same bundle concurrently, in which case we keep theirs.
+            mv -T "$STAGING" "$BUNDLE" 2>/dev/null || rm -rf "$STAGING"
+        fi
+
+        mkdir -p "$ROOT/unpacked_image"
+        jq --arg rootfs "$BUNDLE/rootfs" \\
+            --argjson entrypoint {shlex.quote(json.dumps(image_config.entrypoint))} '
+            .root.path = $rootfs
+            | if ($ARGS.positional | length) > 0
+              then .process.args = $entrypoint + $ARGS.positional
+              else .
+              end
+        ' "$BUNDLE/config.json" --args "$@" > "$ROOT/unpacked_image/config.json"
+
+        $ROOT/{runc_tool.exe} --root runspace --rootless {rootless} \\
+            run -b unpacked_image {request.container}{suffix}
+        """)
+    script_digest = await Get(Digest, CreateDigest([FileContent("run.sh", script.encode("utf-8"))]))
+
+    input_digest = await Get(
+        Digest, MergeDigests((rundir, runc_tool.digest, umoci_tool.digest, script_digest))
+    )
+
+    return Process(
+        (bash.path, "{chroot}/run.sh"),
+        description=f"Running {request.container}",
+        input_digest=input_digest,
+        immutable_input_digests=FrozenDict(
+            {**shims.immutable_input_digests, _RUN_IMAGE_PATH: request.image.digest}
+        ),
+        append_only_caches=FrozenDict({_RUN_CACHE_NAME: _RUN_CACHE_PATH}),
+        env={"PATH": shims.path_component, "XDG_RUNTIME_DIR": "{chroot}/tmp"},
+    )
+
+
 @rule
 async def run_oci_command_target(request: RunImageBundleCommand) -> RunRequest:
     wrapped_target = await Get(
@@ -174,6 +297,7 @@ async def run_oci_command_target(request: RunImageBundleCommand) -> RunRequest:
         args=process.argv,
         extra_env=process.env,
         immutable_input_digests=process.immutable_input_digests,
+        append_only_caches=process.append_only_caches,
     )
 
 
@@ -189,6 +313,7 @@ async def run_oci_command_repl(request: OciRepl) -> ReplRequest:
         args=process.argv,
         extra_env=process.env,
         immutable_input_digests=process.immutable_input_digests,
+        append_only_caches=process.append_only_caches,
     )
 
 
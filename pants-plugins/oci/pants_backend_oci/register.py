@@ -11,6 +11,12 @@ from pants_backend_oci import (
 from pants_backend_oci.rules import kustomize_inject
 from pants_backend_oci.tools import process
 
+try:
+    # `k8s_template` values are only provided when a `pants_backend_k8s` that has them is installed.
+    from pants_backend_oci.rules import k8s_template_value
+except ImportError:
+    k8s_template_value = None  # type: ignore[assignment]
+
 
 def target_types():
     return [
@@ -23,6 +29,7 @@ def rules():
     return [
         *collect_rules(),
         *goals.rules(),
+        *(k8s_template_value.rules() if k8s_template_value else ()),
         *kustomize_inject.rules(),
         *language_target.rules(),
         *process.rules(),
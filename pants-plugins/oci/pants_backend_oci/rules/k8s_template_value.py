@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import ClassVar
+
+from pants.engine.rules import Get, UnionRule, collect_rules, rule
+from pants.engine.target import FieldSet
+
+from pants_backend_k8s.codegen import KubernetesTemplateValue, KubernetesTemplateValueRequest
+from pants_backend_kustomize.requests import KustomizeInjectData, KustomizeInjectRequest
+from pants_backend_oci.rules.kustomize_inject import (
+    KustomizeInjectOciTagFieldSet,
+    KustomizeInjectOciTagRequest,
+)
+
+
+class KubernetesTemplateOciDigestRequest(KubernetesTemplateValueRequest):
+    field_set_type: ClassVar[type[FieldSet]] = KustomizeInjectOciTagFieldSet
+
+
+@rule(desc="Providing OCI image digest to k8s_template")
+async def provide_oci_digest_to_template(
+    request: KubernetesTemplateOciDigestRequest,
+) -> KubernetesTemplateValue:
+    # The image is built and published exactly as for kustomize injection, and shares its result.
+    data = await Get(
+        KustomizeInjectData, KustomizeInjectRequest, KustomizeInjectOciTagRequest(request.field_set)
+    )
+    return KubernetesTemplateValue(data.address, data.value)
+
+
+def rules():
+    return [
+        *collect_rules(),
+        UnionRule(KubernetesTemplateValueRequest, KubernetesTemplateOciDigestRequest),
+    ]
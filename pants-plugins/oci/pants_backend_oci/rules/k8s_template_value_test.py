@@ -0,0 +1,43 @@
+from pants.engine.addresses import Address
+from pants.engine.unions import UnionRule
+from pants.testutil.rule_runner import MockGet, run_rule_with_mocks
+
+from pants_backend_k8s.codegen import KubernetesTemplateValue, KubernetesTemplateValueRequest
+from pants_backend_kustomize.requests import KustomizeInjectData, KustomizeInjectRequest
+from pants_backend_oci.rules import k8s_template_value
+from pants_backend_oci.rules.k8s_template_value import (
+    KubernetesTemplateOciDigestRequest,
+    provide_oci_digest_to_template,
+)
+from pants_backend_oci.rules.kustomize_inject import (
+    KustomizeInjectOciTagFieldSet,
+    KustomizeInjectOciTagRequest,
+)
+from pants_backend_oci.target_types import ImageDigest, ImageRepository, ImageTag
+
+
+def test_provide_oci_digest_to_template() -> None:
+    address = Address("images", target_name="web")
+    field_set = KustomizeInjectOciTagFieldSet(
+        address,
+        repository=ImageRepository("registry/web", address),
+        tag=ImageTag("latest", address),
+        digest=ImageDigest(None, address),
+    )
+    injections = []
+
+    def inject(request: KustomizeInjectOciTagRequest) -> KustomizeInjectData:
+        injections.append(request)
+        return KustomizeInjectData(address, "sha256:abc")
+
+    value = run_rule_with_mocks(
+        provide_oci_digest_to_template,
+        rule_args=[KubernetesTemplateOciDigestRequest(field_set)],
+        mock_gets=[MockGet(KustomizeInjectData, (KustomizeInjectRequest,), inject)],
+    )
+
+    assert value == KubernetesTemplateValue(address, "sha256:abc")
+    # The image is built and published by the kustomize injection, so both share the result.
+    assert injections == [KustomizeInjectOciTagRequest(field_set)]
+    union_rule = UnionRule(KubernetesTemplateValueRequest, KubernetesTemplateOciDigestRequest)
+    assert union_rule in k8s_template_value.rules()
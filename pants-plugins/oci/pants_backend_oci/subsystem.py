@@ -2,7 +2,13 @@ from __future__ import annotations
 
 from pants.core.util_rules.external_tool import ExternalTool
 from pants.engine.platform import Platform
-from pants.option.option_types import BoolOption, StrListOption, StrOption
+from pants.option.option_types import (
+    BoolOption,
+    IntOption,
+    MemorySizeOption,
+    StrListOption,
+    StrOption,
+)
 from pants.option.subsystem import Subsystem
 from pants.util.strutil import softwrap
 
@@ -56,6 +62,47 @@ class OciSubsystem(Subsystem):
         warning."""),
     )
 
+    max_concurrent_containers = IntOption(
+        default=0,
+        advanced=True,
+        help=softwrap("""
+        The maximum number of containers that may be unpacked and run at the same time on this machine,
+        across all `oci_image_build`, `oci_build_layer` and `oci_extract` steps. `0` means no limit.
+
+        Steps that are over the limit wait for a slot before unpacking their image. Requires `flock`.
+        """),
+    )
+
+    container_disk_budget = MemorySizeOption(
+        default=0,
+        advanced=True,
+        help=softwrap("""
+        The total estimated disk space that concurrently running containers may use, e.g. `20GiB`.
+        `0` means no limit.
+
+        The disk use of a container is estimated from the size of its image layers. A step is always
+        admitted when nothing else is running, even if its image alone is larger than the budget.
+        Requires `flock`.
+        """),
+    )
+
+    cache_run_bundles = BoolOption(
+        default=False,
+        advanced=True,
+        help=softwrap("""
+        Whether `pants run` should keep unpacked images in a named cache, keyed by image digest and
+        terminal mode. When the image has not changed, running it only rewrites the process arguments
+        before starting `runc`, instead of unpacking and configuring the image again.
+
+        The cached root filesystem is shared between runs, so anything a container writes to it is
+        visible to later runs of the same image. Remove the `oci_run_bundles` named cache to reset it.
+        """),
+    )
+
+    @property
+    def governs_containers(self) -> bool:
+        return self.max_concurrent_containers > 0 or self.container_disk_budget > 0
+
 
 class UmociTool(ExternalTool):
     options_scope = "umoci"
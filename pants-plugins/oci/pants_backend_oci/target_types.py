@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-from typing import Optional
+import re
+from typing import Iterable, Optional, Union
 
 from pants.core.goals.package import OutputPathField
 from pants.engine.addresses import Address
 from pants.engine.target import (
     BoolField,
     Dependencies,
+    Field,
+    FloatField,
+    InvalidFieldException,
+    InvalidFieldTypeException,
     ScalarField,
     SpecialCasedDependencies,
     StringField,
@@ -119,13 +124,41 @@ class ImageEnvironment(StringSequenceField):
         """)
 
 
-class ImageBuildCommand(StringField):
+class ImageBuildCommand(Field):
     alias = "commands"
+    default = None
+    value: Optional[tuple[str, ...]]
 
     help = softwrap("""
-        Globs to capture as outputs from the build step.
+        The commands to execute in the container, either as a single string or a list of strings.
+
+        Each command runs in its own container and is repacked into its own layer, so changing a
+        command only re-runs that command and the ones after it.
         """)
 
+    @classmethod
+    def compute_value(
+        cls, raw_value: Optional[Union[str, Iterable[str]]], address: Address
+    ) -> Optional[tuple[str, ...]]:
+        value_or_default = super().compute_value(raw_value, address)
+        if value_or_default is None:
+            return None
+
+        if isinstance(value_or_default, str):
+            return (value_or_default,)
+
+        if not isinstance(value_or_default, (list, tuple)) or not all(
+            isinstance(v, str) for v in value_or_default
+        ):
+            raise InvalidFieldTypeException(
+                address,
+                cls.alias,
+                raw_value,
+                expected_type="a string or an iterable of strings (e.g. a list of strings)",
+            )
+
+        return tuple(value_or_default)
+
 
 class ImageEntrypoint(StringField):
     alias = "entrypoint"
@@ -177,3 +210,70 @@ class ImageOsField(StringField):
     help = softwrap("""
     The os to build the image for.
     """)
+
+
+class ImageCpuLimitField(FloatField):
+    alias = "cpu"
+
+    help = softwrap("""
+    The number of CPUs the build container may use, e.g. `0.5` or `2`. Written into the runtime spec
+    as a CFS quota.
+    """)
+
+    @classmethod
+    def compute_value(cls, raw_value: Optional[float], address: Address) -> Optional[float]:
+        if isinstance(raw_value, int) and not isinstance(raw_value, bool):
+            raw_value = float(raw_value)
+
+        value_or_default = super().compute_value(raw_value, address)
+        if value_or_default is not None and value_or_default <= 0:
+            raise InvalidFieldException(
+                f"The `{cls.alias}` field in target {address} must be greater than zero, but was"
+                f" `{value_or_default}`."
+            )
+
+        return value_or_default
+
+
+_MEMORY_UNITS = {
+    "": 1,
+    "k": 1000,
+    "m": 1000**2,
+    "g": 1000**3,
+    "ki": 1024,
+    "mi": 1024**2,
+    "gi": 1024**3,
+}
+_MEMORY_PATTERN = re.compile(r"^\s*(\d+)\s*([kmg]i?)?b?\s*$", re.IGNORECASE)
+
+
+class ImageMemoryLimitField(Field):
+    alias = "memory"
+    default = None
+    value: Optional[int]
+
+    help = softwrap("""
+    The memory limit of the build container, either in bytes or with a unit suffix such as `512Mi`
+    or `2G`. Written into the runtime spec as a cgroup memory limit.
+    """)
+
+    @classmethod
+    def compute_value(cls, raw_value: Optional[Union[int, str]], address: Address) -> Optional[int]:
+        value_or_default = super().compute_value(raw_value, address)
+        if value_or_default is None:
+            return None
+
+        if isinstance(value_or_default, int) and not isinstance(value_or_default, bool):
+            return value_or_default
+
+        match = _MEMORY_PATTERN.match(value_or_default) if isinstance(value_or_default, str) else None
+        if match is None:
+            raise InvalidFieldTypeException(
+                address,
+                cls.alias,
+                raw_value,
+                expected_type="an integer number of bytes or a string like `512Mi` or `2G`",
+            )
+
+        amount, unit = match.groups()
+        return int(amount) * _MEMORY_UNITS[(unit or "").lower()]
@@ -0,0 +1,58 @@
+import pytest
+from pants.engine.addresses import Address
+from pants.engine.target import InvalidFieldException, InvalidFieldTypeException
+
+from pants_backend_oci.target_types import (
+    ImageBuildCommand,
+    ImageCpuLimitField,
+    ImageMemoryLimitField,
+)
+
+
+def test_build_command_accepts_string() -> None:
+    field = ImageBuildCommand("make all", Address("", target_name="t"))
+    assert field.value == ("make all",)
+
+
+def test_build_command_accepts_list() -> None:
+    field = ImageBuildCommand(["apt-get update", "make all"], Address("", target_name="t"))
+    assert field.value == ("apt-get update", "make all")
+
+
+def test_build_command_defaults_to_none() -> None:
+    field = ImageBuildCommand(None, Address("", target_name="t"))
+    assert field.value is None
+
+
+def test_build_command_rejects_other_types() -> None:
+    with pytest.raises(InvalidFieldTypeException):
+        ImageBuildCommand(["make", 1], Address("", target_name="t"))
+
+
+@pytest.mark.parametrize(
+    "raw_value, expected",
+    (
+        (1048576, 1048576),
+        ("512", 512),
+        ("512Mi", 512 * 1024**2),
+        ("2G", 2 * 1000**3),
+        ("4gib", 4 * 1024**3),
+        ("100k", 100 * 1000),
+    ),
+)
+def test_memory_limit_parses_units(raw_value, expected) -> None:
+    field = ImageMemoryLimitField(raw_value, Address("", target_name="t"))
+    assert field.value == expected
+
+
+def test_memory_limit_rejects_unknown_unit() -> None:
+    with pytest.raises(InvalidFieldTypeException):
+        ImageMemoryLimitField("12 parsecs", Address("", target_name="t"))
+
+
+def test_cpu_limit_must_be_positive() -> None:
+    assert ImageCpuLimitField(1.5, Address("", target_name="t")).value == 1.5
+    assert ImageCpuLimitField(2, Address("", target_name="t")).value == 2.0
+
+    with pytest.raises(InvalidFieldException):
+        ImageCpuLimitField(0.0, Address("", target_name="t"))
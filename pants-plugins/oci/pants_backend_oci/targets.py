@@ -18,6 +18,7 @@ from pants_backend_oci.target_types import (
     ImageBase,
     ImageBuildCommand,
     ImageBuildOutputs,
+    ImageCpuLimitField,
     ImageDependencies,
     ImageDigest,
     ImageEmptyMarker,
@@ -26,6 +27,7 @@ from pants_backend_oci.target_types import (
     ImageExtractMarker,
     ImageLayerOutputPathField,
     ImageLayersField,
+    ImageMemoryLimitField,
     ImageOsField,
     ImageRepository,
     ImageRepositoryAnonymous,
@@ -120,6 +122,8 @@ class ImageBuild(Target):
         ImageArgs,
         OutputPathField,
         ImageBuildCommand,
+        ImageCpuLimitField,
+        ImageMemoryLimitField,
     )
     help = "An imported OCI image."
 
@@ -144,6 +148,8 @@ class ImageBuildStep(Target):
         ImageEnvironment,
         ImageArtifactExclusions,
         OutputPathField,
+        ImageCpuLimitField,
+        ImageMemoryLimitField,
     )
     help = "An imported OCI image."
 
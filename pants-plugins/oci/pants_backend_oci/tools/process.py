@@ -22,8 +22,10 @@ class FusedProcess:
 async def fuse_process(request: FusedProcess, bash: BashBinary) -> Process:
     common_output_directories = list(set(sum([list(p.output_directories) for p in request.processes], [])))
     immutable_input_digests = {}
+    append_only_caches = {}
     for p in request.processes:
         immutable_input_digests.update(p.immutable_input_digests)
+        append_only_caches.update(p.append_only_caches)
 
     common_output_files = list(set(sum([list(p.output_files) for p in request.processes], [])))
     common_digest_input = list(set([p.input_digest for p in request.processes if p.input_digest]))
@@ -50,6 +52,7 @@ async def fuse_process(request: FusedProcess, bash: BashBinary) -> Process:
         output_files=common_output_files,
         output_directories=common_output_directories,
         immutable_input_digests=immutable_input_digests,
+        append_only_caches=append_only_caches,
         env=env,
     )
 
@@ -6,6 +6,7 @@ from pants_backend_oci.util_rules import (
     configure,
     copy,
     empty_image_bundle,
+    governor,
     image_bundle,
     jq,
     layer,
@@ -34,4 +35,5 @@ def rules():
         *run.rules(),
         *configure.rules(),
         *tools.rules(),
+        *governor.rules(),
     ]
@@ -30,9 +30,11 @@ from pants_backend_oci.target_types import (
     ImageBase,
     ImageBuildCommand,
     ImageBuildOutputs,
+    ImageCpuLimitField,
     ImageDependencies,
     ImageEnvironment,
     ImageExtractMarker,
+    ImageMemoryLimitField,
 )
 from pants_backend_oci.util_rules.copy import CopyFromRequest
 from pants_backend_oci.util_rules.image_bundle import (
@@ -62,6 +64,9 @@ class ImageArtifactBuildFieldSet(PackageFieldSet):
 
     exclude: ImageArtifactExclusions
 
+    cpu: ImageCpuLimitField
+    memory: ImageMemoryLimitField
+
 
 @dataclass(frozen=True)
 class ImageArtifactExtractFieldSet(PackageFieldSet):
@@ -187,12 +192,22 @@ async def build_image_artifact(
     else:
         output_digest = base_digest
 
-    bundle = ImageBundle(output_digest, "", True)
+    for command in request.target.commands.value or ():
+        bundle = ImageBundle(output_digest, "", True)
 
-    modified_image = await Get(
-        ProcessResult, RunContainerRequest(bundle, request.target.commands.value, True)
-    )
-    bundle = ImageBundle(modified_image.output_digest, "", True)
+        modified_image = await Get(
+            ProcessResult,
+            RunContainerRequest(
+                bundle,
+                command,
+                True,
+                cpu=request.target.cpu.value,
+                memory=request.target.memory.value,
+            ),
+        )
+        output_digest = modified_image.output_digest
+
+    bundle = ImageBundle(output_digest, "", True)
 
     artifacts = await Get(
         ProcessResult,
@@ -28,10 +28,12 @@ from pants_backend_oci.target_types import (
     ImageArgs,
     ImageBase,
     ImageBuildCommand,
+    ImageCpuLimitField,
     ImageDependencies,
     ImageEntrypoint,
     ImageEnvironment,
     ImageLayersField,
+    ImageMemoryLimitField,
 )
 from pants_backend_oci.tools.process import FusedProcess
 from pants_backend_oci.util_rules.image_bundle import (
@@ -58,6 +60,8 @@ class BuildImageBundleFieldSet(FieldSet):
     layers: ImageLayersField
 
     commands: ImageBuildCommand
+    cpu: ImageCpuLimitField
+    memory: ImageMemoryLimitField
 
 
 @dataclass(frozen=True)
@@ -156,11 +160,20 @@ async def build_oci_bundle_package(
 
         output_digest = image.output_digest
 
-    if request.target.commands.value:
+    # Every command is its own container run and layer. Each step is keyed on the image produced by
+    # the previous one, so only the first changed command and everything after it will re-run.
+    for command in request.target.commands.value or ():
         bundle = ImageBundle(output_digest, "", True)
 
         modified_image = await Get(
-            ProcessResult, RunContainerRequest(bundle, request.target.commands.value, True)
+            ProcessResult,
+            RunContainerRequest(
+                bundle,
+                command,
+                True,
+                cpu=request.target.cpu.value,
+                memory=request.target.memory.value,
+            ),
         )
 
         output_digest = modified_image.output_digest
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
 
 from pants.core.util_rules.external_tool import DownloadedExternalTool, ExternalToolRequest
+from pants.engine.fs import Digest, DigestContents, DigestSubset, PathGlobs
 from pants.engine.platform import Platform
 from pants.engine.process import Process
 from pants.engine.rules import Get, collect_rules, rule
@@ -15,6 +17,45 @@ class SetCmdProcessRequest:
     pass
 
 
+@dataclass(frozen=True)
+class ImageConfigRequest:
+    bundle_digest: Digest
+
+
+@dataclass(frozen=True)
+class ImageConfig:
+    """The parts of the image configuration needed to launch a container."""
+
+    entrypoint: tuple[str, ...]
+    cmd: tuple[str, ...]
+
+
+@rule
+async def read_image_config(request: ImageConfigRequest) -> ImageConfig:
+    index_contents = await Get(
+        DigestContents, DigestSubset(request.bundle_digest, PathGlobs(["build/index.json"]))
+    )
+    manifests = json.loads(index_contents[0].content)["manifests"]
+    manifest_digest = manifests[len(manifests) - 1]["digest"].replace(":", "/", 1)
+
+    manifest_contents = await Get(
+        DigestContents,
+        DigestSubset(request.bundle_digest, PathGlobs([f"build/blobs/{manifest_digest}"])),
+    )
+    config_digest = json.loads(manifest_contents[0].content)["config"]["digest"].replace(":", "/", 1)
+
+    config_contents = await Get(
+        DigestContents,
+        DigestSubset(request.bundle_digest, PathGlobs([f"build/blobs/{config_digest}"])),
+    )
+    config = json.loads(config_contents[0].content).get("config") or {}
+
+    return ImageConfig(
+        entrypoint=tuple(config.get("Entrypoint") or ()),
+        cmd=tuple(config.get("Cmd") or ()),
+    )
+
+
 @rule
 async def set_args(
     request: SetCmdProcessRequest, tool: UmociTool, platform: Platform, oci: OciSubsystem
@@ -0,0 +1,30 @@
+from pants.engine.addresses import Address
+from pants.testutil.rule_runner import QueryRule, RuleRunner
+
+from pants_backend_oci import synthetic_targets
+from pants_backend_oci.targets import ImageEmpty
+from pants_backend_oci.util_rules import configure, empty_image_bundle, image_bundle
+
+
+def test_read_config_of_empty_image() -> None:
+    rule_runner = RuleRunner(
+        target_types=[ImageEmpty],
+        rules=[
+            *configure.rules(),
+            *empty_image_bundle.rules(),
+            *synthetic_targets.rules(),
+            QueryRule(image_bundle.FallibleImageBundle, [empty_image_bundle.ImageBundleEmptyRequest]),
+            QueryRule(configure.ImageConfig, [configure.ImageConfigRequest]),
+        ],
+    )
+
+    rule_runner.write_files({"BUILD": ""})
+    target = rule_runner.get_target(Address("", target_name="empty"))
+    bundle = rule_runner.request(
+        image_bundle.FallibleImageBundle, [empty_image_bundle.ImageBundleEmptyRequest(target)]
+    )
+
+    config = rule_runner.request(configure.ImageConfig, [configure.ImageConfigRequest(bundle.output.digest)])
+
+    assert config.entrypoint == ()
+    assert config.cmd == ()
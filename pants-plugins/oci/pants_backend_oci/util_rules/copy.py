@@ -12,6 +12,7 @@ from pants.engine.rules import Get, MultiGet, collect_rules, rule
 
 from pants_backend_oci.tools.process import FusedProcess
 from pants_backend_oci.util_rules.archive import CreateDeterministicDirectoryTar
+from pants_backend_oci.util_rules.governor import ContainerAdmission, ContainerAdmissionRequest
 from pants_backend_oci.util_rules.image_bundle import ImageBundle
 from pants_backend_oci.util_rules.unpack import UnpackedImageBundleRequest
 
@@ -50,7 +51,8 @@ async def copy_from_container(
         for path in request.output_files
     )
 
-    unpack, tar, workspace_digest = await MultiGet(
+    admission, unpack, tar, workspace_digest = await MultiGet(
+        Get(ContainerAdmission, ContainerAdmissionRequest(request.bundle.digest)),
         Get(Process, UnpackedImageBundleRequest(request.bundle.digest)),
         Get(
             Process,
@@ -74,6 +76,7 @@ async def copy_from_container(
     )
 
     steps = [
+        *admission.steps,
         unpack,
         Process(
             (bash.path, "{chroot}/copy.sh"),
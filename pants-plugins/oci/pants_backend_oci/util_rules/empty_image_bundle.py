@@ -2,26 +2,36 @@
 
 from __future__ import annotations
 
-import datetime
+import hashlib
+import json
 from dataclasses import dataclass
-from typing import ClassVar
+from typing import Any, ClassVar
 
-from pants.core.util_rules.external_tool import DownloadedExternalTool, ExternalToolRequest
+from pants.engine.fs import CreateDigest, Digest, FileContent
 from pants.engine.platform import Platform
-from pants.engine.process import Process, ProcessResult
 from pants.engine.rules import Get, collect_rules, rule
 from pants.engine.target import FieldSet, Target
 from pants.engine.unions import UnionRule
 
-from pants_backend_oci.subsystem import UmociTool
 from pants_backend_oci.target_types import ImageEmptyMarker
-from pants_backend_oci.tools.process import FusedProcess
 from pants_backend_oci.util_rules.image_bundle import (
     FallibleImageBundle,
     FallibleImageBundleRequest,
     ImageBundle,
 )
-from pants_backend_oci.util_rules.oci_sha import OciSha, OciShaRequest
+
+# The empty image is a fixed layout, so rather than running `umoci init`, `umoci new` and `umoci
+# config` we write the blobs directly. The serialization mirrors what umoci (Go's `encoding/json`)
+# emits byte-for-byte, so the resulting image digest is unchanged.
+_MEDIA_TYPE_IMAGE_CONFIG = "application/vnd.oci.image.config.v1+json"
+_MEDIA_TYPE_IMAGE_MANIFEST = "application/vnd.oci.image.manifest.v1+json"
+
+_PLATFORM_TO_OS_ARCH = {
+    Platform.linux_x86_64: ("linux", "amd64"),
+    Platform.linux_arm64: ("linux", "arm64"),
+    Platform.macos_x86_64: ("darwin", "amd64"),
+    Platform.macos_arm64: ("darwin", "arm64"),
+}
 
 
 @dataclass(frozen=True)
@@ -35,56 +45,75 @@ class ImageBundleEmptyRequest(FallibleImageBundleRequest):
     field_set_type: ClassVar[type[FieldSet]] = ImageBundleEmptyFieldSet
 
 
+def _encode_json(value: Any) -> bytes:
+    return (json.dumps(value, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _blob(content: bytes) -> tuple[str, FileContent]:
+    sha256 = f"sha256:{hashlib.sha256(content).hexdigest()}"
+    return sha256, FileContent(f"build/blobs/sha256/{sha256[7:]}", content)
+
+
+def empty_image_layout(platform: Platform) -> tuple[str, tuple[FileContent, ...]]:
+    """Returns the manifest digest and files of an empty OCI image layout tagged `build`."""
+    os_name, architecture = _PLATFORM_TO_OS_ARCH[platform]
+
+    config = _encode_json(
+        {
+            "created": "1970-01-01T00:00:00Z",
+            "author": "pants_backend_oci",
+            "architecture": architecture,
+            "os": os_name,
+            "config": {"Env": ["BUILT_BY=pants.oci"]},
+            "rootfs": {"type": "layers", "diff_ids": []},
+        }
+    )
+    config_digest, config_file = _blob(config)
+
+    manifest = _encode_json(
+        {
+            "schemaVersion": 2,
+            "config": {
+                "mediaType": _MEDIA_TYPE_IMAGE_CONFIG,
+                "digest": config_digest,
+                "size": len(config),
+            },
+            "layers": [],
+        }
+    )
+    manifest_digest, manifest_file = _blob(manifest)
+
+    index = _encode_json(
+        {
+            "schemaVersion": 2,
+            "manifests": [
+                {
+                    "mediaType": _MEDIA_TYPE_IMAGE_MANIFEST,
+                    "digest": manifest_digest,
+                    "size": len(manifest),
+                    "annotations": {"org.opencontainers.image.ref.name": "build"},
+                }
+            ],
+        }
+    )
+
+    return manifest_digest, (
+        FileContent("build/oci-layout", _encode_json({"imageLayoutVersion": "1.0.0"})),
+        FileContent("build/index.json", index),
+        config_file,
+        manifest_file,
+    )
+
+
 @rule
 async def make_empty_oci_image(
     request: ImageBundleEmptyRequest,
     platform: Platform,
-    umoci: UmociTool,
 ) -> FallibleImageBundle:
-    umoci = await Get(
-        DownloadedExternalTool,
-        ExternalToolRequest,
-        umoci.get_request(platform),
-    )
+    image_sha, files = empty_image_layout(platform)
+    digest = await Get(Digest, CreateDigest(files))
 
-    timestamp = datetime.datetime(1970, 1, 1).isoformat() + "Z"
-    result = await Get(
-        ProcessResult,
-        FusedProcess(
-            (
-                Process(
-                    argv=(umoci.exe, "init", "--layout", "build"),
-                    input_digest=umoci.digest,
-                    description="Creating base OCI layout",
-                ),
-                Process(
-                    argv=(umoci.exe, "new", "--image", "build:build"),
-                    input_digest=umoci.digest,
-                    description="Creating a new empty base image",
-                    output_directories=("build",),
-                ),
-                Process(
-                    argv=(
-                        umoci.exe,
-                        "config",
-                        "--image",
-                        "build:build",
-                        "--config.env",
-                        "BUILT_BY=pants.oci",
-                        "--author=pants_backend_oci",
-                        f"--created={timestamp}",
-                        "--no-history",
-                    ),
-                    description="Erasing timestamps and other info",
-                ),
-            ),
-        ),
-    )
-
-    image_digest = await Get(OciSha, OciShaRequest(result.output_digest))
-    return FallibleImageBundle(
-        ImageBundle(result.output_digest, image_sha=image_digest.image_digest, is_local=True)
-    )
+    return FallibleImageBundle(ImageBundle(digest, image_sha=image_sha, is_local=True))
 
 
 def rules():
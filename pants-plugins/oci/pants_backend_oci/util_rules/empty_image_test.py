@@ -1,11 +1,9 @@
-from pants.core.util_rules import external_tool
-from pants.engine import process
 from pants.engine.addresses import Address
+from pants.engine.fs import Digest, DigestContents
 from pants.testutil.rule_runner import QueryRule, RuleRunner
 
 from pants_backend_oci import synthetic_targets
 from pants_backend_oci.targets import ImageEmpty
-from pants_backend_oci.tools import process as fprocess
 from pants_backend_oci.util_rules import empty_image_bundle, image_bundle, oci_sha
 
 
@@ -15,10 +13,7 @@ def test_empty_image_has_fixed_sha() -> None:
         target_types=[ImageEmpty],
         rules=[
             *empty_image_bundle.rules(),
-            *external_tool.rules(),
             *oci_sha.rules(),
-            *process.rules(),
-            *fprocess.rules(),
             *synthetic_targets.rules(),
             QueryRule(
                 image_bundle.FallibleImageBundle,
@@ -26,6 +21,8 @@ def test_empty_image_has_fixed_sha() -> None:
                     empty_image_bundle.ImageBundleEmptyRequest,
                 ],
             ),
+            QueryRule(oci_sha.OciSha, [oci_sha.OciShaRequest]),
+            QueryRule(DigestContents, [Digest]),
         ],
     )
 
@@ -41,3 +38,14 @@ def test_empty_image_has_fixed_sha() -> None:
 
     assert result.exit_code == 0
     assert result.output.image_sha == GOLDEN
+
+    sha = rule_runner.request(oci_sha.OciSha, [oci_sha.OciShaRequest(result.output.digest)])
+    assert sha.image_digest == GOLDEN
+
+    contents = rule_runner.request(DigestContents, [result.output.digest])
+    assert sorted(c.path for c in contents) == [
+        "build/blobs/sha256/55fc22b71a0980b90948afcd8ee8ab517f546a2ebc3b73052b60af7df744f5ae",
+        f"build/blobs/sha256/{GOLDEN[7:]}",
+        "build/index.json",
+        "build/oci-layout",
+    ]
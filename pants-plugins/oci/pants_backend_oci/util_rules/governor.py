@@ -0,0 +1,204 @@
+"""
+Admission control for container steps, shared between all Pants processes on a machine.
+
+Every step that unpacks an image first takes a slot in a named cache. A slot is a file holding the
+estimated disk use of the step, locked with `flock` for as long as the step runs. Slots whose lock
+is no longer held belong to steps that have exited and are reclaimed by the next admission.
+
+The limits are machine specific, so they are not part of the container steps: they are written to
+the named cache by an uncached process once per session, and read from there by the admission
+script. Changing them thus does not invalidate any cached step.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from textwrap import dedent
+
+from pants.core.util_rules.system_binaries import (
+    BashBinary,
+    BinaryShims,
+    BinaryShimsRequest,
+    SystemBinariesSubsystem,
+)
+from pants.engine.fs import (
+    CreateDigest,
+    Digest,
+    DigestContents,
+    DigestSubset,
+    FileContent,
+    PathGlobs,
+)
+from pants.engine.process import Process, ProcessCacheScope, ProcessResult
+from pants.engine.rules import Get, MultiGet, collect_rules, rule
+from pants.util.frozendict import FrozenDict
+
+from pants_backend_oci.subsystem import OciSubsystem
+
+_CACHE_NAME = "oci_containers"
+_CACHE_PATH = ".oci_containers"
+_TOOLS = ["flock", "mkdir", "rm", "sleep", "cat", "mv"]
+
+# Sourced into the fused script with the estimated size of the image as its argument, so the lock on
+# fd 9 is held until the script exits. Without a limits file, e.g. when executed remotely, every step
+# is admitted.
+_ADMIT_SCRIPT = dedent(f"""\
+    PATH="$OCI_GOVERNOR_PATH${{PATH:+:$PATH}}"
+    __oci_dir="$SANDBOX_DIR/{_CACHE_PATH}"
+    __oci_slot="$__oci_dir/running/$$.$RANDOM"
+    __oci_size="${{1:-0}}"
+    __oci_max=0
+    __oci_budget=0
+    if [ -r "$__oci_dir/limits" ]; then
+        read -r __oci_max __oci_budget < "$__oci_dir/limits"
+    fi
+    mkdir -p "$__oci_dir/running"
+    while true; do
+        exec 8>"$__oci_dir/admission.lock"
+        flock 8
+        __oci_count=0
+        __oci_used=0
+        for __oci_other in "$__oci_dir"/running/*; do
+            [ -e "$__oci_other" ] || continue
+            if flock -n "$__oci_other" true; then
+                rm -f "$__oci_other"
+                continue
+            fi
+            __oci_count=$((__oci_count + 1))
+            __oci_used=$((__oci_used + $(cat "$__oci_other")))
+        done
+        if {{ [ "$__oci_max" -eq 0 ] || [ $__oci_count -lt "$__oci_max" ]; }} \\
+            && {{ [ "$__oci_budget" -eq 0 ] || [ $__oci_count -eq 0 ] \\
+                || [ $((__oci_used + __oci_size)) -le "$__oci_budget" ]; }}; then
+            echo "$__oci_size" > "$__oci_slot"
+            exec 9<"$__oci_slot"
+            flock 9
+            trap 'rm -f "$__oci_slot"' EXIT
+            exec 8>&-
+            break
+        fi
+        exec 8>&-
+        sleep 1
+    done
+    """)
+
+_WRITE_LIMITS_SCRIPT = dedent(f"""\
+    PATH="$OCI_GOVERNOR_PATH"
+    mkdir -p {_CACHE_PATH}
+    echo "$1 $2" > {_CACHE_PATH}/limits.$$
+    mv {_CACHE_PATH}/limits.$$ {_CACHE_PATH}/limits
+    """)
+
+
+@dataclass(frozen=True)
+class ImageSizeEstimateRequest:
+    bundle_digest: Digest
+
+
+@dataclass(frozen=True)
+class ImageSizeEstimate:
+    size: int
+
+
+@dataclass(frozen=True)
+class ContainerAdmissionRequest:
+    bundle_digest: Digest
+
+
+@dataclass(frozen=True)
+class ContainerAdmission:
+    """Steps to prepend to a `FusedProcess` before it unpacks an image.
+
+    Empty when no limits are configured.
+    """
+
+    steps: tuple[Process, ...]
+
+
+@rule
+async def estimate_image_size(request: ImageSizeEstimateRequest) -> ImageSizeEstimate:
+    index_contents = await Get(
+        DigestContents, DigestSubset(request.bundle_digest, PathGlobs(["build/index.json"]))
+    )
+    if not index_contents:
+        return ImageSizeEstimate(0)
+
+    manifests = json.loads(index_contents[0].content)["manifests"]
+    if not manifests:
+        return ImageSizeEstimate(0)
+
+    manifest_digest = manifests[len(manifests) - 1]["digest"]
+    algorithm, hexdigest = manifest_digest.split(":", 1)
+    manifest_contents = await Get(
+        DigestContents,
+        DigestSubset(request.bundle_digest, PathGlobs([f"build/blobs/{algorithm}/{hexdigest}"])),
+    )
+    if not manifest_contents:
+        return ImageSizeEstimate(0)
+
+    manifest = json.loads(manifest_contents[0].content)
+    return ImageSizeEstimate(sum(layer["size"] for layer in manifest.get("layers", ())))
+
+
+@rule
+async def admit_container(
+    request: ContainerAdmissionRequest,
+    oci: OciSubsystem,
+    bash: BashBinary,
+    system_binaries_subsystem: SystemBinariesSubsystem.EnvironmentAware,
+) -> ContainerAdmission:
+    if not oci.governs_containers:
+        return ContainerAdmission(())
+
+    shims, estimate = await MultiGet(
+        Get(
+            BinaryShims,
+            BinaryShimsRequest,
+            BinaryShimsRequest.for_binaries(
+                *_TOOLS,
+                rationale="limit the number of concurrent containers",
+                search_path=system_binaries_subsystem.system_binary_paths,
+            ),
+        ),
+        Get(ImageSizeEstimate, ImageSizeEstimateRequest(request.bundle_digest)),
+    )
+
+    script_digest, _ = await MultiGet(
+        Get(Digest, CreateDigest([FileContent("admit.sh", _ADMIT_SCRIPT.encode("utf-8"))])),
+        Get(
+            ProcessResult,
+            Process(
+                (
+                    bash.path,
+                    "-c",
+                    _WRITE_LIMITS_SCRIPT,
+                    "write-limits",
+                    str(oci.max_concurrent_containers),
+                    str(oci.container_disk_budget),
+                ),
+                description="Set container limits",
+                immutable_input_digests=shims.immutable_input_digests,
+                env={"OCI_GOVERNOR_PATH": shims.path_component},
+                append_only_caches=FrozenDict({_CACHE_NAME: _CACHE_PATH}),
+                cache_scope=ProcessCacheScope.PER_SESSION,
+            ),
+        ),
+    )
+
+    return ContainerAdmission(
+        (
+            Process(
+                (".", "{chroot}/admit.sh", str(estimate.size)),
+                description="Waiting for a container slot",
+                input_digest=script_digest,
+                immutable_input_digests=shims.immutable_input_digests,
+                env={"OCI_GOVERNOR_PATH": shims.path_component},
+                append_only_caches=FrozenDict({_CACHE_NAME: _CACHE_PATH}),
+            ),
+        )
+    )
+
+
+def rules():
+    return collect_rules()
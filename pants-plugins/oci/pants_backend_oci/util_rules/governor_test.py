@@ -0,0 +1,71 @@
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+from pants.core.util_rules import system_binaries
+from pants.engine.fs import EMPTY_DIGEST
+from pants.testutil.rule_runner import QueryRule, RuleRunner
+
+from pants_backend_oci.subsystem import OciSubsystem
+from pants_backend_oci.util_rules import governor
+
+
+@pytest.fixture
+def rule_runner() -> RuleRunner:
+    return RuleRunner(
+        rules=[
+            *governor.rules(),
+            *system_binaries.rules(),
+            *OciSubsystem.rules(),
+            QueryRule(governor.ContainerAdmission, [governor.ContainerAdmissionRequest]),
+        ],
+    )
+
+
+def test_admit_container_without_limits(rule_runner: RuleRunner) -> None:
+    admission = rule_runner.request(
+        governor.ContainerAdmission, [governor.ContainerAdmissionRequest(EMPTY_DIGEST)]
+    )
+    assert admission.steps == ()
+
+
+@pytest.mark.skipif(shutil.which("flock") is None, reason="requires flock")
+def test_admit_container_with_limits(rule_runner: RuleRunner) -> None:
+    rule_runner.set_options(
+        ["--oci-max-concurrent-containers=2"], env_inherit={"PATH", "PYENV_ROOT", "HOME"}
+    )
+    first = rule_runner.request(
+        governor.ContainerAdmission, [governor.ContainerAdmissionRequest(EMPTY_DIGEST)]
+    )
+    (step,) = first.steps
+    assert step.argv == (".", "{chroot}/admit.sh", "0")
+
+    # The limits are not part of the step, so changing them does not invalidate cached steps.
+    rule_runner.set_options(
+        ["--oci-max-concurrent-containers=4"], env_inherit={"PATH", "PYENV_ROOT", "HOME"}
+    )
+    second = rule_runner.request(
+        governor.ContainerAdmission, [governor.ContainerAdmissionRequest(EMPTY_DIGEST)]
+    )
+    assert second.steps == first.steps
+
+
+@pytest.mark.skipif(shutil.which("flock") is None, reason="requires flock")
+def test_admission_script_waits_for_a_slot(tmp_path: Path) -> None:
+    cache = tmp_path / governor._CACHE_PATH
+    cache.mkdir()
+    (cache / "limits").write_text("1 0\n")
+    script = tmp_path / "admit.sh"
+    script.write_text(governor._ADMIT_SCRIPT)
+    log = tmp_path / "log"
+
+    env = {**os.environ, "SANDBOX_DIR": str(tmp_path), "OCI_GOVERNOR_PATH": os.environ["PATH"]}
+    step = f'. "$0" 10; echo start >> {log}; sleep 1; echo end >> {log}'
+    steps = [subprocess.Popen(["bash", "-c", step, str(script)], env=env) for _ in range(2)]
+    assert [process.wait(timeout=30) for process in steps] == [0, 0]
+
+    # The second step is only admitted once the first has exited and released its slot.
+    assert log.read_text().split() == ["start", "end", "start", "end"]
+    assert not list((cache / "running").iterdir())
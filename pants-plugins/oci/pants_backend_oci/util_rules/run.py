@@ -19,6 +19,7 @@ from pants.engine.rules import Get, MultiGet, collect_rules, rule
 
 from pants_backend_oci.subsystem import OciSubsystem, RuncTool, UmociTool
 from pants_backend_oci.tools.process import FusedProcess
+from pants_backend_oci.util_rules.governor import ContainerAdmission, ContainerAdmissionRequest
 from pants_backend_oci.util_rules.image_bundle import ImageBundle
 from pants_backend_oci.util_rules.jq import JqBinary, JqBinaryRequest
 from pants_backend_oci.util_rules.tools import RuncToolsRequest
@@ -31,10 +32,13 @@ from pants_backend_oci.util_rules.unpack import (
 @dataclass(frozen=True)
 class RunContainerRequest:
     bundle: ImageBundle
-    command: tuple[str]
+    command: str
 
     repack: bool = False
 
+    cpu: float | None = None
+    memory: int | None = None
+
 
 @rule
 async def run_in_container(
@@ -49,7 +53,7 @@ async def run_in_container(
     mkdir: MkdirBinary,
     mv: MvBinary,
 ) -> ProcessResult:
-    tool, rundir, jq, shims, packed_image_process = await MultiGet(
+    tool, rundir, jq, shims, admission, packed_image_process = await MultiGet(
         Get(DownloadedExternalTool, ExternalToolRequest, runc.get_request(platform)),
         Get(Digest, CreateDigest([Directory("runspace")])),
         Get(JqBinary, JqBinaryRequest()),
@@ -57,6 +61,7 @@ async def run_in_container(
             BinaryShims,
             RuncToolsRequest(),
         ),
+        Get(ContainerAdmission, ContainerAdmissionRequest(request.bundle.digest)),
         Get(Process, UnpackedImageBundleRequest(request.bundle.digest)),
     )
 
@@ -109,6 +114,15 @@ async def run_in_container(
                             }
                        ]"""
 
+    resource_patches = ""
+    if request.cpu is not None:
+        period = 100000
+        resource_patches += (
+            f"| .linux.resources.cpu = {{ quota: {int(request.cpu * period)}, period: {period} }}"
+        )
+    if request.memory is not None:
+        resource_patches += f"| .linux.resources.memory = {{ limit: {request.memory} }}"
+
     rootless = "true" if oci.rootless else "false"
     namespace = f"pants.runc.{request.bundle.digest.fingerprint}"
 
@@ -179,6 +193,7 @@ async def run_in_container(
                        | .process.user.uid = 0
                        | .process.user.gid = 0
                        {rootness_patches}
+                       {resource_patches}
             ' > "$ROOT/unpacked_image/config.json.tmp"
         {mv.path} "$ROOT/unpacked_image/config.json.tmp" "$ROOT/unpacked_image/config.json"
         `pwd`/{tool.exe} --debug --root runspace --rootless {rootless} run -b unpacked_image {namespace} 0<&-
@@ -191,6 +206,7 @@ async def run_in_container(
     input_digest = await Get(Digest, MergeDigests((rundir, tool.digest, script_digest)))
 
     steps = [
+        *admission.steps,
         packed_image_process,
         Process(
             (
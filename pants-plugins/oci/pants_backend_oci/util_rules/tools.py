@@ -16,6 +16,9 @@ _TOOLS = [
     "sh",
     "cp",
     "ls",
+    "mkdir",
+    "mv",
+    "rm",
 ]
 
 
@@ -26,22 +26,17 @@ class UnpackedImageBundle:
     digest: Digest
 
 
-@rule
-async def make_unpack_process(
-    request: UnpackedImageBundleRequest, tool: UmociTool, platform: Platform, oci: OciSubsystem
-) -> Process:
-    umoci = await Get(DownloadedExternalTool, ExternalToolRequest, tool.get_request(platform))
-    output_dir = await Get(Digest, CreateDigest([Directory("unpacked_image")]))
-    input_digest = await Get(Digest, MergeDigests([request.bundle, umoci.digest, output_dir]))
-
+def unpack_argv(
+    umoci_exe: str, tool: UmociTool, oci: OciSubsystem, image: str, destination: str
+) -> tuple[str, ...]:
     command = [
-        f"{{chroot}}/{umoci.exe}",
+        umoci_exe,
         f"--log={tool.log}",
         "unpack",
         "--keep-dirlinks",
         "--image",
-        "build:build",
-        "unpacked_image",
+        image,
+        destination,
     ]
 
     if oci.rootless:
@@ -52,8 +47,21 @@ async def make_unpack_process(
     for gid in oci.gid_map:
         command.append(f"--gid-map={gid}")
 
+    return tuple(command)
+
+
+@rule
+async def make_unpack_process(
+    request: UnpackedImageBundleRequest, tool: UmociTool, platform: Platform, oci: OciSubsystem
+) -> Process:
+    umoci = await Get(DownloadedExternalTool, ExternalToolRequest, tool.get_request(platform))
+    output_dir = await Get(Digest, CreateDigest([Directory("unpacked_image")]))
+    input_digest = await Get(Digest, MergeDigests([request.bundle, umoci.digest, output_dir]))
+
+    command = unpack_argv(f"{{chroot}}/{umoci.exe}", tool, oci, "build:build", "unpacked_image")
+
     return Process(
-        tuple(command),
+        command,
         description="Unpacking OCI bundle",
         input_digest=input_digest,
         #        output_directories=("unpacked_image",),
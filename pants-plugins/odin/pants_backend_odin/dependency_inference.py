@@ -1,13 +1,23 @@
 from __future__ import annotations
 
-import re
+import os
+from collections import defaultdict
+from dataclasses import dataclass
 from pathlib import Path
 
-from pants.core.util_rules.source_files import SourceFiles, SourceFilesRequest
-from pants.engine.fs import Digest, DigestContents
-from pants.engine.rules import Get, collect_rules, rule
+from pants.engine.addresses import Address
+from pants.engine.fs import Digest, DigestContents, PathGlobs
+from pants.engine.internals.graph import Owners, OwnersRequest
+from pants.engine.rules import Get, MultiGet, collect_rules, rule
 from pants.engine.target import AllTargets, InferDependenciesRequest, InferredDependencies
 from pants.engine.unions import UnionRule
+from pants.util.frozendict import FrozenDict
+from pants.util.logging import LogLevel
+from pants_backend_odin.import_scanner import (
+    OdinFileImports,
+    resolve_relative_path,
+    scan_odin_imports,
+)
 from pants_backend_odin.target_types import (
     InferOdinBinaryDependenciesRequest,
     InferOdinPackageDependenciesRequest,
@@ -25,27 +35,48 @@ def parse_odin_imports(file_content: str) -> list[str]:
     - import "relative/path"
     - import name "relative/path"
     - import xyz "../library/foobar"
+    - import ( "a" b "../b" )
 
     Ignores collection imports like:
     - import "core:fmt"
     - import "library:something"
+
+    as well as anything in comments and strings.
     """
-    imports = []
+    return list(scan_odin_imports(file_content).packages)
 
-    # Match import statements with optional name and quoted path
-    # Matches: import ["name"] "path"
-    import_pattern = r'import\s+(?:[a-zA-Z_][a-zA-Z0-9_]*\s+)?"([^"]+)"'
 
-    for match in re.finditer(import_pattern, file_content):
-        import_path = match.group(1)
+@dataclass(frozen=True)
+class ScanOdinFileRequest:
+    content: bytes
+
+
+@rule
+def scan_odin_file(request: ScanOdinFileRequest) -> OdinFileImports:
+    """Scans a single file.
+
+    The request holds the file content, so the engine memoizes this per file digest and a file is
+    only scanned again when it changes.
+    """
+    return scan_odin_imports(request.content.decode("utf-8", errors="replace"))
+
+
+@dataclass(frozen=True)
+class ScanOdinFilesRequest:
+    digest: Digest
 
-        # Skip collection imports (contain colon)
-        if ":" in import_path:
-            continue
 
-        imports.append(import_path)
+@dataclass(frozen=True)
+class ScannedOdinFiles:
+    files: FrozenDict[str, OdinFileImports]
 
-    return imports
+
+@rule(desc="Scanning Odin imports", level=LogLevel.DEBUG)
+async def scan_odin_files(request: ScanOdinFilesRequest) -> ScannedOdinFiles:
+    """Scans all files in a digest, reading them in one go."""
+    contents = await Get(DigestContents, Digest, request.digest)
+    scanned = await MultiGet(Get(OdinFileImports, ScanOdinFileRequest(file.content)) for file in contents)
+    return ScannedOdinFiles(FrozenDict((file.path, imports) for file, imports in zip(contents, scanned)))
 
 
 def resolve_import_to_package_path(import_path: str, current_file_path: str) -> str:
@@ -81,94 +112,109 @@ def resolve_import_to_package_path(import_path: str, current_file_path: str) ->
     return "/".join(parts) if parts else ""
 
 
-@rule
-async def infer_odin_source_dependencies(
-    request: InferOdinSourceDependenciesRequest, all_targets: AllTargets
-) -> InferredDependencies:
-    """Infer dependencies for odin_source targets based on import statements."""
+@dataclass(frozen=True)
+class OdinTargetIndex:
+    """Odin package and source targets by the directory of their BUILD file."""
 
-    # Get the content of the source file
-    source_files = await Get(SourceFiles, SourceFilesRequest([request.field_set.source]))
+    packages: FrozenDict[str, tuple[Address, ...]]
+    sources: FrozenDict[str, tuple[Address, ...]]
 
-    if not source_files.snapshot.files:
-        return InferredDependencies([])
+    def packages_in(self, spec_path: str, excluding: Address) -> list[Address]:
+        return [address for address in self.packages.get(spec_path, ()) if address != excluding]
 
-    digest_contents = await Get(DigestContents, Digest, source_files.snapshot.digest)
+    def sources_in(self, spec_path: str, excluding: Address) -> list[Address]:
+        return [address for address in self.sources.get(spec_path, ()) if address != excluding]
 
-    if not digest_contents:
-        return InferredDependencies([])
 
-    file_content = digest_contents[0].content.decode("utf-8")
+@rule(desc="Indexing Odin targets", level=LogLevel.DEBUG)
+def index_odin_targets(all_targets: AllTargets) -> OdinTargetIndex:
+    """Indexes all Odin targets once, so that each inference request is a lookup.
+
+    The engine memoizes this for as long as the targets don't change.
+    """
+    packages: defaultdict[str, list[Address]] = defaultdict(list)
+    sources: defaultdict[str, list[Address]] = defaultdict(list)
+    for target in all_targets:
+        if target.has_field(_OdinPackageMarkerField):
+            packages[target.address.spec_path].append(target.address)
+        if target.has_field(OdinSourceField):
+            sources[target.address.spec_path].append(target.address)
+
+    return OdinTargetIndex(
+        packages=FrozenDict((path, tuple(addresses)) for path, addresses in packages.items()),
+        sources=FrozenDict((path, tuple(addresses)) for path, addresses in sources.items()),
+    )
+
 
-    # Parse imports from the file
-    imports = parse_odin_imports(file_content)
-    if not imports:
+@rule
+async def infer_odin_source_dependencies(
+    request: InferOdinSourceDependenciesRequest, index: OdinTargetIndex
+) -> InferredDependencies:
+    """Infer dependencies for odin_source targets based on imports and loaded files."""
+
+    # The path from the build root, not just the source filename
+    current_file_path = request.field_set.source.file_path
+
+    # All files of a directory are scanned together, so the other files of the same package share
+    # the work, while each file is only scanned again when its own content changes.
+    directory_digest = await Get(
+        Digest, PathGlobs([os.path.join(os.path.dirname(current_file_path), "*.odin")])
+    )
+    scanned = await Get(ScannedOdinFiles, ScanOdinFilesRequest(directory_digest))
+    file_imports = scanned.files.get(current_file_path)
+    if file_imports is None:
         return InferredDependencies([])
 
     # Resolve imports to package paths and find corresponding targets
     inferred_deps = []
-    # Use the full address path, not just the source filename
-    current_file_path = f"{request.field_set.address.spec_path}/{request.field_set.source.value}"
-
-    for import_path in imports:
+    for import_path in file_imports.packages:
         package_path = resolve_import_to_package_path(import_path, current_file_path)
         if not package_path:
             continue
 
         # Find targets in the resolved package path
-        for target in all_targets:
-            if (
-                target.has_field(_OdinPackageMarkerField)
-                and target.address.spec_path == package_path
-                and target.address != request.field_set.address
-            ):
-                inferred_deps.append(target.address)
+        inferred_deps.extend(index.packages_in(package_path, excluding=request.field_set.address))
+
+    # Files embedded with `#load` and local foreign libraries are needed in the build sandbox.
+    local_files = []
+    for path in (*file_imports.loads, *file_imports.foreign_imports):
+        resolved = resolve_relative_path(path, current_file_path) if ":" not in path else None
+        if resolved:
+            local_files.append(resolved)
+
+    if local_files:
+        owners = await Get(Owners, OwnersRequest(tuple(dict.fromkeys(local_files))))
+        inferred_deps.extend(owner for owner in owners if owner != request.field_set.address)
 
     return InferredDependencies(inferred_deps)
 
 
 @rule
 async def infer_odin_package_dependencies(
-    request: InferOdinPackageDependenciesRequest, all_targets: AllTargets
+    request: InferOdinPackageDependenciesRequest, index: OdinTargetIndex
 ) -> InferredDependencies:
     """Infer that odin_package targets depend on all odin_source targets in the same directory."""
 
     odin_package_address = request.field_set.address
-    odin_package_spec_path = odin_package_address.spec_path
 
     # Find all odin_source targets in the same directory
-    inferred_deps = []
-    for target in all_targets:
-        if (
-            target.has_field(OdinSourceField)
-            and target.address.spec_path == odin_package_spec_path
-            and target.address != odin_package_address
-        ):
-            inferred_deps.append(target.address)
-
-    return InferredDependencies(inferred_deps)
+    return InferredDependencies(
+        index.sources_in(odin_package_address.spec_path, excluding=odin_package_address)
+    )
 
 
 @rule
 async def infer_odin_binary_dependencies(
-    request: InferOdinBinaryDependenciesRequest, all_targets: AllTargets
+    request: InferOdinBinaryDependenciesRequest, index: OdinTargetIndex
 ) -> InferredDependencies:
-    """Infer that odin_package targets depend on all odin_source targets in the same directory."""
+    """Infer that odin_binary targets depend on all odin_package targets in the same directory."""
 
-    odin_package_address = request.field_set.address
-    odin_package_spec_path = odin_package_address.spec_path
+    odin_binary_address = request.field_set.address
 
-    # Find all odin_source targets in the same directory
-    inferred_deps = []
-    for target in all_targets:
-        if (
-            target.has_field(_OdinPackageMarkerField)
-            and target.address.spec_path == odin_package_spec_path
-            and target.address != odin_package_address
-        ):
-            inferred_deps.append(target.address)
-
-    return InferredDependencies(inferred_deps)
+    # Find all odin_package targets in the same directory
+    return InferredDependencies(
+        index.packages_in(odin_binary_address.spec_path, excluding=odin_binary_address)
+    )
 
 
 def rules():
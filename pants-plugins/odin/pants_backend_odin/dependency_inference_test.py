@@ -1,11 +1,14 @@
 import pytest
+from pants.core.target_types import FilesGeneratorTarget
 from pants.core.util_rules import source_files
 from pants.engine.addresses import Address
 from pants.engine.rules import QueryRule
 from pants.engine.target import InferredDependencies
 from pants.testutil.rule_runner import RuleRunner
 from pants_backend_odin.dependency_inference import (
+    InferOdinPackageDependenciesRequest,
     InferOdinSourceDependenciesRequest,
+    OdinTargetIndex,
     parse_odin_imports,
     resolve_import_to_package_path,
 )
@@ -105,8 +108,11 @@ def rule_runner() -> RuleRunner:
             *dependency_inference_rules(),
             *source_files.rules(),
             QueryRule(InferredDependencies, [InferOdinSourceDependenciesRequest]),
+            QueryRule(InferredDependencies, [InferOdinPackageDependenciesRequest]),
+            QueryRule(OdinTargetIndex, []),
         ],
         target_types=[
+            FilesGeneratorTarget,
             OdinSourceTarget,
             OdinSourcesGeneratorTarget,
             OdinBinaryTarget,
@@ -223,3 +229,84 @@ odin_source(name="main", source="main.odin")
 
     # Should have no dependencies since collection imports are ignored
     assert len(inferred_deps.include) == 0
+
+
+def test_odin_target_index(rule_runner):
+    """Test that Odin targets are indexed by directory and looked up from there."""
+
+    rule_runner.write_files(
+        {
+            "src/utils/helper.odin": "package utils\n",
+            "src/utils/strings.odin": "package utils\n",
+            "src/utils/BUILD": """
+odin_sources(name="sources")
+odin_package(name="utils")
+""",
+            "src/main/main.odin": 'package main\n\nimport "../utils"\n',
+            "src/main/BUILD": """
+odin_source(name="main", source="main.odin")
+""",
+        }
+    )
+
+    index = rule_runner.request(OdinTargetIndex, [])
+    assert index.packages["src/utils"] == (Address("src/utils", target_name="utils"),)
+    assert set(index.sources["src/utils"]) == {
+        Address("src/utils", target_name="sources", relative_file_path="helper.odin"),
+        Address("src/utils", target_name="sources", relative_file_path="strings.odin"),
+    }
+    assert "src/main" not in index.packages
+
+    package_target = rule_runner.get_target(Address("src/utils", target_name="utils"))
+    field_set = InferOdinPackageDependenciesRequest.infer_from.create(package_target)
+    inferred_deps = rule_runner.request(
+        InferredDependencies, [InferOdinPackageDependenciesRequest(field_set)]
+    )
+    assert set(inferred_deps.include) == set(index.sources["src/utils"])
+
+    main_target = rule_runner.get_target(Address("src/main", target_name="main"))
+    field_set = InferOdinSourceDependenciesRequest.infer_from.create(main_target)
+    inferred_deps = rule_runner.request(InferredDependencies, [InferOdinSourceDependenciesRequest(field_set)])
+    assert list(inferred_deps.include) == [Address("src/utils", target_name="utils")]
+
+
+def test_infer_odin_source_dependencies_ignores_comments_and_infers_loads(rule_runner):
+    """Test that imports in comments are ignored, and that loaded files are depended on."""
+
+    rule_runner.write_files(
+        {
+            "src/utils/helper.odin": "package utils\n",
+            "src/utils/BUILD": """
+odin_sources(name="sources")
+odin_package(name="utils")
+""",
+            "src/old/old.odin": "package old\n",
+            "src/old/BUILD": """
+odin_sources(name="sources")
+odin_package(name="old")
+""",
+            "src/main/main.odin": """package main
+
+import (
+    "core:fmt"
+    u "../utils"
+)
+// import "../old"
+
+TABLE :: #load("table.bin")
+""",
+            "src/main/table.bin": "",
+            "src/main/BUILD": """
+odin_source(name="main", source="main.odin")
+files(name="table", sources=["table.bin"])
+""",
+        }
+    )
+
+    main_target = rule_runner.get_target(Address("src/main", target_name="main"))
+    field_set = InferOdinSourceDependenciesRequest.infer_from.create(main_target)
+    inferred_deps = rule_runner.request(InferredDependencies, [InferOdinSourceDependenciesRequest(field_set)])
+    assert set(inferred_deps.include) == {
+        Address("src/utils", target_name="utils"),
+        Address("src/main", target_name="table"),
+    }
@@ -3,15 +3,15 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 from pants.core.goals.fmt import FmtResult, FmtTargetsRequest
-from pants.core.util_rules.partitions import Partition, PartitionerType, Partitions
-from pants.engine.addresses import Address
+from pants.core.util_rules.partitions import PartitionerType
+from pants.core.util_rules.system_binaries import BashBinary
 from pants.engine.fs import Digest, MergeDigests
 from pants.engine.internals.selectors import Get
 from pants.engine.platform import Platform
 from pants.engine.process import Process, ProcessResult
 from pants.engine.rules import collect_rules, rule
 from pants.engine.target import FieldSet
-from pants.util.logging import LogLevel
+from pants.util.strutil import pluralize
 from pants_backend_odin.subsystem import OdinfmtTool
 from pants_backend_odin.target_types import OdinSourceField
 from pants_backend_odin.util_rules.build import BuildOdinfmtRequest, BuildOdinfmtResult
@@ -27,38 +27,14 @@ class OdinSourceFmtFieldSet(FieldSet):
 @dataclass(frozen=True)
 class OdinSourceFmtRequest(FmtTargetsRequest):
     field_set_type = OdinSourceFmtFieldSet
-    partitioner_type = PartitionerType.CUSTOM
+    # All files go in one partition, which `pants fmt` splits into batches of `[fmt].batch_size`
+    # files, each formatted by a single process.
+    partitioner_type = PartitionerType.DEFAULT_SINGLE_PARTITION
     tool_subsystem = OdinfmtTool
 
 
-@dataclass(frozen=True)
-class PackageMetadata:
-    address: Address
-
-    @property
-    def description(self) -> None:
-        return None
-
-
-@rule(level=LogLevel.DEBUG, desc="Partition Odin source files for formatting")
-async def partition_odin_sources(
-    request: OdinSourceFmtRequest.PartitionRequest[OdinSourceFmtFieldSet], odinfmt: OdinfmtTool
-) -> Partitions[OdinSourceFmtFieldSet, None]:
-    if odinfmt.skip:
-        return Partitions()
-
-    partitions = []
-    for field_set in request.field_sets:
-        partitions.append(
-            Partition(
-                frozenset([field_set.source.file_path]),
-                PackageMetadata(
-                    address=field_set.address,
-                ),
-            )
-        )
-
-    return Partitions(partitions)
+# odinfmt formats a single path per invocation, so a batch is formatted by looping over its files.
+_FORMAT_FILES_SCRIPT = 'set -e; odinfmt="$1"; shift; for file in "$@"; do "$odinfmt" -w "$file"; done'
 
 
 @rule
@@ -66,6 +42,7 @@ async def odin_source_fmt(
     request: OdinSourceFmtRequest.Batch[OdinSourceFmtFieldSet],
     odinfmt: OdinfmtTool,
     platform: Platform,
+    bash: BashBinary,
 ) -> FmtResult:
     build_odinfmt_result = await Get(BuildOdinfmtResult, BuildOdinfmtRequest, BuildOdinfmtRequest(platform))
 
@@ -80,14 +57,14 @@ async def odin_source_fmt(
     )
 
     # Run odinfmt on the files
-    argv = [build_odinfmt_result.exe_path, "-w"] + list(request.files)
+    argv = [bash.path, "-c", _FORMAT_FILES_SCRIPT, "odinfmt", build_odinfmt_result.exe_path, *request.files]
 
     process_result = await Get(
         ProcessResult,
         Process(
             argv=argv,
             input_digest=input_digest,
-            description="Format Odin files with odinfmt",
+            description=f"Format {pluralize(len(request.files), 'Odin file')} with odinfmt",
             output_files=request.files,
         ),
     )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Any
 
 from pants.core.goals.package import (
     BuiltPackage,
@@ -15,6 +16,7 @@ from pants.core.util_rules.system_binaries import (
     BinaryShimsRequest,
     SystemBinariesSubsystem,
 )
+from pants.engine.engine_aware import EngineAwareReturnType
 from pants.engine.fs import Digest, MergeDigests
 from pants.engine.internals.selectors import Get
 from pants.engine.platform import Platform
@@ -23,8 +25,73 @@ from pants.engine.rules import collect_rules, rule
 from pants.engine.target import TransitiveTargets, TransitiveTargetsRequest
 from pants.engine.unions import UnionRule
 from pants.util.logging import LogLevel
-from pants_backend_odin.subsystem import OdinTool
-from pants_backend_odin.target_types import OdinDefinesField, OdinDependenciesField, OdinSourceField
+from pants_backend_odin.subsystem import OdinBuildProfile, OdinTool
+from pants_backend_odin.target_types import (
+    OdinBuildProfileField,
+    OdinDebugField,
+    OdinDefinesField,
+    OdinDependenciesField,
+    OdinLtoField,
+    OdinMicroarchField,
+    OdinOptimizationField,
+    OdinSeparateModulesField,
+    OdinSourceField,
+)
+
+
+@dataclass(frozen=True)
+class OdinBuildSettings:
+    """Compiler settings that trade build time for the performance of the result."""
+
+    optimization: str | None = None
+    debug: bool = False
+    separate_modules: bool = False
+    microarch: str | None = None
+    lto: str | None = None
+
+    def argv(self) -> tuple[str, ...]:
+        args = []
+        if self.optimization:
+            args.append(f"-o:{self.optimization}")
+        if self.debug:
+            args.append("-debug")
+        if self.separate_modules:
+            args.append("-use-separate-modules")
+        if self.microarch:
+            args.append(f"-microarch:{self.microarch}")
+        if self.lto and self.lto != "none":
+            args.append(f"-lto:{self.lto}")
+        return tuple(args)
+
+
+def odin_build_settings(
+    odin: OdinTool,
+    profile: OdinBuildProfileField,
+    optimization: OdinOptimizationField,
+    debug: OdinDebugField,
+    separate_modules: OdinSeparateModulesField,
+    microarch: OdinMicroarchField,
+    lto: OdinLtoField,
+) -> OdinBuildSettings:
+    """Resolves the settings of a target, falling back to the defaults of its build profile."""
+    build_profile = OdinBuildProfile(profile.value) if profile.value else odin.build_profile
+    if build_profile == OdinBuildProfile.release:
+        defaults = OdinBuildSettings(
+            optimization="speed", microarch=odin.release_microarch, lto=odin.release_lto
+        )
+    elif build_profile == OdinBuildProfile.dev:
+        defaults = OdinBuildSettings(optimization="none", debug=True, separate_modules=True)
+    else:
+        defaults = OdinBuildSettings()
+
+    separate = separate_modules.value
+    return OdinBuildSettings(
+        optimization=optimization.value or defaults.optimization,
+        debug=defaults.debug if debug.value is None else debug.value,
+        separate_modules=defaults.separate_modules if separate is None else separate,
+        microarch=microarch.value or defaults.microarch,
+        lto=lto.value or defaults.lto,
+    )
 
 
 @dataclass(frozen=True)
@@ -37,14 +104,21 @@ class OdinBuildRequest:
     directory: str
     output_path: str
     mode: str = "exe"  # exe, test, dll, etc.
+    settings: OdinBuildSettings = OdinBuildSettings()
 
 
 @dataclass(frozen=True)
-class OdinBuildResult:
+class OdinBuildResult(EngineAwareReturnType):
     """Result of building an Odin package."""
 
     digest: Digest
     success: bool
+    compile_time_ms: int | None = None
+    flags: tuple[str, ...] = ()
+
+    def metadata(self) -> dict[str, Any] | None:
+        # The time is that of the run that produced the result, so cached builds report it too.
+        return {"compile_time_ms": self.compile_time_ms, "flags": list(self.flags)}
 
 
 @dataclass(frozen=True)
@@ -54,6 +128,12 @@ class OdinPackageFieldSet(PackageFieldSet):
     dependencies: OdinDependenciesField
     defines: OdinDefinesField
     output_path: OutputPathField
+    profile: OdinBuildProfileField
+    optimization: OdinOptimizationField
+    debug: OdinDebugField
+    separate_modules: OdinSeparateModulesField
+    microarch: OdinMicroarchField
+    lto: OdinLtoField
 
 
 @rule(level=LogLevel.DEBUG, desc="Build Odin package")
@@ -108,6 +188,11 @@ async def build_odin_package(
     for define in request.defines:
         argv.append(f"-define:{define}")
 
+    flags = request.settings.argv()
+    if odin.thread_count:
+        flags += (f"-thread-count:{odin.thread_count}",)
+    argv.extend(flags)
+
     # Add output flag to build binary in current directory
     argv.append(f"-out:{request.output_path}")
 
@@ -128,11 +213,13 @@ async def build_odin_package(
     return OdinBuildResult(
         digest=process_result.output_digest,
         success=True,
+        compile_time_ms=process_result.metadata.total_elapsed_ms,
+        flags=flags,
     )
 
 
 @rule(desc="Package Odin application")
-async def package_odin_application(field_set: OdinPackageFieldSet) -> BuiltPackage:
+async def package_odin_application(field_set: OdinPackageFieldSet, odin: OdinTool) -> BuiltPackage:
     """Package an Odin application by building it with the Odin compiler."""
 
     # Get the dependencies of the odin_package target to find the source files
@@ -169,6 +256,15 @@ async def package_odin_application(field_set: OdinPackageFieldSet) -> BuiltPacka
         defines=tuple(field_set.defines.value or ()),
         directory=directory,
         output_path=field_set.output_path.value_or_default(file_ending=""),
+        settings=odin_build_settings(
+            odin,
+            field_set.profile,
+            field_set.optimization,
+            field_set.debug,
+            field_set.separate_modules,
+            field_set.microarch,
+            field_set.lto,
+        ),
     )
 
     # Build the package
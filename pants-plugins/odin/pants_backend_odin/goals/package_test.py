@@ -4,9 +4,16 @@ from pants.core.goals.package import rules as core_package_rules
 from pants.core.util_rules import config_files, external_tool, source_files
 from pants.engine.addresses import Address
 from pants.engine.internals import graph
+from pants.engine.rules import QueryRule
 from pants.testutil.rule_runner import RuleRunner
 from pants_backend_odin import target_types as odin_target_types
-from pants_backend_odin.goals.package import OdinBuildRequest, OdinBuildResult, OdinPackageFieldSet
+from pants_backend_odin.goals.package import (
+    OdinBuildRequest,
+    OdinBuildResult,
+    OdinBuildSettings,
+    OdinPackageFieldSet,
+    odin_build_settings,
+)
 from pants_backend_odin.goals.package import rules as odin_package_rules
 from pants_backend_odin.subsystem import OdinTool
 from pants_backend_odin.target_types import (
@@ -163,3 +170,78 @@ def test_odin_defines_field_validation():
 
     assert OdinDefinesField.alias == "defines"
     assert "build-time defines" in OdinDefinesField.help.lower()
+
+
+def test_odin_build_settings_argv():
+    """Test that build settings are passed as compiler flags."""
+    assert OdinBuildSettings().argv() == ()
+    assert OdinBuildSettings(optimization="none", debug=True, separate_modules=True).argv() == (
+        "-o:none",
+        "-debug",
+        "-use-separate-modules",
+    )
+    assert OdinBuildSettings(optimization="speed", microarch="native", lto="thin").argv() == (
+        "-o:speed",
+        "-microarch:native",
+        "-lto:thin",
+    )
+    assert OdinBuildSettings(lto="none").argv() == ()
+
+
+def test_odin_build_settings_profiles():
+    """Test that build settings fall back to the profile of the target, then of the subsystem."""
+    rule_runner = RuleRunner(
+        rules=[
+            *odin_package_rules(),
+            *odin_target_types.rules(),
+            *external_tool.rules(),
+            *OdinTool.rules(),
+            QueryRule(OdinTool, []),
+        ],
+        target_types=[OdinBinaryTarget],
+    )
+    rule_runner.write_files(
+        {
+            "src/BUILD": """
+odin_binary(name="default")
+odin_binary(name="dev", profile="dev")
+odin_binary(name="release", profile="release", lto="none")
+odin_binary(name="debug_release", profile="release", debug=True, optimization="size")
+odin_binary(name="monolithic", separate_modules=False)
+""",
+        }
+    )
+    rule_runner.set_options(["--odin-release-microarch=native", "--odin-release-lto=thin"])
+    odin = rule_runner.request(OdinTool, [])
+
+    def settings(name: str) -> OdinBuildSettings:
+        field_set = OdinPackageFieldSet.create(rule_runner.get_target(Address("src", target_name=name)))
+        return odin_build_settings(
+            odin,
+            field_set.profile,
+            field_set.optimization,
+            field_set.debug,
+            field_set.separate_modules,
+            field_set.microarch,
+            field_set.lto,
+        )
+
+    assert settings("default") == OdinBuildSettings()
+    assert settings("dev") == OdinBuildSettings(optimization="none", debug=True, separate_modules=True)
+    assert settings("release") == OdinBuildSettings(optimization="speed", microarch="native", lto="none")
+    assert settings("debug_release") == OdinBuildSettings(
+        optimization="size", debug=True, microarch="native", lto="thin"
+    )
+    assert settings("monolithic") == OdinBuildSettings()
+
+    rule_runner.set_options(["--odin-build-profile=release"])
+    odin = rule_runner.request(OdinTool, [])
+    assert settings("default") == OdinBuildSettings(optimization="speed")
+
+
+def test_odin_build_result_metadata():
+    """Test that the compile time and flags are reported as workunit metadata."""
+    from pants.engine.fs import EMPTY_DIGEST
+
+    result = OdinBuildResult(EMPTY_DIGEST, success=True, compile_time_ms=1200, flags=("-o:none", "-debug"))
+    assert result.metadata() == {"compile_time_ms": 1200, "flags": ["-o:none", "-debug"]}
@@ -11,9 +11,19 @@ from pants.engine.process import FallibleProcessResult, Process
 from pants.engine.rules import collect_rules, rule
 from pants.engine.target import FieldSet, TransitiveTargets, TransitiveTargetsRequest
 from pants.util.logging import LogLevel
-from pants_backend_odin.goals.package import OdinBuildRequest, OdinBuildResult
+from pants_backend_odin.goals.package import OdinBuildRequest, OdinBuildResult, odin_build_settings
 from pants_backend_odin.subsystem import OdinTool
-from pants_backend_odin.target_types import OdinDefinesField, OdinDependenciesField, OdinSourceField
+from pants_backend_odin.target_types import (
+    OdinBuildProfileField,
+    OdinDebugField,
+    OdinDefinesField,
+    OdinDependenciesField,
+    OdinLtoField,
+    OdinMicroarchField,
+    OdinOptimizationField,
+    OdinSeparateModulesField,
+    OdinSourceField,
+)
 
 
 @dataclass(frozen=True)
@@ -22,6 +32,12 @@ class OdinTestFieldSet(FieldSet):
 
     dependencies: OdinDependenciesField
     defines: OdinDefinesField
+    profile: OdinBuildProfileField
+    optimization: OdinOptimizationField
+    debug: OdinDebugField
+    separate_modules: OdinSeparateModulesField
+    microarch: OdinMicroarchField
+    lto: OdinLtoField
 
 
 @dataclass(frozen=True)
@@ -87,6 +103,15 @@ async def run_odin_tests(
         directory=directory,
         output_path=test_executable,
         mode="test",
+        settings=odin_build_settings(
+            odin,
+            field_set.profile,
+            field_set.optimization,
+            field_set.debug,
+            field_set.separate_modules,
+            field_set.microarch,
+            field_set.lto,
+        ),
     )
 
     # Build the test
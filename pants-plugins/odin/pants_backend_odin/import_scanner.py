@@ -0,0 +1,185 @@
+"""
+A minimal Odin lexer for finding what a file refers to.
+
+Only the tokens needed to recognise imports are produced: identifiers, string literals, directives
+such as `#load`, and brackets and separators. Comments, including nested block comments, and the
+contents of strings and runes are skipped, so an `import` inside either is not picked up.
+"""
+
+from __future__ import annotations
+
+import posixpath
+from dataclasses import dataclass
+from typing import Iterator, NamedTuple
+
+_IDENTIFIER_START = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_")
+_IDENTIFIER = _IDENTIFIER_START | frozenset("0123456789")
+_PUNCTUATION = frozenset("(){},;")
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "\\": "\\", '"': '"', "'": "'", "0": "\0"}
+_LOAD_DIRECTIVES = frozenset({"#load", "#load_hash"})
+
+
+class Token(NamedTuple):
+    kind: str  # "identifier", "string", "directive" or "punctuation"
+    value: str
+
+
+def tokenize(text: str) -> Iterator[Token]:
+    """Yields the tokens of `text` that matter for imports, skipping everything else."""
+    position = 0
+    length = len(text)
+    while position < length:
+        char = text[position]
+
+        if text.startswith("//", position):
+            newline = text.find("\n", position)
+            position = length if newline == -1 else newline
+        elif text.startswith("/*", position):
+            # Block comments nest.
+            depth = 0
+            while position < length:
+                if text.startswith("/*", position):
+                    depth += 1
+                    position += 2
+                elif text.startswith("*/", position):
+                    depth -= 1
+                    position += 2
+                    if depth == 0:
+                        break
+                else:
+                    position += 1
+        elif char == '"':
+            value = []
+            position += 1
+            while position < length and text[position] != '"' and text[position] != "\n":
+                if text[position] == "\\" and position + 1 < length:
+                    value.append(_ESCAPES.get(text[position + 1], text[position + 1]))
+                    position += 2
+                else:
+                    value.append(text[position])
+                    position += 1
+            position += 1
+            yield Token("string", "".join(value))
+        elif char == "`":
+            end = text.find("`", position + 1)
+            end = length if end == -1 else end
+            yield Token("string", text[position + 1 : end])
+            position = end + 1
+        elif char == "'":
+            # A rune; only its escapes need care, as `'\''` contains a quote.
+            position += 1
+            while position < length and text[position] not in "'\n":
+                position += 2 if text[position] == "\\" else 1
+            position += 1
+        elif char in _IDENTIFIER_START or (char == "#" and position + 1 < length):
+            start = position
+            position += 1
+            while position < length and text[position] in _IDENTIFIER:
+                position += 1
+            yield Token("directive" if char == "#" else "identifier", text[start:position])
+        elif char in _PUNCTUATION:
+            yield Token("punctuation", char)
+            position += 1
+        elif char.isdigit():
+            # Numbers may contain letters, e.g. `0x1f` or `1e10`, which are not identifiers.
+            while position < length and (text[position] in _IDENTIFIER or text[position] == "."):
+                position += 1
+        else:
+            position += 1
+
+
+@dataclass(frozen=True)
+class OdinFileImports:
+    """What an Odin file refers to, in order of appearance.
+
+    `imports` and `foreign_imports` hold paths as written, including collection paths such as
+    `core:fmt`. `loads` holds the files of `#load` and `#load_hash`, and `load_directories` those of
+    `#load_directory`.
+    """
+
+    imports: tuple[str, ...] = ()
+    foreign_imports: tuple[str, ...] = ()
+    loads: tuple[str, ...] = ()
+    load_directories: tuple[str, ...] = ()
+
+    @property
+    def packages(self) -> tuple[str, ...]:
+        """Imports of packages relative to the file, rather than from a collection."""
+        return tuple(path for path in self.imports if ":" not in path)
+
+    @property
+    def collections(self) -> tuple[str, ...]:
+        """The collections referred to, e.g. `core` for `import "core:fmt"`."""
+        paths = (*self.imports, *self.foreign_imports)
+        return tuple(dict.fromkeys(path.split(":", 1)[0] for path in paths if ":" in path))
+
+
+def _import_paths(
+    tokens: list[Token], start: int, open_bracket: str, close_bracket: str
+) -> tuple[list[str], int]:
+    """Collects the string paths of a single import, or of a bracketed block of them."""
+    position = start
+    if position < len(tokens) and tokens[position].kind == "identifier":
+        position += 1  # The name the package or library is imported as.
+
+    if position >= len(tokens):
+        return [], position
+
+    token = tokens[position]
+    if token.kind == "string":
+        return [token.value], position + 1
+
+    if token != Token("punctuation", open_bracket):
+        return [], position
+
+    paths = []
+    position += 1
+    while position < len(tokens) and tokens[position] != Token("punctuation", close_bracket):
+        if tokens[position].kind == "string":
+            paths.append(tokens[position].value)
+        position += 1
+    return paths, position + 1
+
+
+def scan_odin_imports(text: str) -> OdinFileImports:
+    """Finds the imports, foreign imports and loaded files of an Odin source file."""
+    tokens = list(tokenize(text))
+    imports: list[str] = []
+    foreign_imports: list[str] = []
+    loads: list[str] = []
+    load_directories: list[str] = []
+
+    position = 0
+    while position < len(tokens):
+        token = tokens[position]
+        if token == Token("identifier", "foreign") and tokens[position + 1 : position + 2] == [
+            Token("identifier", "import")
+        ]:
+            paths, position = _import_paths(tokens, position + 2, "{", "}")
+            foreign_imports.extend(paths)
+        elif token == Token("identifier", "import"):
+            paths, position = _import_paths(tokens, position + 1, "(", ")")
+            imports.extend(paths)
+        elif (
+            token.kind == "directive"
+            and tokens[position + 1 : position + 2] == [Token("punctuation", "(")]
+            and position + 2 < len(tokens)
+            and tokens[position + 2].kind == "string"
+        ):
+            if token.value in _LOAD_DIRECTIVES:
+                loads.append(tokens[position + 2].value)
+            elif token.value == "#load_directory":
+                load_directories.append(tokens[position + 2].value)
+            position += 3
+        else:
+            position += 1
+
+    return OdinFileImports(tuple(imports), tuple(foreign_imports), tuple(loads), tuple(load_directories))
+
+
+def resolve_relative_path(path: str, file_path: str) -> str | None:
+    """Resolves a path written in `file_path` against its directory, if it stays within the build root."""
+    resolved = posixpath.normpath(posixpath.join(posixpath.dirname(file_path), path))
+    if resolved == ".." or resolved.startswith("../") or posixpath.isabs(resolved):
+        return None
+    return resolved
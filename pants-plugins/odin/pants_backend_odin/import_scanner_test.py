@@ -0,0 +1,80 @@
+from pants_backend_odin.import_scanner import (
+    OdinFileImports,
+    Token,
+    resolve_relative_path,
+    scan_odin_imports,
+    tokenize,
+)
+
+
+def test_tokenize_skips_comments_strings_and_runes():
+    """Test that only code outside comments, strings and runes is tokenized."""
+
+    content = r"""
+// import "line/comment"
+/* import "block" /* nested */ import "still/comment" */
+x := "import \"escaped\""
+y := '\''
+z := `raw
+string`
+n := 0x1f
+#load("data.txt")
+"""
+
+    assert [token for token in tokenize(content) if token.kind != "identifier"] == [
+        Token("string", 'import "escaped"'),
+        Token("string", "raw\nstring"),
+        Token("directive", "#load"),
+        Token("punctuation", "("),
+        Token("string", "data.txt"),
+        Token("punctuation", ")"),
+    ]
+    assert [token.value for token in tokenize(content) if token.kind == "identifier"] == ["x", "y", "z", "n"]
+
+
+def test_scan_odin_imports():
+    """Test finding imports, import blocks, foreign imports and loads."""
+
+    content = """package main
+
+import "core:fmt"
+import util "../util" // import "commented"
+import (
+    "shared:lib"
+    m "./math"
+)
+@(require) import "vendor:raylib"
+
+/* import "nope" */
+foreign import libc "system:c"
+foreign import mylib {
+    "lib/mylib.a",
+    LIB_FLAGS,
+}
+
+DATA :: #load("data/table.bin", []u8)
+HASH :: #load_hash("data/table.bin", "crc32")
+FILES :: #load_directory("assets")
+
+main :: proc() {
+    fmt.println("import \\"not/this\\"")
+}
+"""
+
+    imports = scan_odin_imports(content)
+    assert imports == OdinFileImports(
+        imports=("core:fmt", "../util", "shared:lib", "./math", "vendor:raylib"),
+        foreign_imports=("system:c", "lib/mylib.a"),
+        loads=("data/table.bin", "data/table.bin"),
+        load_directories=("assets",),
+    )
+    assert imports.packages == ("../util", "./math")
+    assert imports.collections == ("core", "shared", "vendor", "system")
+
+
+def test_resolve_relative_path():
+    """Test resolving paths relative to the file they are written in."""
+
+    assert resolve_relative_path("data/table.bin", "src/main/main.odin") == "src/main/data/table.bin"
+    assert resolve_relative_path("../lib/a.lib", "src/main/main.odin") == "src/lib/a.lib"
+    assert resolve_relative_path("../../../outside", "src/main/main.odin") is None
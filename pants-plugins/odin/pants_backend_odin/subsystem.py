@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from pants.core.util_rules.external_tool import ExternalTool
+from enum import Enum
+
+from pants.core.util_rules.external_tool import ExternalTool, TemplatedExternalTool
 from pants.engine.platform import Platform
-from pants.option.option_types import BoolOption
-from pants.option.subsystem import Subsystem
+from pants.option.option_types import BoolOption, EnumOption, IntOption, StrOption
 from pants.util.strutil import softwrap
 
 PLATFORM_MAPPING = {
@@ -13,6 +14,12 @@ PLATFORM_MAPPING = {
 }
 
 
+class OdinBuildProfile(Enum):
+    default = "default"
+    dev = "dev"
+    release = "release"
+
+
 class OdinTool(ExternalTool):
     options_scope = "odin"
     help = "Wrapper for Odin compiler and tools."
@@ -35,6 +42,46 @@ class OdinTool(ExternalTool):
         advanced=True,
     )
 
+    build_profile = EnumOption(
+        default=OdinBuildProfile.default,
+        help=softwrap("""
+            The build profile to compile `odin_binary`, `odin_package` and `odin_test` targets with,
+            unless their `profile` field is set.
+
+            The `default` profile passes no flags, so the compiler's own defaults apply. The `dev`
+            profile compiles without optimizations, with debug information and with
+            `-use-separate-modules`, which makes each build faster; there is no incremental
+            compilation, as every build starts from a fresh sandbox. The `release` profile compiles
+            with `-o:speed` as a single module, plus `release_microarch` and `release_lto`.
+            """),
+    )
+
+    thread_count = IntOption(
+        default=None,
+        help=softwrap("""
+            The number of threads the compiler uses, passed as `-thread-count`. If unset, the
+            compiler uses one per core, which may oversubscribe the machine when Pants runs several
+            builds at once.
+            """),
+        advanced=True,
+    )
+
+    release_microarch = StrOption(
+        default=None,
+        help=softwrap("""
+            The microarchitecture to compile release builds for, passed as `-microarch`, e.g.
+            `native`. Binaries built for a specific microarchitecture may not run on other machines.
+            """),
+    )
+
+    release_lto = StrOption(
+        default=None,
+        help=softwrap("""
+            The kind of link time optimization for release builds, `thin` or `full`, passed as
+            `-lto`. Requires an Odin version that supports it.
+            """),
+    )
+
     def generate_url(self, plat: Platform) -> str:
         plat_str = PLATFORM_MAPPING[plat.value]
         base = "https://github.com/odin-lang/Odin/releases/download"
@@ -45,11 +92,59 @@ class OdinTool(ExternalTool):
         return f"odin-{plat_str}-{self.version}/odin"
 
 
-class OdinfmtTool(Subsystem):
+_ARCHIVE_EXTENSIONS = (".zip", ".tar.gz", ".tgz", ".tar.xz", ".tar.bz2")
+
+
+class OdinfmtTool(TemplatedExternalTool):
     options_scope = "odinfmt"
-    help = "Wrapper for odinfmt formatter from OLS repository."
+    help = softwrap("""
+        Wrapper for odinfmt formatter from OLS repository.
+
+        A prebuilt `odinfmt` is downloaded if `known_versions` and `url_template` are set. Otherwise
+        it is built from OLS, either from `ols_source` or from `ols_revision` of `ols_repository`,
+        once per revision, Odin version and platform; the result is kept in the process cache.
+        """)
+
+    default_version = ""
+    default_known_versions: list[str] = []
+    default_url_template = ""
+    default_url_platform_mapping = PLATFORM_MAPPING
 
     skip = BoolOption(
         default=False,
         help=softwrap("""If true, don't use odinfmt when running `pants fmt`."""),
     )
+
+    ols_repository = StrOption(
+        default="https://github.com/DanielGavin/ols.git",
+        help="The git repository to build `odinfmt` from, e.g. a mirror.",
+        advanced=True,
+    )
+
+    ols_revision = StrOption(
+        default=None,
+        help=softwrap("""
+            The OLS commit to build `odinfmt` from. If unset, the tip of the default branch is built
+            the first time and reused until the process cache is cleared, so pin a commit for
+            reproducible formatting.
+            """),
+    )
+
+    ols_source = StrOption(
+        default=None,
+        help=softwrap("""
+            A directory with the OLS sources to build `odinfmt` from, relative to the build root,
+            instead of cloning `ols_repository`. It is only rebuilt when its content changes.
+            """),
+        advanced=True,
+    )
+
+    @property
+    def prebuilt(self) -> bool:
+        return bool(self.known_versions and self.url_template)
+
+    def generate_exe(self, plat: Platform) -> str:
+        url = self.generate_url(plat)
+        if url.endswith(_ARCHIVE_EXTENSIONS):
+            return "./odinfmt"
+        return super().generate_exe(plat)
@@ -4,7 +4,7 @@ from pants.core.util_rules.external_tool import DownloadedExternalTool, External
 from pants.engine.platform import Platform
 from pants.engine.rules import QueryRule
 from pants.testutil.rule_runner import RuleRunner
-from pants_backend_odin.subsystem import OdinTool
+from pants_backend_odin.subsystem import OdinfmtTool, OdinTool
 
 
 @pytest.fixture
@@ -13,8 +13,10 @@ def rule_runner() -> RuleRunner:
         rules=[
             *external_tool.rules(),
             *OdinTool.rules(),
+            *OdinfmtTool.rules(),
             QueryRule(DownloadedExternalTool, [ExternalToolRequest]),
             QueryRule(OdinTool, []),
+            QueryRule(OdinfmtTool, []),
         ]
     )
 
@@ -45,3 +47,29 @@ def test_odin_url_generation(rule_runner):
         "https://github.com/odin-lang/Odin/releases/download/dev-2025-07/odin-macos-arm64-dev-2025-07.tar.gz"
     )
     assert macos_url == expected
+
+
+def test_odinfmt_tool_builds_by_default(rule_runner):
+    """Test that odinfmt is built from OLS unless a prebuilt binary is configured."""
+
+    odinfmt = rule_runner.request(OdinfmtTool, [])
+    assert not odinfmt.prebuilt
+    assert odinfmt.ols_revision is None
+    assert odinfmt.ols_repository == "https://github.com/DanielGavin/ols.git"
+
+
+def test_odinfmt_tool_prebuilt(rule_runner):
+    """Test that a prebuilt odinfmt is used when known versions and a URL are configured."""
+
+    rule_runner.set_options(
+        [
+            "--odinfmt-version=2025-07",
+            "--odinfmt-known-versions=['2025-07|linux_x86_64|" + "0" * 64 + "|1000']",
+            "--odinfmt-url-template=https://example.com/odinfmt-{version}-{platform}.tar.gz",
+        ]
+    )
+    odinfmt = rule_runner.request(OdinfmtTool, [])
+    assert odinfmt.prebuilt
+    url = odinfmt.generate_url(Platform.linux_x86_64)
+    assert url == "https://example.com/odinfmt-2025-07-linux-amd64.tar.gz"
+    assert odinfmt.generate_exe(Platform.linux_x86_64) == "./odinfmt"
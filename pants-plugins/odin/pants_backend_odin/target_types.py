@@ -15,6 +15,7 @@ from pants.engine.target import (
     StringSequenceField,
     Target,
     TargetFilesGenerator,
+    TriBoolField,
 )
 from pants.util.strutil import softwrap
 
@@ -56,6 +57,86 @@ class OdinDefinesField(StringSequenceField):
         """)
 
 
+class OdinBuildProfileField(StringField):
+    """The build profile whose defaults to compile with."""
+
+    alias = "profile"
+    valid_choices = ("default", "dev", "release")
+    help = softwrap("""
+        The build profile to compile with, overriding `[odin].build_profile`.
+
+        The `default` profile passes no flags, so the compiler's own defaults apply. The `dev` profile
+        compiles without optimizations, with debug information and with `-use-separate-modules`, which
+        makes each build faster. The `release` profile compiles with `-o:speed` as a single module,
+        and with `[odin].release_microarch` and `[odin].release_lto` if set.
+
+        The `optimization`, `debug`, `separate_modules`, `microarch` and `lto` fields override single
+        settings of the profile.
+        """)
+
+
+class OdinOptimizationField(StringField):
+    """The optimization level passed as `-o`."""
+
+    alias = "optimization"
+    valid_choices = ("none", "minimal", "size", "speed", "aggressive")
+    help = softwrap("""
+        The optimization level to compile with, passed as `-o:<level>`. Defaults to that of the build
+        profile.
+        """)
+
+
+class OdinDebugField(TriBoolField):
+    """Whether to compile with `-debug`."""
+
+    alias = "debug"
+    help = softwrap("""
+        Whether to compile with debug information, passed as `-debug`. Defaults to that of the build
+        profile.
+        """)
+
+
+class OdinSeparateModulesField(TriBoolField):
+    """Whether to compile with `-use-separate-modules`."""
+
+    alias = "separate_modules"
+    help = softwrap("""
+        Whether to compile each package as a separate module with `-use-separate-modules`, which
+        makes compiling faster but the result less optimized. Defaults to that of the build profile.
+        """)
+
+
+class OdinMicroarchField(StringField):
+    """The target microarchitecture passed as `-microarch`."""
+
+    alias = "microarch"
+    help = softwrap("""
+        The microarchitecture to compile for, passed as `-microarch:<name>`, e.g. `native`. Defaults
+        to `[odin].release_microarch` for release builds.
+        """)
+
+
+class OdinLtoField(StringField):
+    """The kind of link time optimization passed as `-lto`."""
+
+    alias = "lto"
+    valid_choices = ("none", "thin", "full")
+    help = softwrap("""
+        The kind of link time optimization to do, passed as `-lto:<kind>`. Defaults to
+        `[odin].release_lto` for release builds.
+        """)
+
+
+ODIN_BUILD_FIELDS = (
+    OdinBuildProfileField,
+    OdinOptimizationField,
+    OdinDebugField,
+    OdinSeparateModulesField,
+    OdinMicroarchField,
+    OdinLtoField,
+)
+
+
 class _OdinPackageMarkerField(StringField):
     """Build-time defines for Odin compilation."""
 
@@ -103,6 +184,7 @@ class OdinPackageTarget(Target):
         *COMMON_TARGET_FIELDS,
         OdinDependenciesField,
         OdinDefinesField,
+        *ODIN_BUILD_FIELDS,
         _OdinPackageMarkerField,
     )
     help = softwrap("""
@@ -159,6 +241,7 @@ class OdinTestTarget(Target):
         *COMMON_TARGET_FIELDS,
         OdinDependenciesField,
         OdinDefinesField,
+        *ODIN_BUILD_FIELDS,
     )
     help = softwrap("""
         An Odin test target that represents test files in a directory.
@@ -182,6 +265,7 @@ class OdinBinaryTarget(Target):
         *COMMON_TARGET_FIELDS,
         OdinDependenciesField,
         OdinDefinesField,
+        *ODIN_BUILD_FIELDS,
         OutputPathField,
     )
 
@@ -196,6 +280,7 @@ class OdinBinaryTarget(Target):
                 name="mybinary",
                 output_path="bin/mybinary",
                 defines=["DEBUG=true"],
+                profile="release",
             )
         """)
 
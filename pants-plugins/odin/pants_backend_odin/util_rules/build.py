@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import shlex
 from dataclasses import dataclass
 
 from pants.core.util_rules.external_tool import DownloadedExternalTool, ExternalToolRequest
@@ -8,13 +9,13 @@ from pants.core.util_rules.system_binaries import (
     BinaryShimsRequest,
     SystemBinariesSubsystem,
 )
-from pants.engine.fs import Digest, MergeDigests
+from pants.engine.fs import EMPTY_DIGEST, Digest, MergeDigests, PathGlobs
 from pants.engine.internals.selectors import Get
 from pants.engine.platform import Platform
 from pants.engine.process import Process, ProcessResult
 from pants.engine.rules import collect_rules, rule
 from pants.util.logging import LogLevel
-from pants_backend_odin.subsystem import OdinTool
+from pants_backend_odin.subsystem import OdinfmtTool, OdinTool
 
 
 @dataclass(frozen=True)
@@ -36,9 +37,16 @@ class BuildOdinfmtResult:
 async def build_odinfmt(
     request: BuildOdinfmtRequest,
     odin: OdinTool,
+    odinfmt: OdinfmtTool,
     system_binaries_environment: SystemBinariesSubsystem.EnvironmentAware,
 ) -> BuildOdinfmtResult:
-    """Build odinfmt from the OLS repository."""
+    """Build odinfmt from the OLS repository, or download a prebuilt one if configured."""
+
+    if odinfmt.prebuilt:
+        downloaded_odinfmt = await Get(
+            DownloadedExternalTool, ExternalToolRequest, odinfmt.get_request(request.platform)
+        )
+        return BuildOdinfmtResult(digest=downloaded_odinfmt.digest, exe_path=downloaded_odinfmt.exe)
 
     # Get required system binaries
     binary_shims = await Get(
@@ -63,17 +71,30 @@ async def build_odinfmt(
         DownloadedExternalTool, ExternalToolRequest, odin.get_request(request.platform)
     )
 
+    # The process cache is keyed by the inputs, so odinfmt is built once per OLS revision or source
+    # content, Odin version and platform.
+    if odinfmt.ols_source:
+        source_digest = await Get(Digest, PathGlobs([f"{odinfmt.ols_source}/**"]))
+        checkout = f"cd {shlex.quote(odinfmt.ols_source)}"
+        description = f"Build odinfmt from {odinfmt.ols_source}"
+    else:
+        source_digest = EMPTY_DIGEST
+        checkout = f"git clone --quiet {shlex.quote(odinfmt.ols_repository)} ols && cd ols"
+        if odinfmt.ols_revision:
+            checkout += f" && git checkout --quiet {shlex.quote(odinfmt.ols_revision)}"
+        description = f"Clone OLS {odinfmt.ols_revision or 'at the tip'} and build odinfmt"
+
     input_digest = await Get(
         Digest,
         MergeDigests(
             [
                 downloaded_odin.digest,
                 binary_shims.digest,
+                source_digest,
             ]
         ),
     )
 
-    # Clone the OLS repository and build odinfmt
     process_result = await Get(
         ProcessResult,
         Process(
@@ -84,15 +105,13 @@ async def build_odinfmt(
                 set -e
                 DIR=$(pwd)
                 export PATH="$DIR/$(dirname "{downloaded_odin.exe}"):$PATH"
-                git clone https://github.com/DanielGavin/ols.git
-                pushd ols
+                {checkout}
                 ./odinfmt.sh
-                cp odinfmt ..
-                popd
+                cp odinfmt "$DIR"
                 """,
             ],
             input_digest=input_digest,
-            description="Clone OLS and build odinfmt",
+            description=description,
             output_files=("./odinfmt",),
             env={"PATH": f"{binary_shims.path_component}"},
             immutable_input_digests={
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from pants.core.util_rules.external_tool import DownloadedExternalTool, ExternalToolRequest
+from pants.core.util_rules.system_binaries import BinaryShims, BinaryShimsRequest
+from pants.engine.fs import EMPTY_DIGEST, Digest, DownloadFile, FileDigest, MergeDigests, PathGlobs
+from pants.engine.platform import Platform
+from pants.engine.process import Process, ProcessResult
+from pants.testutil.option_util import create_subsystem
+from pants.testutil.rule_runner import MockGet, run_rule_with_mocks
+from pants_backend_odin.subsystem import OdinfmtTool
+from pants_backend_odin.util_rules.build import BuildOdinfmtRequest, build_odinfmt
+
+
+def _build_process(
+    ols_revision: str | None = None, ols_source: str | None = None
+) -> tuple[Process, list[PathGlobs]]:
+    """Runs `build_odinfmt` with the given OLS options, returning its build process."""
+    odinfmt = create_subsystem(
+        OdinfmtTool,
+        known_versions=[],
+        url_template="",
+        ols_repository="https://github.com/DanielGavin/ols.git",
+        ols_revision=ols_revision,
+        ols_source=ols_source,
+    )
+    odin = SimpleNamespace(
+        get_request=lambda platform: ExternalToolRequest(
+            DownloadFile("https://example.com/odin.tar.gz", FileDigest("0" * 64, 0)), "odin/odin"
+        )
+    )
+    globs: list[PathGlobs] = []
+    processes: list[Process] = []
+
+    def run(process: Process) -> SimpleNamespace:
+        processes.append(process)
+        return SimpleNamespace(output_digest=EMPTY_DIGEST)
+
+    def glob(path_globs: PathGlobs) -> Digest:
+        globs.append(path_globs)
+        return EMPTY_DIGEST
+
+    result = run_rule_with_mocks(
+        build_odinfmt,
+        rule_args=[
+            BuildOdinfmtRequest(Platform.linux_x86_64),
+            odin,
+            odinfmt,
+            SimpleNamespace(system_binary_paths=("/usr/bin",)),
+        ],
+        mock_gets=[
+            MockGet(BinaryShims, (BinaryShimsRequest,), lambda _: BinaryShims(EMPTY_DIGEST, "shims")),
+            MockGet(
+                DownloadedExternalTool,
+                (ExternalToolRequest,),
+                lambda _: DownloadedExternalTool(EMPTY_DIGEST, "odin/odin"),
+            ),
+            MockGet(Digest, (PathGlobs,), glob),
+            MockGet(Digest, (MergeDigests,), lambda _: EMPTY_DIGEST),
+            MockGet(ProcessResult, (Process,), run),
+        ],
+    )
+    assert result.exe_path == "./odinfmt"
+
+    (process,) = processes
+    return process, globs
+
+
+def test_build_odinfmt_at_revision() -> None:
+    """Test that a pinned OLS revision is cloned and checked out before building."""
+    process, globs = _build_process(ols_revision="0123abc")
+
+    script = process.argv[2]
+    assert "git clone --quiet https://github.com/DanielGavin/ols.git ols && cd ols" in script
+    assert "git checkout --quiet 0123abc" in script
+    assert process.description == "Clone OLS 0123abc and build odinfmt"
+    assert globs == []
+
+
+def test_build_odinfmt_from_source() -> None:
+    """Test that a local OLS checkout is built in place of cloning the repository."""
+    process, globs = _build_process(ols_source="third_party/ols", ols_revision="0123abc")
+
+    script = process.argv[2]
+    assert "cd third_party/ols" in script
+    assert "git" not in script
+    assert process.description == "Build odinfmt from third_party/ols"
+    assert globs == [PathGlobs(["third_party/ols/**"])]